@@ -0,0 +1,176 @@
+# benchmarks/generators.py
+# Générateurs de modèles classiques paramétrés par leur taille, pour mesurer les performances
+# Chaque générateur retourne un PetriNet construit en une fois avec add_many.
+
+from logic.petri_net import PetriNet
+from logic.hierarchy import Module, HierarchicalNet
+
+PT = "place_to_transition"
+TP = "transition_to_place"
+
+
+# Construit un réseau à partir de places [(nom, jetons)] et de transitions {nom: (entrées, sorties)}
+# entrées / sorties : listes de noms de places (un nom répété augmente le poids)
+def build(places, transitions):
+    arcs = []
+    for name, (inputs, outputs) in transitions.items():
+        for direction, side in ((PT, inputs), (TP, outputs)):
+            for place in dict.fromkeys(side):
+                arcs.append((place, name, direction, side.count(place)))
+    net = PetriNet()
+    net.add_many(places=places, transitions=list(transitions), arcs=arcs)
+    return net
+
+
+# n philosophes : chacun prend la fourchette gauche puis la droite (blocage possible)
+def philosophers(n):
+    places = []
+    transitions = {}
+    for i in range(n):
+        places += [(f"Think{i}", 1), (f"Fork{i}", 1), (f"HasLeft{i}", 0), (f"Eat{i}", 0)]
+    for i in range(n):
+        right = f"Fork{(i + 1) % n}"
+        transitions[f"TakeLeft{i}"] = ([f"Think{i}", f"Fork{i}"], [f"HasLeft{i}"])
+        transitions[f"TakeRight{i}"] = ([f"HasLeft{i}", right], [f"Eat{i}"])
+        transitions[f"Release{i}"] = ([f"Eat{i}"], [f"Think{i}", f"Fork{i}", right])
+    return build(places, transitions)
+
+
+# n producteurs et n consommateurs autour d'un tampon de capacité n
+def producer_consumer(n):
+    places = [("ProdIdle", n), ("ProdReady", 0), ("Buffer", 0), ("Free", n), ("ConsIdle", n), ("ConsBusy", 0)]
+    transitions = {
+        "Produce": (["ProdIdle"], ["ProdReady"]),
+        "Deposit": (["ProdReady", "Free"], ["ProdIdle", "Buffer"]),
+        "Withdraw": (["ConsIdle", "Buffer"], ["ConsBusy", "Free"]),
+        "Consume": (["ConsBusy"], ["ConsIdle"]),
+    }
+    return build(places, transitions)
+
+
+# Anneau à jeton de n stations : seule la station qui a le jeton entre en section critique
+def token_ring(n):
+    places = []
+    transitions = {}
+    for i in range(n):
+        places += [(f"Token{i}", 1 if i == 0 else 0), (f"Ready{i}", 1), (f"Critical{i}", 0), (f"Done{i}", 0)]
+    for i in range(n):
+        following = f"Token{(i + 1) % n}"
+        transitions[f"Pass{i}"] = ([f"Token{i}"], [following])
+        transitions[f"Enter{i}"] = ([f"Token{i}", f"Ready{i}"], [f"Critical{i}"])
+        transitions[f"Leave{i}"] = ([f"Critical{i}"], [following, f"Done{i}"])
+        transitions[f"Work{i}"] = ([f"Done{i}"], [f"Ready{i}"])
+    return build(places, transitions)
+
+
+# Système kanban à 4 cellules (Ciardo et Tilgner), n cartes kanban par cellule
+def kanban(n):
+    places = []
+    transitions = {}
+    for i in range(1, 5):
+        places += [(f"Pm{i}", 0), (f"Pback{i}", 0), (f"Pkan{i}", n), (f"Pout{i}", 0)]
+        transitions[f"Tredo{i}"] = ([f"Pm{i}"], [f"Pback{i}"])
+        transitions[f"Tback{i}"] = ([f"Pback{i}"], [f"Pm{i}"])
+        transitions[f"Tok{i}"] = ([f"Pm{i}"], [f"Pout{i}"])
+    transitions["Tin1"] = (["Pkan1"], ["Pm1"])
+    transitions["Tsynch1_23"] = (["Pout1", "Pkan2", "Pkan3"], ["Pkan1", "Pm2", "Pm3"])
+    transitions["Tsynch23_4"] = (["Pout2", "Pout3", "Pkan4"], ["Pkan2", "Pkan3", "Pm4"])
+    transitions["Tout4"] = (["Pout4"], ["Pkan4"])
+    return build(places, transitions)
+
+
+# Atelier flexible (FMS, d'après Ciardo et Trivedi) : n palettes par type de pièce,
+# machines M1 (3), M2 (1), M3 (2) ; les pièces P1 et P2 peuvent être assemblées sur M3
+def fms(n):
+    places = [
+        ("P1", n), ("P1wM1", 0), ("P1M1", 0), ("M1", 3), ("P1d", 0), ("P1s", 0), ("P1wP2", 0),
+        ("P2", n), ("P2wM2", 0), ("P2M2", 0), ("M2", 1), ("P2d", 0), ("P2s", 0), ("P2wP1", 0),
+        ("P12", 0), ("P12wM3", 0), ("P12M3", 0), ("M3", 2), ("P12s", 0),
+        ("P3", n), ("P3M2", 0), ("P3s", 0),
+    ]
+    transitions = {
+        "tP1": (["P1"], ["P1wM1"]),
+        "tM1": (["P1wM1", "M1"], ["P1M1"]),
+        "tP1M1": (["P1M1"], ["M1", "P1d"]),
+        "tP1e": (["P1d"], ["P1s"]),
+        "tP1j": (["P1d"], ["P1wP2"]),
+        "tP1s": (["P1s"], ["P1"]),
+        "tP2": (["P2"], ["P2wM2"]),
+        "tM2": (["P2wM2", "M2"], ["P2M2"]),
+        "tP2M2": (["P2M2"], ["M2", "P2d"]),
+        "tP2e": (["P2d"], ["P2s"]),
+        "tP2j": (["P2d"], ["P2wP1"]),
+        "tP2s": (["P2s"], ["P2"]),
+        "tx": (["P1wP2", "P2wP1"], ["P12"]),
+        "tP12": (["P12"], ["P12wM3"]),
+        "tM3": (["P12wM3", "M3"], ["P12M3"]),
+        "tP12M3": (["P12M3"], ["M3", "P12s"]),
+        "tP12s": (["P12s"], ["P1", "P2"]),
+        "tP3": (["P3", "M2"], ["P3M2"]),
+        "tP3M2": (["P3M2"], ["M2", "P3s"]),
+        "tP3s": (["P3s"], ["P3"]),
+    }
+    return build(places, transitions)
+
+
+# n pièces traversent `stages` étapes qui partagent deux machines, sans retour en arrière
+# Le réseau se termine (toutes les pièces en Done) : candidat naturel au balayage (sweep-line)
+def job_shop(n, stages=4, machines=2):
+    places = [("Jobs", n), ("Machines", machines), ("Done", 0)]
+    transitions = {}
+    previous = "Jobs"
+    for i in range(stages):
+        places += [(f"Busy{i}", 0), (f"Ready{i}", 0)]
+        transitions[f"Start{i}"] = ([previous, "Machines"], [f"Busy{i}"])
+        transitions[f"End{i}"] = ([f"Busy{i}"], [f"Ready{i}", "Machines"])
+        previous = f"Ready{i}"
+    transitions["Finish"] = ([previous], ["Done"])
+    return build(places, transitions)
+
+
+# Mesure de progression de job_shop : avancement cumulé des pièces (ne recule jamais)
+def job_shop_progress(n, stages=4):
+    weights = {"Done": 2 * stages + 1}
+    for i in range(stages):
+        weights[f"Busy{i}"] = 2 * i + 1
+        weights[f"Ready{i}"] = 2 * i + 2
+    return weights
+
+
+# n cellules identiques (module réutilisé) partageant un parc de machines via une place de fusion
+# Chaque cellule prend une machine, enchaîne `steps` opérations internes puis la libère
+def machine_cells(n, machines=2, steps=4):
+    places = [("Idle", 1), ("Machine", 0)] + [(f"Step{i}", 0) for i in range(steps)]
+    transitions = {
+        "Acquire": (["Idle", "Machine"], ["Step0"]),
+        "Release": ([f"Step{steps - 1}"], ["Idle", "Machine"]),
+    }
+    for i in range(steps - 1):
+        transitions[f"Work{i}"] = ([f"Step{i}"], [f"Step{i + 1}"])
+    cell = Module("cell", build(places, transitions), ports=["Machine"])
+    hnet = HierarchicalNet()
+    hnet.add_fusion_place("Machines", machines)
+    for i in range(n):
+        hnet.add_instance(f"Cell{i}", cell, {"Machine": "Machines"})
+    return hnet
+
+
+# Mesures de progression des modèles qui en ont une (opération "sweep_line")
+PROGRESS = {
+    "job_shop": job_shop_progress,
+}
+
+# Modèles hiérarchiques (HierarchicalNet), mesurés aussi par analyse compositionnelle
+HIERARCHICAL = {
+    "cells": machine_cells,
+}
+
+GENERATORS = {
+    "philosophers": philosophers,
+    "producer_consumer": producer_consumer,
+    "token_ring": token_ring,
+    "kanban": kanban,
+    "fms": fms,
+    "job_shop": job_shop,
+    "cells": lambda n: machine_cells(n).flatten(),
+}
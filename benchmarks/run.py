@@ -0,0 +1,291 @@
+# benchmarks/run.py
+# Mesure le temps et la mémoire des analyses sur les modèles de benchmarks/generators.py
+# Usage : python -m benchmarks.run --models kanban,fms --sizes 1,2,3 --output results.json
+#         python -m benchmarks.run --compare ancien.json nouveau.json
+# Chaque mesure est une ligne du JSON : modèle, taille, opération, temps (min et médiane),
+# états/s quand l'opération explore l'espace d'états, et pic mémoire (tracemalloc).
+# Avec --metrics, les explorations sont relancées une fois instrumentées (logic/metrics.py) :
+# compteurs et temps par phase (activation, tir, hachage, étiquetage) sont ajoutés à la ligne.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen") # la sauvegarde passe par des items de scène
+import matplotlib
+matplotlib.use("Agg")
+from PyQt5.QtWidgets import QApplication, QGraphicsScene
+
+from benchmarks.generators import GENERATORS, HIERARCHICAL, PROGRESS
+from logic.petri_net import PetriNet
+from logic.analysis import StateSpaceVisualizer, build_state_space, checkVivacity, checkLoop
+from logic.compiled import CompiledNet
+from logic.reachability import explore, explore_batched, sweep_line, bitstate_search
+from logic.metrics import ExplorationMetrics
+from logic.hierarchy import compose
+from logic.unfolding import unfold
+from logic.diagnostics import StructuralDiagnostics
+from logic.updownload import save_petri_net, load_petri_net, snapshot_model, scene_layout
+from logic.report_gen import generate_pdf_report
+from gui.items import PlaceItem, TransitionItem, ArcItem
+
+OPERATIONS = ("get_enabled", "build_state_space", "explore_compiled", "explore_batched", "checkVivacity", "checkLoop",
+              "save_json", "load_json", "save_compact", "load_compact", "snapshot", "report",
+              "compositional", "sweep_line", "bitstate", "unfolding", "diagnostics")
+DEFAULT_SIZES = {
+    "philosophers": [2, 3, 4, 5, 6],
+    "producer_consumer": [1, 2, 4, 8],
+    "token_ring": [2, 4, 6, 8],
+    "kanban": [1, 2],
+    "fms": [1, 2],
+    "job_shop": [4, 8, 12],
+    "cells": [4, 8, 12],
+}
+GET_ENABLED_CALLS = 1000 # get_enabled est trop rapide pour être mesuré seul
+BITSTATE_MEMORY = 16 * 2**20 # octets du tableau de bits de l'opération "bitstate"
+REPORT_STATE_LIMIT = 300 # au-delà, le dessin du graphe dans le PDF n'a plus de sens
+GRID_STEP = 120
+
+
+# Place les noeuds du réseau sur une grille dans une scène (nécessaire pour save_petri_net)
+def build_scene(net):
+    scene = QGraphicsScene()
+    place_items, transition_items = {}, {}
+    nodes = list(net.places.values()) + list(net.transitions.values())
+    columns = max(1, int(len(nodes) ** 0.5))
+    for i, node in enumerate(nodes):
+        x, y = (i % columns) * GRID_STEP, (i // columns) * GRID_STEP
+        if node.name in net.places:
+            item = PlaceItem(x, y, name=node.name)
+            item.set_tokens(node.initial_tokens)
+            place_items[node.name] = item
+        else:
+            item = TransitionItem(x, y, name=node.name)
+            transition_items[node.name] = item
+        scene.addItem(item)
+    for arc in net.arcs:
+        p_item, t_item = place_items[arc.place.name], transition_items[arc.transition.name]
+        start, end = (p_item, t_item) if arc.direction == "place_to_transition" else (t_item, p_item)
+        item = ArcItem(start, end, weight=arc.weight, arc=arc)
+        scene.addItem(item)
+        start.add_arc(item)
+        end.add_arc(item)
+    return scene, place_items, transition_items
+
+
+# Prépare les fonctions à mesurer pour un modèle ; chacune retourne le nombre d'états explorés ou None
+# hnet : version hiérarchique du modèle quand elle existe (opération "compositional")
+# progress : mesure de progression quand elle existe (opération "sweep_line")
+def make_operations(net, workdir, hnet=None, progress=None):
+    scene, place_items, transition_items = build_scene(net)
+    json_path = os.path.join(workdir, "bench.json")
+    compact_path = os.path.join(workdir, "bench.petri.gz")
+    pdf_path = os.path.join(workdir, "bench.pdf")
+    save_petri_net(json_path, scene, net, place_items, transition_items)
+    save_petri_net(compact_path, scene, net, place_items, transition_items)
+
+    def get_enabled():
+        for _ in range(GET_ENABLED_CALLS):
+            net.get_enabled()
+
+    def state_space():
+        viz = StateSpaceVisualizer()
+        build_state_space(net, viz)
+        return viz.graph.number_of_nodes()
+
+    def load(path):
+        result = load_petri_net(path, QGraphicsScene(), PetriNet())
+        if not result[0]:
+            raise RuntimeError(result[1])
+
+    def report():
+        cwd = os.getcwd()
+        os.chdir(workdir) # le rapport écrit son image temporaire dans le dossier courant
+        try:
+            generate_pdf_report(net, pdf_path)
+        finally:
+            os.chdir(cwd)
+
+    operations = {
+        "get_enabled": get_enabled,
+        "build_state_space": state_space,
+        "explore_compiled": lambda: explore(CompiledNet(net)).num_states,
+        "explore_batched": lambda: explore_batched(CompiledNet(net)).num_states,
+        "checkVivacity": lambda: checkVivacity(net),
+        "checkLoop": lambda: checkLoop(net),
+        "save_json": lambda: save_petri_net(json_path, scene, net, place_items, transition_items),
+        "load_json": lambda: load(json_path),
+        "save_compact": lambda: save_petri_net(compact_path, scene, net, place_items, transition_items),
+        "load_compact": lambda: load(compact_path),
+        # part de la sauvegarde restant dans le thread de l'interface (l'écriture se fait en arrière-plan)
+        "snapshot": lambda: snapshot_model(net, scene_layout(place_items, transition_items)),
+        "report": report,
+        "compositional": lambda: compose(hnet).num_states,
+        "sweep_line": lambda: sweep_line(CompiledNet(net), progress).num_states,
+        "bitstate": lambda: bitstate_search(CompiledNet(net), memory=BITSTATE_MEMORY, traces=False).num_states,
+        "unfolding": lambda: unfold(net).find_deadlock(),
+        # diagnostic du panneau, sans résultat précédent à reprendre
+        "diagnostics": lambda: StructuralDiagnostics().analyze(net),
+    }
+    # versions instrumentées des explorations (paramètre metrics)
+    instrumented = {
+        "build_state_space": lambda metrics: build_state_space(net, StateSpaceVisualizer(), metrics=metrics),
+        "explore_compiled": lambda metrics: explore(CompiledNet(net), metrics=metrics),
+        "explore_batched": lambda metrics: explore_batched(CompiledNet(net), metrics=metrics),
+        "sweep_line": lambda metrics: sweep_line(CompiledNet(net), progress, metrics=metrics),
+        "bitstate": lambda metrics: bitstate_search(CompiledNet(net), memory=BITSTATE_MEMORY, traces=False,
+                                                    metrics=metrics),
+    }
+    return operations, instrumented
+
+
+# Mesure une opération : `repeat` exécutions chronométrées, puis une sous tracemalloc
+def measure(operation, repeat, memory):
+    times = []
+    states = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = operation()
+        times.append(time.perf_counter() - start)
+        if isinstance(result, int) and not isinstance(result, bool):
+            states = result
+    peak = None
+    if memory:
+        tracemalloc.start()
+        operation()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return times, states, peak
+
+
+def run(models, sizes, operations, repeat, memory, metrics=False, log=print):
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for model in models:
+            for size in sizes or DEFAULT_SIZES[model]:
+                net = GENERATORS[model](size)
+                hnet = HIERARCHICAL[model](size) if model in HIERARCHICAL else None
+                progress = PROGRESS[model](size) if model in PROGRESS else None
+                ops, instrumented = make_operations(net, workdir, hnet, progress)
+                graph = explore(CompiledNet(net))
+                num_states = graph.num_states
+                # le dépliage ne traite que les réseaux saufs
+                safe = (all(arc.weight == 1 for arc in net.arcs) and all(graph.cn.pre)
+                        and max((max(m, default=0) for m in graph.markings), default=0) <= 1)
+                for name in operations:
+                    record = {
+                        "model": model, "size": size,
+                        "places": len(net.places), "transitions": len(net.transitions),
+                        "operation": name,
+                    }
+                    if name == "report" and num_states > REPORT_STATE_LIMIT:
+                        record["skipped"] = f"more than {REPORT_STATE_LIMIT} states"
+                        results.append(record)
+                        continue
+                    if name == "compositional" and hnet is None:
+                        record["skipped"] = "not a hierarchical model"
+                        results.append(record)
+                        continue
+                    if name == "sweep_line" and progress is None:
+                        record["skipped"] = "no progress measure"
+                        results.append(record)
+                        continue
+                    if name == "unfolding" and not safe:
+                        record["skipped"] = "not a safe net"
+                        results.append(record)
+                        continue
+                    times, states, peak = measure(ops[name], repeat, memory)
+                    best = min(times)
+                    record.update({
+                        "seconds": best,
+                        "median_seconds": statistics.median(times),
+                        "repeat": repeat,
+                        "peak_bytes": peak,
+                    })
+                    if name == "get_enabled":
+                        record["calls"] = GET_ENABLED_CALLS
+                    if name in ("build_state_space", "explore_compiled", "explore_batched", "compositional", "sweep_line", "bitstate"):
+                        record["states"] = states
+                        record["states_per_sec"] = states / best if best > 0 else None
+                    if metrics and name in instrumented:
+                        collected = ExplorationMetrics(track_memory=memory)
+                        instrumented[name](collected)
+                        record["metrics"] = collected.to_dict()
+                    results.append(record)
+                    log(f"{model}({size}) {name}: {best:.4f}s" + (f", {states} états" if "states" in record else ""))
+    return results
+
+
+# Informations sur la machine et la révision, pour comparer des résultats entre eux
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "commit": commit,
+    }
+
+
+# Compare deux fichiers de résultats : rapport de temps nouveau / ancien par mesure
+def compare(old_path, new_path):
+    def load(path):
+        with open(path) as f:
+            data = json.load(f)
+        return {(r["model"], r["size"], r["operation"]): r for r in data["results"] if "seconds" in r}
+    old, new = load(old_path), load(new_path)
+    print(f"{'modèle':<20}{'taille':>7}  {'opération':<20}{'ancien':>10}{'nouveau':>10}{'ratio':>8}")
+    for key in sorted(old.keys() & new.keys(), key=str):
+        a, b = old[key]["seconds"], new[key]["seconds"]
+        ratio = b / a if a > 0 else float("inf")
+        print(f"{key[0]:<20}{key[1]:>7}  {key[2]:<20}{a:>10.4f}{b:>10.4f}{ratio:>8.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de l'éditeur de réseaux de Petri")
+    parser.add_argument("--models", default=",".join(GENERATORS), help="modèles séparés par des virgules")
+    parser.add_argument("--sizes", default=None, help="tailles séparées par des virgules (défaut : par modèle)")
+    parser.add_argument("--operations", default=",".join(OPERATIONS), help="opérations séparées par des virgules")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="ne pas mesurer le pic mémoire")
+    parser.add_argument("--metrics", action="store_true", help="ajoute les compteurs et temps par phase des explorations")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare deux fichiers de résultats")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    models = args.models.split(",")
+    operations = args.operations.split(",")
+    for name in models:
+        if name not in GENERATORS:
+            parser.error(f"unknown model '{name}', expected one of {list(GENERATORS)}")
+    for name in operations:
+        if name not in OPERATIONS:
+            parser.error(f"unknown operation '{name}', expected one of {list(OPERATIONS)}")
+    sizes = [int(s) for s in args.sizes.split(",")] if args.sizes else None
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    results = run(models, sizes, operations, args.repeat, not args.no_memory, metrics=args.metrics)
+    with open(args.output, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2)
+    print(f"Résultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
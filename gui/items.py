@@ -4,8 +4,8 @@
 import math
 from PyQt5.QtWidgets import (QGraphicsLineItem, QGraphicsEllipseItem,
                              QGraphicsRectItem, QGraphicsTextItem, QGraphicsItem)
-from PyQt5.QtGui import QPen, QBrush, QColor, QPolygonF, QFont, QPainter
-from PyQt5.QtCore import Qt, QLineF, QPointF
+from PyQt5.QtGui import QPen, QBrush, QColor, QPolygonF, QFont
+from PyQt5.QtCore import Qt, QLineF, QPointF, QTimer
 
 from logic.petri_net import Arc
 
@@ -17,6 +17,56 @@ ARROW_SIZE = 15
 ARROW_ANGLE_DEGREES = 25
 ARC_WEIGHT_TEXT_OFFSET = 15
 NODE_LABEL_OFFSET_Y = -45 
+ARROW_ANGLE = math.radians(ARROW_ANGLE_DEGREES)
+
+# --- Niveaux de détail (échelle de la vue) ---
+LOD_MINIMAL = 0.4 # en dessous : arcs sans flèche, places sans jetons
+LOD_DETAIL = 0.7 # en dessous : pas de poids ni de jetons individuels
+
+# --- Ressources de dessin partagées ---
+ARROW_BRUSH = QBrush(Qt.black)
+TOKEN_RADIUS = 5
+TOKEN_OFFSET = 12
+TOKEN_BRUSH = QBrush(QColor("#26547C"))
+TOKEN_PEN = QPen(Qt.black)
+TOKEN_FONT = QFont("Arial", 18)
+TOKEN_FONT.setBold(True)
+TOKEN_POSITIONS = {
+    1: [(0, 0)],
+    2: [(-TOKEN_OFFSET, 0), (TOKEN_OFFSET, 0)],
+    3: [(0, -TOKEN_OFFSET), (-TOKEN_OFFSET, TOKEN_OFFSET), (TOKEN_OFFSET, TOKEN_OFFSET)],
+    4: [(-TOKEN_OFFSET, -TOKEN_OFFSET), (TOKEN_OFFSET, -TOKEN_OFFSET), (-TOKEN_OFFSET, TOKEN_OFFSET), (TOKEN_OFFSET, TOKEN_OFFSET)],
+    5: [(-TOKEN_OFFSET, -TOKEN_OFFSET), (TOKEN_OFFSET, -TOKEN_OFFSET), (0, 0), (-TOKEN_OFFSET, TOKEN_OFFSET), (TOKEN_OFFSET, TOKEN_OFFSET)]
+}
+
+# Regroupe les mises à jour des arcs pendant un déplacement (multi-sélection)
+# Chaque arc n'est recalculé qu'une seule fois par tour de boucle d'événements
+class ArcUpdateBatcher:
+    def __init__(self):
+        self.pending = set()
+        self.scheduled = False
+
+    def schedule(self, arcs):
+        self.pending.update(arcs)
+        if not self.scheduled:
+            self.scheduled = True
+            QTimer.singleShot(0, self.flush)
+
+    # Recalcule tous les arcs en attente, peut être appelé directement pour forcer la mise à jour
+    def flush(self):
+        arcs = self.pending
+        self.pending = set()
+        self.scheduled = False
+        for arc in arcs:
+            try:
+                if arc.scene() is not None:
+                    arc.update_position()
+            except RuntimeError: # item déjà détruit par un scene.clear()
+                continue
+
+
+arc_batcher = ArcUpdateBatcher()
+
 
 # Représente un item visuel arc entre une place et une transition
 class ArcItem(QGraphicsLineItem):
@@ -26,6 +76,7 @@ class ArcItem(QGraphicsLineItem):
         self.end_item = end_item
         self.weight = weight
         self.backend_arc = arc 
+        self.geometry = None # cache (ligne raccourcie, flèche, position du poids)
 
         self.setPen(QPen(Qt.black, 2))
         self.setZValue(-1) 
@@ -52,12 +103,11 @@ class ArcItem(QGraphicsLineItem):
         end_center = self.end_item.center_point()
         self.prepareGeometryChange()
         self.setLine(start_center.x(), start_center.y(), end_center.x(), end_center.y())
+        self.geometry = self.compute_geometry()
 
-    def paint(self, painter, option, widget=None):
-        painter.setRenderHint(QPainter.Antialiasing)
-        painter.setPen(self.pen())
-        painter.setFont(self.font)
-
+    # Calcule une seule fois le point de fin raccourci, la flèche et la position du poids
+    # Le résultat reste en cache jusqu'au prochain déplacement d'une extrémité
+    def compute_geometry(self):
         line = self.line()
         p1 = line.p1()
         p2 = line.p2()
@@ -66,7 +116,7 @@ class ArcItem(QGraphicsLineItem):
         dy = p2.y() - p1.y()
         length = math.sqrt(dx**2 + dy**2)
 
-        if length == 0: return
+        if length == 0: return None
 
         # calcul du point de fin raccourci pour ne pas dépasser la forme
         if isinstance(self.end_item, TransitionItem):
@@ -90,33 +140,47 @@ class ArcItem(QGraphicsLineItem):
             ratio = end_node_radius / length
             p2_shortened = QPointF(p2.x() - dx * ratio, p2.y() - dy * ratio)
 
-        # Dessin de la ligne
         dx_s = p2_shortened.x() - p1.x()
         dy_s = p2_shortened.y() - p1.y()
-        painter.drawLine(QLineF(p1, p2_shortened))
 
-        # dessin de la flèche
+        # flèche
         angle = math.atan2(dy_s, dx_s)
         p_arrow1 = QPointF(
-            p2_shortened.x() - ARROW_SIZE * math.cos(angle - math.radians(ARROW_ANGLE_DEGREES)),
-            p2_shortened.y() - ARROW_SIZE * math.sin(angle - math.radians(ARROW_ANGLE_DEGREES))
+            p2_shortened.x() - ARROW_SIZE * math.cos(angle - ARROW_ANGLE),
+            p2_shortened.y() - ARROW_SIZE * math.sin(angle - ARROW_ANGLE)
         )
         p_arrow2 = QPointF(
-            p2_shortened.x() - ARROW_SIZE * math.cos(angle + math.radians(ARROW_ANGLE_DEGREES)),
-            p2_shortened.y() - ARROW_SIZE * math.sin(angle + math.radians(ARROW_ANGLE_DEGREES))
+            p2_shortened.x() - ARROW_SIZE * math.cos(angle + ARROW_ANGLE),
+            p2_shortened.y() - ARROW_SIZE * math.sin(angle + ARROW_ANGLE)
         )
-        
-        painter.setBrush(QBrush(Qt.black))
-        painter.drawPolygon(QPolygonF([p2_shortened, p_arrow1, p_arrow2]))
+        arrow = QPolygonF([p2_shortened, p_arrow1, p_arrow2])
+
+        # position du poids, perpendiculaire au milieu de l'arc
+        mid_x = (p1.x() + p2_shortened.x()) / 2
+        mid_y = (p1.y() + p2_shortened.y()) / 2
+        perp_x = dy_s / length * ARC_WEIGHT_TEXT_OFFSET
+        perp_y = -dx_s / length * ARC_WEIGHT_TEXT_OFFSET
+        weight_pos = QPointF(mid_x + perp_x - 5, mid_y + perp_y + 5)
+
+        return QLineF(p1, p2_shortened), arrow, weight_pos
+
+    def paint(self, painter, option, widget=None):
+        if self.geometry is None: return
+        line, arrow, weight_pos = self.geometry
+        painter.setPen(self.pen())
+
+        # Niveau de détail : de loin on ne dessine que le segment
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        painter.drawLine(line)
+        if lod < LOD_MINIMAL: return
+
+        painter.setBrush(ARROW_BRUSH)
+        painter.drawPolygon(arrow)
 
         # dessin du poids si > 1
-        if self.weight > 1:
-            mid_x = (p1.x() + p2_shortened.x()) / 2
-            mid_y = (p1.y() + p2_shortened.y()) / 2
-            dist = ARC_WEIGHT_TEXT_OFFSET
-            perp_x = dy_s / length * dist 
-            perp_y = -dx_s / length * dist
-            painter.drawText(QPointF(mid_x + perp_x - 5, mid_y + perp_y + 5), str(self.weight))
+        if self.weight > 1 and lod >= LOD_DETAIL:
+            painter.setFont(self.font)
+            painter.drawText(weight_pos, str(self.weight))
 
 
 # Représente un item visuel place dans le réseau de Petri
@@ -129,19 +193,15 @@ class PlaceItem(QGraphicsEllipseItem):
         self.setFlag(QGraphicsItem.ItemIsMovable)
         self.setFlag(QGraphicsItem.ItemIsSelectable)
         self.setFlag(QGraphicsItem.ItemSendsGeometryChanges)
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
         self.name = name
         self.tokens = 0
         self.arcs = []
-        self.token_items = []
-
-        self.text_token_fallback = QGraphicsTextItem("", parent=self)
-        self.text_token_fallback.setDefaultTextColor(Qt.black)
 
         self.label = QGraphicsTextItem(self.name, parent=self)
         self.label.setDefaultTextColor(Qt.black)
         self.label.setPos(-self.label.boundingRect().width()/2, -55)
-        self.draw_tokens()
 
     def add_arc(self, arc): self.arcs.append(arc)
     
@@ -149,48 +209,36 @@ class PlaceItem(QGraphicsEllipseItem):
         if arc in self.arcs: self.arcs.remove(arc)
 
     def itemChange(self, change, value):
-        if change == QGraphicsItem.ItemPositionChange:
-            for arc in self.arcs: arc.update_position()
+        if change == QGraphicsItem.ItemPositionHasChanged:
+            arc_batcher.schedule(self.arcs)
         return super().itemChange(change, value)
 
     def set_tokens(self, v):
+        if v == self.tokens: return
         self.tokens = v
         self.draw_tokens()
 
+    # Les jetons sont dessinés dans paint(), il suffit d'invalider le cache de l'item
     def draw_tokens(self):
-        # Nettoyage
-        for item in self.token_items:
-            if item.scene(): self.scene().removeItem(item)
-        self.token_items.clear()
-        self.text_token_fallback.setPlainText("")
-
-        if 0 < self.tokens <= 5:
-            r, off = 5, 12
-            positions = {
-                1: [(0, 0)],
-                2: [(-off, 0), (off, 0)],
-                3: [(0, -off), (-off, off), (off, off)],
-                4: [(-off, -off), (off, -off), (-off, off), (off, off)],
-                5: [(-off, -off), (off, -off), (0,0), (-off, off), (off, off)]
-            }[self.tokens]
-
-            for (px,py) in positions:
-                dot = QGraphicsEllipseItem(-r, -r, r*2, r*2, parent=self)
-                dot.setBrush(QBrush(QColor("#26547C")))
-                dot.setPen(QPen(Qt.black))
-                dot.setPos(px, py)
-                self.token_items.append(dot)
-
-        elif self.tokens > 5:
-            # On affiche le nombre de jetons en texte > 5
-            font = QFont("Arial", 18)
-            font.setBold(True)
-            self.text_token_fallback.setFont(font)
-            self.text_token_fallback.setPlainText(str(self.tokens))
-            
-            bw = self.text_token_fallback.boundingRect().width()
-            bh = self.text_token_fallback.boundingRect().height()
-            self.text_token_fallback.setPos(-bw/2, -bh/2)
+        self.update()
+
+    def paint(self, painter, option, widget=None):
+        super().paint(painter, option, widget)
+        if self.tokens <= 0: return
+
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        if lod < LOD_MINIMAL: return
+
+        if self.tokens <= 5 and lod >= LOD_DETAIL:
+            painter.setBrush(TOKEN_BRUSH)
+            painter.setPen(TOKEN_PEN)
+            for (px, py) in TOKEN_POSITIONS[self.tokens]:
+                painter.drawEllipse(QPointF(px, py), TOKEN_RADIUS, TOKEN_RADIUS)
+        else:
+            # On affiche le nombre de jetons en texte > 5 (ou de loin)
+            painter.setPen(Qt.black)
+            painter.setFont(TOKEN_FONT)
+            painter.drawText(self.rect(), Qt.AlignCenter, str(self.tokens))
 
     def center_point(self):
         return self.mapToScene(self.rect().center())
@@ -206,6 +254,7 @@ class TransitionItem(QGraphicsRectItem):
         self.setFlag(QGraphicsItem.ItemIsMovable)
         self.setFlag(QGraphicsItem.ItemIsSelectable)
         self.setFlag(QGraphicsItem.ItemSendsGeometryChanges)
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
         self.name = name
         self.arcs = []
@@ -220,9 +269,9 @@ class TransitionItem(QGraphicsRectItem):
         if arc in self.arcs: self.arcs.remove(arc)
 
     def itemChange(self, change, value):
-        if change == QGraphicsItem.ItemPositionChange:
-            for arc in self.arcs: arc.update_position()
+        if change == QGraphicsItem.ItemPositionHasChanged:
+            arc_batcher.schedule(self.arcs)
         return super().itemChange(change, value)
 
     def center_point(self):
-        return self.mapToScene(self.boundingRect().center())
\ No newline at end of file
+        return self.mapToScene(self.boundingRect().center())
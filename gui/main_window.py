@@ -1,15 +1,96 @@
 # gui/main_window.py
 # Point d'entrée principal de l'interface graphique
 
+import math
+import os
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import (QWidget, QFrame, QPushButton,
                              QFormLayout, QLabel, QSpinBox, QHBoxLayout, QVBoxLayout,
-                             QGraphicsView, QGraphicsScene, QFileDialog, QInputDialog, QComboBox, QApplication)
-from PyQt5.QtGui import QFont, QColor, QPalette, QPainter, QPen, QBrush
-from PyQt5.QtCore import Qt
-from gui.items import PlaceItem, TransitionItem, ArcItem
-from logic.updownload import save_petri_net, load_petri_net
+                             QGraphicsView, QGraphicsScene, QFileDialog, QInputDialog, QComboBox, QApplication,
+                             QDoubleSpinBox, QCheckBox, QLineEdit, QStatusBar, QMessageBox)
+from PyQt5.QtGui import QFont, QColor, QPalette, QPainter, QPen, QBrush, QKeySequence
+from PyQt5.QtCore import Qt, QTimer, QElapsedTimer
+from gui.items import PlaceItem, TransitionItem, ArcItem, arc_batcher
+from logic.updownload import (read_model, populate_scene_chunks, scene_layout, snapshot_model,
+                              write_snapshot)
+from logic.petri_net import PetriNet
+from logic.pnml import read_pnml
 from logic.report_gen import generate_pdf_report
-from logic.analysis import StateSpaceVisualizer, build_state_space
+from logic.analysis import StateSpaceVisualizer, fill_visualizer
+from logic.simulation import Simulator, POLICIES
+from logic.montecarlo import run_monte_carlo
+from logic.stochastic import solve_gspn
+from logic.timed import TimedSimulator, DELAY_KINDS, check_delay
+from logic.model_checking import check_formula
+from logic.compiled import CompiledNet
+from logic.reachability import find_deadlocks
+from logic.reduction import reduce_net
+from logic.metrics import ExplorationMetrics, ProgressCallback
+from logic.graph_export import export_state_space
+from logic.incremental import IncrementalAnalyzer
+from logic.diagnostics import StructuralDiagnostics
+
+ZOOM_FACTOR = 1.15
+LARGE_NET_THRESHOLD = 500 # nombre de noeuds à partir duquel on passe en rendu rapide
+MOVE_STEP = 10 # déplacement au clavier de la sélection (x5 avec Shift)
+PASTE_OFFSET = 40
+SIM_FRAME_MS = 40 # rafraîchissement de l'affichage pendant une simulation (~25 images/s)
+SIM_BUDGET_MS = 25 # temps de calcul alloué à la simulation par image
+SIM_CHUNK = 2000 # nombre de tirs entre deux vérifications du budget
+REPLAY_MS = 500 # délai entre deux tirs lors du rejeu d'une trace
+AUTOSAVE_MS = 60_000 # intervalle de la sauvegarde automatique
+AUTOSAVE_PATH = os.path.join(os.path.expanduser("~"), ".petri-editor", "autosave.petri.gz")
+IO_POLL_MS = 50 # relevé des lectures et écritures terminées en arrière-plan
+DIAGNOSTICS_DELAY_MS = 300 # attente après la dernière modification avant de relancer le diagnostic
+DIAGNOSTICS_NAMES = 8 # noms affichés au plus dans chaque liste du diagnostic
+
+
+# Lecture d'un fichier dans un réseau neuf (thread d'arrière-plan) : réseau, positions et instantané
+def read_backend(filename, net):
+    if filename.lower().endswith(".pnml"):
+        _, layout = read_pnml(filename, net=net)
+    else:
+        layout = read_model(filename, net)
+    return net, layout, snapshot_model(net, layout)
+
+
+def write_autosave(path, records):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_snapshot(path, records)
+
+
+# Entrées/sorties dans un thread d'arrière-plan (un seul : les écritures se font dans l'ordre)
+# Les travaux terminés sont relevés par un QTimer : on_done(future) s'exécute dans le thread de l'interface
+class BackgroundIO:
+    def __init__(self, parent):
+        self.pool = ThreadPoolExecutor(max_workers=1)
+        self.pending = []
+        self.timer = QTimer(parent)
+        self.timer.setInterval(IO_POLL_MS)
+        self.timer.timeout.connect(self.poll)
+
+    def submit(self, on_done, fn, *args):
+        future = self.pool.submit(fn, *args)
+        self.pending.append((future, on_done))
+        self.timer.start()
+        return future
+
+    def busy(self):
+        return bool(self.pending)
+
+    def poll(self):
+        finished = [job for job in self.pending if job[0].done()]
+        self.pending = [job for job in self.pending if job not in finished]
+        if not self.pending:
+            self.timer.stop()
+        for future, on_done in finished:
+            on_done(future)
+
+    # attend la fin des travaux en cours (fermeture de la fenêtre)
+    def shutdown(self):
+        self.pool.shutdown(wait=True)
+        self.poll()
 
 
 class PetriGraphicsView(QGraphicsView):
@@ -20,9 +101,28 @@ class PetriGraphicsView(QGraphicsView):
         self.setScene(self.scene)
         self.setSceneRect(0, 0, 2000, 2000)
         self.setRenderHints(QPainter.Antialiasing)
+        self.setViewportUpdateMode(QGraphicsView.SmartViewportUpdate)
+        self.setOptimizationFlags(QGraphicsView.DontSavePainterState)
         self.mode = None
         self.temp_arc_start = None
 
+    # mode de rendu rapide pour les grands réseaux (pas d'anti-aliasing)
+    def set_fast_rendering(self, enabled):
+        self.setRenderHint(QPainter.Antialiasing, not enabled)
+        if enabled:
+            self.setOptimizationFlags(QGraphicsView.DontSavePainterState | QGraphicsView.DontAdjustForAntialiasing)
+        else:
+            self.setOptimizationFlags(QGraphicsView.DontSavePainterState)
+
+    # zoom avec Ctrl + molette, les items adaptent leur niveau de détail
+    def wheelEvent(self, event):
+        if event.modifiers() & Qt.ControlModifier:
+            factor = ZOOM_FACTOR if event.angleDelta().y() > 0 else 1 / ZOOM_FACTOR
+            self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+            self.scale(factor, factor)
+        else:
+            super().wheelEvent(event)
+
     # définit le mode d'ajout
     def set_mode(self, mode):
         self.mode = mode
@@ -37,6 +137,24 @@ class PetriGraphicsView(QGraphicsView):
     def clear_scene_action(self):
         print("Bouton Effacer tout cliqué !")
 
+    # raccourcis clavier agissant sur toute la sélection en une seule opération
+    def keyPressEvent(self, event):
+        key = event.key()
+        selected = self.scene.selectedItems()
+        if key in (Qt.Key_Delete, Qt.Key_Backspace) and selected:
+            self.main_window.delete_items(selected)
+        elif key in (Qt.Key_Left, Qt.Key_Right, Qt.Key_Up, Qt.Key_Down) and selected:
+            step = MOVE_STEP * (5 if event.modifiers() & Qt.ShiftModifier else 1)
+            dx = {Qt.Key_Left: -step, Qt.Key_Right: step}.get(key, 0)
+            dy = {Qt.Key_Up: -step, Qt.Key_Down: step}.get(key, 0)
+            self.main_window.move_items(selected, dx, dy)
+        elif event.matches(QKeySequence.Copy):
+            self.main_window.copy_selection()
+        elif event.matches(QKeySequence.Paste):
+            self.main_window.paste_clipboard()
+        else:
+            super().keyPressEvent(event)
+
     # clique sur les boutons
     def mousePressEvent(self, event):
         pos = self.mapToScene(event.pos())
@@ -134,7 +252,29 @@ class MainWindow(QWidget):
         self.main_layout = QHBoxLayout(self) # SUS
         self.view = PetriGraphicsView(self)
         self.view.setStyleSheet("background-color: white; border-radius: 10px;")
-        self.main_layout.addWidget(self.view, stretch=4)
+        self.status_bar = QStatusBar()
+        self.status_bar.setStyleSheet("color: white; font-family: Futura;")
+        self.view_layout = QVBoxLayout()
+        self.view_layout.addWidget(self.view)
+        self.view_layout.addWidget(self.status_bar)
+        self.main_layout.addLayout(self.view_layout, stretch=4)
+
+        # Diagnostic structurel en direct, à côté du panneau des propriétés
+        self.frame_diagnostics = QFrame()
+        self.frame_diagnostics.setFixedWidth(260)
+        self.frame_diagnostics.setStyleSheet("background-color: #FFD166; border-radius: 15px;")
+        self.diagnostics_layout = QVBoxLayout(self.frame_diagnostics)
+        self.diagnostics_layout.setContentsMargins(15, 15, 15, 15)
+        self.labelDiagnosticsTitle = QLabel("DIAGNOSTIC")
+        self.labelDiagnosticsTitle.setStyleSheet("color: black; font-weight: bold; font-family: Futura; font-size: 16pt; text-decoration: underline; border: none;")
+        self.diagnostics_layout.addWidget(self.labelDiagnosticsTitle)
+        self.labelDiagnostics = QLabel("Réseau vide")
+        self.labelDiagnostics.setWordWrap(True)
+        self.labelDiagnostics.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        self.labelDiagnostics.setStyleSheet("color: black; font-family: Futura; border: none;")
+        self.diagnostics_layout.addWidget(self.labelDiagnostics)
+        self.diagnostics_layout.addStretch()
+        self.main_layout.addWidget(self.frame_diagnostics)
 
         self.layout_menu = QVBoxLayout()
         self.layout_menu.setSpacing(15) # Réduction de l'espacement pour gagner de la hauteur
@@ -171,18 +311,103 @@ class MainWindow(QWidget):
         self.buttonColorAlgo.clicked.connect(self.apply_algorithmic_coloring)
         self.buttonState = QPushButton("Génerer les espaces d'états")
         self.buttonState.clicked.connect(self.show_state_space_popup)
+        self.buttonExport = QPushButton("Exporter l'espace d'états")
+        self.buttonExport.clicked.connect(self.handle_state_space_export)
         self.buttonLoad = QPushButton("Load")
         self.buttonLoad.clicked.connect(self.load_action)
         self.buttonSave = QPushButton("Save")
         self.buttonSave.clicked.connect(self.save_action)
+        self.buttonMonteCarlo = QPushButton("Analyse Monte-Carlo")
+        self.buttonMonteCarlo.clicked.connect(self.handle_monte_carlo)
+        self.buttonPerformance = QPushButton("Performance (GSPN)")
+        self.buttonPerformance.clicked.connect(self.handle_performance)
+        self.buttonTimed = QPushButton("Simulation temporisée")
+        self.buttonTimed.clicked.connect(self.handle_timed_simulation)
+        self.buttonDeadlock = QPushButton("Chercher les blocages")
+        self.buttonDeadlock.clicked.connect(self.handle_deadlock_search)
+        self.buttonCheck = QPushButton("Vérifier une propriété")
+        self.buttonCheck.clicked.connect(self.handle_model_checking)
         self.buttonRapport = QPushButton("Génerer un rapport")
         self.buttonRapport.clicked.connect(self.handle_generate_report)
 
-        for b in [self.buttonColorAlgo, self.buttonState, self.buttonLoad, self.buttonSave, self.buttonRapport]:
+        for b in [self.buttonColorAlgo, self.buttonState, self.buttonExport, self.buttonMonteCarlo, self.buttonPerformance, self.buttonTimed, self.buttonDeadlock, self.buttonCheck, self.buttonLoad, self.buttonSave, self.buttonRapport]:
             b.setStyleSheet(self.STYLE_DEFAULT)
             self.state_v_layout.addWidget(b)
         
         self.layout_menu.addWidget(self.frame_state)
+
+        # Contrôles de simulation (jeu de jetons)
+        self.frame_sim = QFrame()
+        self.frame_sim.setFixedWidth(320)
+        self.frame_sim.setStyleSheet("background-color: #FFD166; border-radius: 10px;")
+        self.sim_layout = QVBoxLayout(self.frame_sim)
+
+        self.comboPolicy = QComboBox()
+        self.comboPolicy.addItems(POLICIES)
+        self.comboPolicy.setStyleSheet("background-color: white; color: black; border-radius: 5px; padding: 5px;")
+        self.comboPolicy.currentTextChanged.connect(lambda _: self.reset_simulation())
+        self.sim_layout.addWidget(self.comboPolicy)
+
+        sim_buttons = QHBoxLayout()
+        self.buttonStep = QPushButton("Pas")
+        self.buttonStep.clicked.connect(self.step_simulation)
+        self.buttonRun = QPushButton("Lancer")
+        self.buttonRun.clicked.connect(self.run_simulation)
+        self.buttonPause = QPushButton("Pause")
+        self.buttonPause.clicked.connect(self.pause_simulation)
+        self.buttonSimReset = QPushButton("Reset")
+        self.buttonSimReset.clicked.connect(self.reset_simulation)
+        for b in [self.buttonStep, self.buttonRun, self.buttonPause, self.buttonSimReset]:
+            b.setStyleSheet(self.STYLE_DEFAULT)
+            sim_buttons.addWidget(b)
+        self.sim_layout.addLayout(sim_buttons)
+
+        self.labelSim = QLabel("Simulation : arrêtée")
+        self.labelSim.setStyleSheet("color: black; font-family: Futura; border: none;")
+        self.sim_layout.addWidget(self.labelSim)
+        self.layout_menu.addWidget(self.frame_sim)
+
+        self.simulator = None
+        self.analyzer = IncrementalAnalyzer() # garde le dernier graphe pour les ré-analyses
+        self.last_monte_carlo = None
+        self.last_performance = None
+        self.sim_timer = QTimer(self)
+        self.sim_timer.setInterval(SIM_FRAME_MS)
+        self.sim_timer.timeout.connect(self.simulation_frame)
+        self.replay_queue = []
+        self.replay_timer = QTimer(self)
+        self.replay_timer.setInterval(REPLAY_MS)
+        self.replay_timer.timeout.connect(self.replay_frame)
+
+        # sauvegarde et chargement en arrière-plan, sauvegarde automatique périodique
+        self.io = BackgroundIO(self)
+        self.autosave_path = AUTOSAVE_PATH
+        self.saved_records = None # instantané de la dernière sauvegarde ou du dernier chargement
+        self.autosaved_records = snapshot_model(self.net, {})
+        self.autosave_written = False
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setInterval(AUTOSAVE_MS)
+        self.autosave_timer.timeout.connect(self.autosave)
+        self.autosave_timer.start()
+        self.loading = None # générateur de remplissage de la scène pendant un chargement
+        self.load_timer = QTimer(self)
+        self.load_timer.setInterval(0)
+        self.load_timer.timeout.connect(self.load_frame)
+
+        # diagnostic calculé dans son propre thread, relancé après une courte pause dans les modifications
+        self.diagnostics = StructuralDiagnostics() # garde les invariants et le graphe précédents
+        self.diagnostics_worker = BackgroundIO(self)
+        self.diagnostics_stale = False # réseau modifié pendant le calcul en cours
+        self.diagnostics_timer = QTimer(self)
+        self.diagnostics_timer.setSingleShot(True)
+        self.diagnostics_timer.setInterval(DIAGNOSTICS_DELAY_MS)
+        self.diagnostics_timer.timeout.connect(self.start_diagnostics)
+        self.diagnostics_timer.start()
+        # sauvegarde automatique laissée par une session interrompue : proposée à la restauration
+        # avant que la première sauvegarde automatique de cette session ne l'écrase
+        self.recovery_pending = os.path.exists(self.autosave_path)
+        if self.recovery_pending:
+            QTimer.singleShot(0, self.offer_recovery)
         self.layout_menu.addStretch()
         self.main_layout.addLayout(self.layout_menu)
 
@@ -209,8 +434,11 @@ class MainWindow(QWidget):
         self.buttonClearAll.setCursor(Qt.PointingHandCursor)
         self.buttonClearAll.clicked.connect(self.reset_editor)
 
+        # index backend -> scène : nom -> item pour les noeuds, Arc -> ArcItem pour les arcs
         self.visual_places = {}
         self.visual_transitions = {}
+        self.visual_arcs = {}
+        self.clipboard = None
         
     def show_state_space_popup(self):
         """Lance l'analyse et affiche l'espace d'états en utilisant logic.analysis."""
@@ -222,8 +450,12 @@ class MainWindow(QWidget):
             # Initialisation du visualiseur
             viz = StateSpaceVisualizer()
             
-            # Construction de l'espace d'états
-            build_state_space(self.net, viz)
+            # Construction de l'espace d'états, en reprenant le graphe précédent si possible
+            result = self.run_exploration(self.analyzer.analyze, self.net, metrics=self.exploration_metrics())
+            self.status_bar.showMessage(
+                f"Espace d'états ({result.edit}) : {result.graph.num_states} états, "
+                f"{result.reused_edges} arcs repris, {result.computed_edges} calculés")
+            fill_visualizer(self.net, result.graph, viz)
             
             # Lancement de la fenêtre interactive Matplotlib
             viz.show_interactive()
@@ -233,6 +465,47 @@ class MainWindow(QWidget):
             import traceback
             traceback.print_exc()
 
+    # écrit l'espace d'états au fil de l'exploration (DOT, GraphML ou CSV), sans fenêtre ni graphe networkx
+    def handle_state_space_export(self):
+        if not self.net.places and not self.net.transitions:
+            print("Erreur : Le réseau est vide.")
+            return
+        filename, _ = QFileDialog.getSaveFileName(self, "Exporter l'espace d'états", "espace_etats.dot",
+                                                  "Graphviz (*.dot);;GraphML (*.graphml);;Liste d'arcs CSV (*.csv)")
+        if not filename: return
+        try:
+            metrics = self.run_exploration(export_state_space, CompiledNet(self.net), filename,
+                                           listeners=[ProgressCallback(self.show_exploration_progress)])
+            print(f"Espace d'états exporté dans {filename} : {metrics.states} états, {metrics.edges} arcs, "
+                  f"{metrics.deadlocks} blocage(s)")
+        except Exception as e:
+            print(f"Erreur lors de l'export de l'espace d'états : {e}")
+            import traceback
+            traceback.print_exc()
+
+    # Exploration synchrone : l'interface est verrouillée et aucun événement n'est traité pendant
+    # le calcul (pas de modification du réseau entre l'exploration et l'affichage du résultat)
+    def run_exploration(self, fn, *args, **kwargs):
+        self.set_io_locked(True)
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            QApplication.restoreOverrideCursor()
+            self.set_io_locked(False)
+
+    # Métriques d'exploration reliées à la barre d'état : débit affiché pendant le calcul
+    def exploration_metrics(self):
+        return ExplorationMetrics(listeners=[ProgressCallback(self.show_exploration_progress)])
+
+    def show_exploration_progress(self, metrics):
+        status = "terminé" if metrics.finished else "en cours"
+        self.status_bar.showMessage(
+            f"{metrics.explorer} {status} : {metrics.states} états, {metrics.edges} arcs, "
+            f"{metrics.states_per_second:,.0f} états/s, frontière {metrics.frontier} "
+            f"({metrics.elapsed:.1f} s)")
+        self.status_bar.repaint() # redessine la barre d'état sans traiter les événements en attente
+
     def handle_generate_report(self):
             print("Bouton Rapport cliqué...")
             if not self.net.places and not self.net.transitions:
@@ -245,7 +518,9 @@ class MainWindow(QWidget):
                 print(f"Destination choisie : {filename}")
                 try:
                     print("Lancement de generate_pdf_report...")
-                    generate_pdf_report(self.net, filename)
+                    generate_pdf_report(self.net, filename, monte_carlo=self.last_monte_carlo,
+                                        performance=self.last_performance,
+                                        graph=self.analyzer.analyze(self.net).graph)
                     print("Sauvegarde terminée avec succès")
                 except Exception as e:
                     print(f"ERREUR CRITIQUE : {e}")
@@ -253,63 +528,398 @@ class MainWindow(QWidget):
                     traceback.print_exc()
 
 
+    # appelé après chaque modification du réseau
+    # (kind : "marking", "weight", "structure", "color", "rate" ou "delay")
+    def on_net_edited(self, kind):
+        self.reset_simulation()
+        self.last_monte_carlo = None
+        self.last_performance = None
+        if kind in ("marking", "weight", "structure"):
+            self.diagnostics_timer.start() # chaque modification repousse le diagnostic
+
+    ## ---- Diagnostic en direct ---- ##
+    # la structure compilée (types simples) est construite ici, l'analyse se fait dans le thread
+    def start_diagnostics(self):
+        if self.loading is not None:
+            return # relancé par load_frame une fois le réseau chargé
+        if self.diagnostics_worker.busy():
+            self.diagnostics_stale = True
+            return
+        self.diagnostics_stale = False
+        self.labelDiagnosticsTitle.setText("DIAGNOSTIC ...")
+        self.diagnostics_worker.submit(self.diagnostics_finished,
+                                       self.diagnostics.analyze_compiled, CompiledNet(self.net))
+
+    def diagnostics_finished(self, future):
+        if self.diagnostics_stale:
+            self.start_diagnostics() # résultat périmé : le réseau a changé entre-temps
+            return
+        self.labelDiagnosticsTitle.setText("DIAGNOSTIC")
+        error = future.exception()
+        if error is not None:
+            self.labelDiagnostics.setText("Diagnostic indisponible")
+            print(f"Erreur lors du diagnostic : {error}")
+            import traceback
+            traceback.print_exception(type(error), error, error.__traceback__)
+            return
+        self.show_diagnostics(future.result())
+
+    def show_diagnostics(self, d):
+        if not d.num_places and not d.num_transitions:
+            self.labelDiagnostics.setText("Réseau vide")
+            return
+
+        def names(items):
+            shown = ", ".join(items[:DIAGNOSTICS_NAMES])
+            return shown + (f" (+{len(items) - DIAGNOSTICS_NAMES})" if len(items) > DIAGNOSTICS_NAMES else "")
+
+        lines = [f"Tirables : {len(d.enabled)}/{d.num_transitions}" + (f" - {names(d.enabled)}" if d.enabled else "")]
+        covered = d.num_places - len(d.uncovered_places)
+        lines.append(f"P-invariants : {covered}/{d.num_places} places couvertes"
+                     + (" (borné)" if d.bounded else f", hors invariant : {names(d.uncovered_places)}"))
+        covered = d.num_transitions - len(d.uncovered_transitions)
+        lines.append(f"T-invariants : {covered}/{d.num_transitions} transitions couvertes"
+                     + (f", hors invariant : {names(d.uncovered_transitions)}" if d.uncovered_transitions else ""))
+        if d.strongly_connected:
+            lines.append("Cycles : réseau fortement connexe")
+        else:
+            lines.append(f"Cycles : {d.components} composante(s) cyclique(s)"
+                         + (f", hors cycle : {names(d.acyclic)}" if d.acyclic else ""))
+        if d.sources:
+            lines.append(f"Attention : transitions sans entrée (jetons sans fin) : {names(d.sources)}")
+        if d.sinks:
+            lines.append(f"Attention : transitions sans sortie : {names(d.sinks)}")
+        if d.empty_siphon:
+            lines.append(f"Attention : siphon vide {{{names(d.empty_siphon)}}}, "
+                         f"jamais tirables : {names(d.dead)}")
+        if d.exact:
+            lines.append(f"Espace d'états : {d.states:,} états")
+        elif d.upper_log10 is not None:
+            lines.append(f"Espace d'états : plus de {d.states:,} états, au plus ~10^{math.ceil(d.upper_log10)}")
+        else:
+            lines.append(f"Espace d'états : plus de {d.states:,} états, pas de borne structurelle")
+        self.labelDiagnostics.setText("\n".join(lines))
+
+    ## ---- Simulation ---- ##
+    def ensure_simulator(self):
+        if self.simulator is None:
+            self.simulator = Simulator(self.net, policy=self.comboPolicy.currentText())
+        return self.simulator
+
+    def step_simulation(self):
+        self.pause_simulation()
+        sim = self.ensure_simulator()
+        fired = sim.step()
+        self.refresh_simulation_display(fired)
+
+    def run_simulation(self):
+        self.ensure_simulator()
+        self.sim_timer.start()
+
+    def pause_simulation(self):
+        self.sim_timer.stop()
+        self.replay_timer.stop()
+
+    # Une image : on simule autant que le budget le permet, puis on redessine une seule fois
+    def simulation_frame(self):
+        sim = self.simulator
+        clock = QElapsedTimer()
+        clock.start()
+        while clock.elapsed() < SIM_BUDGET_MS:
+            if sim.run(SIM_CHUNK) < SIM_CHUNK:
+                self.pause_simulation()
+                break
+        self.refresh_simulation_display()
+
+    # Reporte le marquage du simulateur sur les places (seules celles qui changent sont redessinées)
+    def refresh_simulation_display(self, fired=None):
+        sim = self.simulator
+        for name, tokens in zip(sim.cn.place_names, sim.marking):
+            item = self.visual_places.get(name)
+            if item: item.set_tokens(tokens)
+        status = "bloquée" if sim.deadlocked else ("en cours" if self.sim_timer.isActive() else "en pause")
+        last = f" - dernier tir : {fired}" if fired else ""
+        self.labelSim.setText(f"Simulation : {status}\n{sim.steps} tirs{last}")
+
+    # Arrête la simulation et réaffiche le marquage initial
+    def reset_simulation(self):
+        self.pause_simulation()
+        self.simulator = None
+        for name, item in self.visual_places.items():
+            place = self.net.places.get(name)
+            if place: item.set_tokens(place.initial_tokens)
+        self.labelSim.setText("Simulation : arrêtée")
+
+    # Rejoue une séquence de tirs sur la scène depuis le marquage initial
+    def replay_trace(self, trace):
+        self.reset_simulation()
+        self.simulator = Simulator(self.net)
+        self.replay_queue = list(trace)
+        self.refresh_simulation_display()
+        if self.replay_queue:
+            self.replay_timer.start()
+
+    def replay_frame(self):
+        if not self.replay_queue or self.simulator is None:
+            self.replay_timer.stop()
+            return
+        name = self.replay_queue.pop(0)
+        self.simulator.fire(self.simulator.cn.transition_index[name])
+        if not self.replay_queue:
+            self.replay_timer.stop()
+        self.refresh_simulation_display(name)
+
+    # marches aléatoires en parallèle, le résultat est ajouté au prochain rapport
+    def handle_monte_carlo(self):
+        if not self.net.transitions:
+            print("Erreur : aucune transition.")
+            return
+        walks, ok = QInputDialog.getInt(self, "Monte-Carlo", "Nombre de marches :", 1000, 1, 10_000_000)
+        if not ok: return
+        steps, ok = QInputDialog.getInt(self, "Monte-Carlo", "Tirs maximum par marche :", 1000, 1, 10_000_000)
+        if not ok: return
+
+        try:
+            self.last_monte_carlo = run_monte_carlo(self.net, walks=walks, max_steps=steps)
+            summary = self.last_monte_carlo.summary()
+            print(f"Monte-Carlo : {summary['walks']} marches, blocage dans {summary['deadlock_probability']:.2%} des cas")
+        except Exception as e:
+            print(f"Erreur lors de l'analyse Monte-Carlo : {e}")
+            import traceback
+            traceback.print_exc()
+
+    # régime stationnaire de la CTMC, le résultat est ajouté au prochain rapport
+    def handle_performance(self):
+        if not self.net.transitions:
+            print("Erreur : aucune transition.")
+            return
+        try:
+            self.last_performance = solve_gspn(self.net)
+            print(f"Performance : {self.last_performance.num_tangible} états tangibles")
+            for name, value in self.last_performance.throughput.items():
+                print(f"  débit {name} = {value:.4f}")
+        except Exception as e:
+            print(f"Erreur lors de l'analyse de performance : {e}")
+            import traceback
+            traceback.print_exc()
+
+    # simulation à événements discrets jusqu'à un horizon choisi
+    def handle_timed_simulation(self):
+        if not self.net.transitions:
+            print("Erreur : aucune transition.")
+            return
+        horizon, ok = QInputDialog.getDouble(self, "Simulation temporisée", "Horizon :", 1000.0, 0.001, 1e12, 3)
+        if not ok: return
+        try:
+            sim = TimedSimulator(self.net).run(horizon)
+            print(f"Simulation temporisée : {sim.events} événements jusqu'à t = {sim.now:g}")
+            for name, value in sim.throughput().items():
+                print(f"  débit {name} = {value:.4f}")
+            for name, value in sim.mean_occupancy().items():
+                print(f"  occupation {name} = {value:.3f}")
+        except Exception as e:
+            print(f"Erreur lors de la simulation temporisée : {e}")
+            import traceback
+            traceback.print_exc()
+
+    # recherche des premiers blocages (traces les plus courtes), le premier est rejoué sur la scène
+    def handle_deadlock_search(self):
+        count, ok = QInputDialog.getInt(self, "Blocages", "Nombre de blocages à trouver :", 1, 1, 1_000_000)
+        if not ok: return
+        try:
+            # la recherche se fait sur le réseau réduit, les traces sont dépliées sur le réseau affiché
+            reduction = reduce_net(self.net)
+            print(f"Réseau réduit : {reduction.summary()}")
+            deadlocks, explored, complete = self.run_exploration(find_deadlocks, CompiledNet(reduction.net),
+                                                                 limit=count, metrics=self.exploration_metrics())
+            deadlocks = [reduction.lift_deadlock(d) for d in deadlocks]
+            if not deadlocks:
+                print(f"Aucun blocage ({explored} états explorés)")
+                return
+            print(f"{len(deadlocks)} blocage(s) trouvé(s) après {explored} états")
+            for i, deadlock in enumerate(deadlocks, 1):
+                print(f"  {i}. {' -> '.join(deadlock.trace) or '(marquage initial)'}")
+                print(f"     marquage : {deadlock.marking}")
+            self.replay_trace(deadlocks[0].trace)
+        except Exception as e:
+            print(f"Erreur lors de la recherche de blocages : {e}")
+            import traceback
+            traceback.print_exc()
+
+    # vérification CTL/LTL à la volée, affiche le verdict et la séquence témoin
+    def handle_model_checking(self):
+        formula, ok = QInputDialog.getText(self, "Vérifier une propriété", "Formule (ex : AG(P1+P2 <= 1), EF deadlock) :")
+        if not ok or not formula.strip(): return
+        try:
+            verdict = check_formula(self.net, formula, reduce=True)
+            print(f"{formula} : {'vraie' if verdict.holds else 'fausse'} ({verdict.states_explored} états explorés)")
+            if verdict.trace is not None:
+                print(f"  séquence : {' -> '.join(verdict.trace) or '(marquage initial)'}")
+                if verdict.loop_start is not None:
+                    print(f"  boucle à partir du tir {verdict.loop_start + 1}")
+        except ValueError as e:
+            print(f"Erreur dans la formule : {e}")
+        except Exception as e:
+            print(f"Erreur lors de la vérification : {e}")
+            import traceback
+            traceback.print_exc()
+
     # fonction utile pour restet l'éditeur
     def reset_editor(self):
         self.view.scene.clear()  # Clear visual items
         self.net.wipe() # Clear backend
+        self.visual_places = {}
+        self.visual_transitions = {}
+        self.visual_arcs = {}
+        self.on_net_edited("structure")
         # Reset editor state
         self.clear_properties()
         self.temp_arc_start = None
 
     
-    # sauvegarde du réseau de Petri a partir d'une fonction de updownload
+    # sauvegarde du réseau de Petri : instantané dans le thread de l'interface, écriture en arrière-plan
     def save_action(self):
         filename, _ = QFileDialog.getSaveFileName(
             self,
             "Save Petri Net",
             "",
-            "Petri Net (*.json)"
+            "Petri Net compact (*.petri.gz *.petri *.petri.zst);;Petri Net (*.json);;PNML (*.pnml)"
         )
 
         if not filename:
             return
 
-        save_petri_net(
-            filename = filename,
-            scene = self.view.scene,
-            net = self.net
-        )
-    
-    
-    # ouverture d'un réseau de Petri a partir d'une fonction de updownload
+        records = snapshot_model(self.net, scene_layout(self.visual_places, self.visual_transitions))
+        self.status_bar.showMessage(f"Sauvegarde de {os.path.basename(filename)}...")
+        self.io.submit(lambda future: self.save_finished(future, filename, records),
+                       write_snapshot, filename, records)
+
+    def save_finished(self, future, filename, records):
+        error = future.exception()
+        if error is not None:
+            self.status_bar.showMessage("Échec de la sauvegarde")
+            print(f"ERREUR CRITIQUE : {error}")
+            import traceback
+            traceback.print_exception(type(error), error, error.__traceback__)
+            return
+        self.saved_records = records
+        self.status_bar.showMessage(f"Sauvegardé : {filename}")
+        print("Sauvegarde terminée avec succès")
+
+    # sauvegarde automatique, seulement si le modèle (positions comprises) a changé depuis la précédente
+    def autosave(self):
+        if self.recovery_pending or self.loading is not None or self.io.busy():
+            return
+        records = snapshot_model(self.net, scene_layout(self.visual_places, self.visual_transitions))
+        if records == self.autosaved_records:
+            return
+        self.io.submit(lambda future: self.autosave_finished(future, records),
+                       write_autosave, self.autosave_path, records)
+
+    def autosave_finished(self, future, records):
+        error = future.exception()
+        if error is not None:
+            print(f"Sauvegarde automatique impossible : {error}")
+            return
+        self.autosaved_records = records
+        self.autosave_written = True
+
+    # la sauvegarde automatique trouvée au démarrage est toujours mise de côté (autosave-date.petri.gz),
+    # puis rechargée si l'utilisateur le demande
+    def offer_recovery(self):
+        answer = QMessageBox.question(
+            self, "Sauvegarde automatique",
+            f"Une sauvegarde automatique d'une session précédente a été trouvée :\n{self.autosave_path}\n\n"
+            "Voulez-vous la restaurer ?",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+        folder, base = os.path.split(self.autosave_path)
+        stem = base.split(".", 1)[0]
+        recovered = os.path.join(folder, f"{stem}-{datetime.now():%Y%m%d-%H%M%S}.{base.split('.', 1)[1]}")
+        try:
+            os.replace(self.autosave_path, recovered)
+        except OSError as e:
+            print(f"Sauvegarde automatique désactivée : impossible de déplacer {self.autosave_path} ({e})")
+            return
+        self.recovery_pending = False
+        print(f"Sauvegarde automatique précédente conservée dans {recovered}")
+        if answer == QMessageBox.Yes:
+            self.start_loading(recovered)
+
+    # ouverture d'un réseau de Petri : lecture du fichier en arrière-plan dans un réseau neuf,
+    # puis création de la scène par paquets (load_frame) sans bloquer la fenêtre
     def load_action(self):
         filename, _ = QFileDialog.getOpenFileName(
             self,
             "Load Petri Net",
             "",
-            "Petri Net (*.json)"
+            "Petri Net (*.petri *.petri.gz *.petri.zst *.json *.pnml);;PNML (*.pnml)"
         )
 
         if not filename:
             return
+        self.start_loading(filename)
 
-        # MainWindow owns the wipe
-        self.reset_editor()
+    def start_loading(self, filename):
+        if self.loading is not None:
+            return
+        self.set_io_locked(True)
+        self.status_bar.showMessage(f"Lecture de {os.path.basename(filename)}...")
+        self.io.submit(lambda future: self.backend_loaded(future, filename), read_backend, filename, PetriNet())
 
-        success, message, p_items, t_items = load_petri_net(
-            filename = filename,
-            scene = self.view.scene,
-            petri_net = self.net
-        )
+    def backend_loaded(self, future, filename):
+        error = future.exception()
+        if error is not None:
+            self.set_io_locked(False)
+            self.status_bar.showMessage(f"Échec du chargement de {os.path.basename(filename)} : "
+                                        + " ".join(str(error).split()))
+            print(f"Erreur lors du chargement : {error}")
+            return
+        net, layout, records = future.result()
+        self.reset_editor() # MainWindow owns the wipe
+        self.net = net
+        self.saved_records = self.autosaved_records = records
+        self.loading = populate_scene_chunks(self.view.scene, net, layout)
+        self.status_bar.showMessage(f"Chargement de {os.path.basename(filename)}...")
+        self.load_timer.start()
 
-        if success:
-            self.visual_places = p_items
-            self.visual_transitions = t_items
+    # un paquet d'items par tour de boucle d'événements
+    def load_frame(self):
+        try:
+            created = next(self.loading)
+        except StopIteration as done:
+            self.load_timer.stop()
+            self.loading = None
+            self.visual_places, self.visual_transitions, self.visual_arcs = done.value
+            self.view.set_fast_rendering(len(self.visual_places) + len(self.visual_transitions) > LARGE_NET_THRESHOLD)
+            self.set_io_locked(False)
+            self.on_net_edited("structure")
+            self.status_bar.showMessage(f"Réseau chargé : {len(self.net.places)} places, "
+                                        f"{len(self.net.transitions)} transitions, {len(self.net.arcs)} arcs")
             print("Petri net loaded")
-        else:
-            print("Fuck fuck fuckkkk", message)
-    
-    
+            return
+        total = len(self.net.places) + len(self.net.transitions) + len(self.net.arcs)
+        self.status_bar.showMessage(f"Chargement : {created}/{total} éléments")
+
+    # pendant un chargement, la scène et les boutons sont inactifs (le modèle est incomplet)
+    def set_io_locked(self, locked):
+        self.view.setEnabled(not locked)
+        for button in self.findChildren(QPushButton):
+            button.setEnabled(not locked)
+
+    # fermeture : les écritures en cours sont terminées ; la sauvegarde automatique de cette session
+    # est supprimée si le modèle n'a pas changé depuis la dernière sauvegarde
+    def closeEvent(self, event):
+        self.autosave_timer.stop()
+        self.load_timer.stop()
+        self.diagnostics_timer.stop()
+        self.io.shutdown()
+        self.diagnostics_worker.shutdown()
+        if self.autosave_written and self.loading is None and os.path.exists(self.autosave_path):
+            records = snapshot_model(self.net, scene_layout(self.visual_places, self.visual_transitions))
+            if records == self.saved_records:
+                os.remove(self.autosave_path)
+        super().closeEvent(event)
+
     # gestion des clics sur les boutons d'ajout
     def handle_mode_click(self, mode, button):
         # désactivation du mode ajout
@@ -338,6 +948,7 @@ class MainWindow(QWidget):
             item.color_set = "Integer" 
             self.view.scene.addItem(item)
             self.visual_places[name] = item
+            self.on_net_edited("structure")
             return {'backend': bp, 'item': item}
         elif ok and not name:
             bp = self.net.add_place()
@@ -345,6 +956,7 @@ class MainWindow(QWidget):
             item.color_set = "Integer" 
             self.view.scene.addItem(item)
             self.visual_places[bp.name] = item
+            self.on_net_edited("structure")
             return {'backend': bp, 'item': item}
         else:
             return None
@@ -362,12 +974,14 @@ class MainWindow(QWidget):
             item = TransitionItem(x, y, name=name)
             self.view.scene.addItem(item)
             self.visual_transitions[name] = item
+            self.on_net_edited("structure")
             return {'backend': bt, 'item': item}
         elif ok and not name:
             bt = self.net.add_transition()
             item = TransitionItem(x, y, name=bt.name)
             self.view.scene.addItem(item)
             self.visual_transitions[bt.name] = item
+            self.on_net_edited("structure")
             return {'backend': bt, 'item': item}
         else:
             return None
@@ -379,6 +993,8 @@ class MainWindow(QWidget):
             self.view.scene.addItem(visual)
             start_item.add_arc(visual)
             end_item.add_arc(visual)
+            self.visual_arcs[arc_backend] = visual
+            self.on_net_edited("structure")
             return {'backend': arc_backend, 'visual': visual}
         except: return None
 
@@ -388,28 +1004,120 @@ class MainWindow(QWidget):
             if item.widget(): item.widget().deleteLater()
 
     def delete_item(self, item):
-        if isinstance(item, (PlaceItem, TransitionItem)):
-            name = item.name
+        self.delete_items([item])
+
+    # suppression groupée : backend et scène mis à jour en un seul lot, un seul rafraîchissement
+    def delete_items(self, items):
+        place_names, transition_names = [], []
+        arc_items = {}
+        for item in items:
             if isinstance(item, PlaceItem):
-                self.net.delete_place(name)
-                self.visual_places.pop(name, None)
-            else:
-                self.net.delete_transition(name)
-                self.visual_transitions.pop(name, None)
-            for arc in item.arcs[:]:
-                if arc in self.view.scene.items(): self.view.scene.removeItem(arc)
-                other = arc.start_item if arc.start_item != item else arc.end_item
-                other.remove_arc(arc)
-            self.view.scene.removeItem(item)
-        elif isinstance(item, ArcItem):
-            self.net.delete_arc(item.backend_arc.place.name, item.backend_arc.transition.name, item.backend_arc.direction)
+                place_names.append(item.name)
+            elif isinstance(item, TransitionItem):
+                transition_names.append(item.name)
+            elif not isinstance(item, ArcItem):
+                continue
+            for arc in (item.arcs if not isinstance(item, ArcItem) else [item]):
+                arc_items[arc.backend_arc] = arc
 
-            item.start_item.remove_arc(item)
-            item.end_item.remove_arc(item)
-            self.view.scene.removeItem(item)
+        self.net.delete_many(place_names, transition_names, list(arc_items))
+
+        self.view.setUpdatesEnabled(False)
+        for backend_arc, arc in arc_items.items():
+            self.visual_arcs.pop(backend_arc, None)
+            arc.start_item.remove_arc(arc)
+            arc.end_item.remove_arc(arc)
+            if arc.scene() is self.view.scene: self.view.scene.removeItem(arc)
+        for name in place_names:
+            self.view.scene.removeItem(self.visual_places.pop(name))
+        for name in transition_names:
+            self.view.scene.removeItem(self.visual_transitions.pop(name))
+        self.view.setUpdatesEnabled(True)
+
+        self.on_net_edited("structure")
         self.clear_properties()
         self.view.scene.update()
 
+    # déplacement groupé, chaque arc touché n'est recalculé qu'une fois
+    def move_items(self, items, dx, dy):
+        for item in items:
+            if isinstance(item, (PlaceItem, TransitionItem)):
+                item.moveBy(dx, dy)
+        arc_batcher.flush()
+
+    # copie la sélection (noeuds + arcs internes à la sélection) dans le presse-papier interne
+    def copy_selection(self):
+        selected = self.view.scene.selectedItems()
+        places = [i for i in selected if isinstance(i, PlaceItem)]
+        transitions = [i for i in selected if isinstance(i, TransitionItem)]
+        names = set(i.name for i in places + transitions)
+        arcs = []
+        for item in transitions:
+            for arc in item.arcs:
+                a = arc.backend_arc
+                if a.place.name in names:
+                    arcs.append((a.place.name, a.transition.name, a.direction, a.weight))
+        self.clipboard = {
+            # attributs du modèle (couleurs, taux GSPN, délai) puis position
+            "places": [(i.name, self.net.places[i.name].initial_tokens, self.net.places[i.name].color_set,
+                        i.pos().x(), i.pos().y()) for i in places],
+            "transitions": [(i.name, self.net.transitions[i.name].rate, self.net.transitions[i.name].immediate,
+                             self.net.transitions[i.name].delay, i.pos().x(), i.pos().y()) for i in transitions],
+            "arcs": arcs,
+            "pastes": 0
+        }
+
+    # colle le presse-papier en un seul lot, avec des noms uniques et un décalage
+    def paste_clipboard(self):
+        if not self.clipboard:
+            return
+        self.clipboard["pastes"] += 1
+        offset = PASTE_OFFSET * self.clipboard["pastes"]
+
+        renamed = {}
+        for name, *_ in self.clipboard["places"] + self.clipboard["transitions"]:
+            new_name, counter = name, 1
+            while new_name in self.net.places or new_name in self.net.transitions or new_name in renamed.values():
+                new_name = f"{name}.{counter}"
+                counter += 1
+            renamed[name] = new_name
+
+        places, transitions, arcs = self.net.add_many(
+            places=[(renamed[n], tokens, color_set) for n, tokens, color_set, _, _ in self.clipboard["places"]],
+            transitions=[(renamed[n], rate, immediate, delay)
+                         for n, rate, immediate, delay, _, _ in self.clipboard["transitions"]],
+            arcs=[(renamed[p], renamed[t], d, w) for p, t, d, w in self.clipboard["arcs"]]
+        )
+
+        self.view.setUpdatesEnabled(False)
+        self.view.scene.clearSelection()
+        new_items = []
+        for bp, (_, tokens, _, x, y) in zip(places, self.clipboard["places"]):
+            item = PlaceItem(x + offset, y + offset, name=bp.name)
+            item.color_set = bp.color_set
+            item.set_tokens(tokens)
+            self.visual_places[bp.name] = item
+            new_items.append(item)
+        for bt, (*_, x, y) in zip(transitions, self.clipboard["transitions"]):
+            item = TransitionItem(x + offset, y + offset, name=bt.name)
+            self.visual_transitions[bt.name] = item
+            new_items.append(item)
+        for item in new_items:
+            self.view.scene.addItem(item)
+            item.setSelected(True)
+        for arc in arcs:
+            p_item = self.visual_places[arc.place.name]
+            t_item = self.visual_transitions[arc.transition.name]
+            start, end = (p_item, t_item) if arc.direction == 'place_to_transition' else (t_item, p_item)
+            visual = ArcItem(start, end, weight=arc.weight, arc=arc)
+            self.view.scene.addItem(visual)
+            start.add_arc(visual)
+            end.add_arc(visual)
+            self.visual_arcs[arc] = visual
+        self.view.setUpdatesEnabled(True)
+        self.on_net_edited("structure")
+        self.view.scene.update()
+
     # met à jour le panneau des propriétés
     def update_properties(self, item):
         self.clear_properties()
@@ -432,6 +1140,8 @@ class MainWindow(QWidget):
             
             def on_type_change(t):
                 item.color_set = t
+                self.net.places[item.name].color_set = t
+                self.on_net_edited("color")
             combo.currentTextChanged.connect(on_type_change)
             self.info_layout.addRow(combo)
 
@@ -448,9 +1158,10 @@ class MainWindow(QWidget):
             lbl_j.setStyleSheet(style_noir + f"font-size: {'22pt' if item.tokens > 5 else '16pt'};")
             
             def upd(v):
-                new_v = max(0, item.tokens + v)
+                new_v = max(0, self.net.places[item.name].initial_tokens + v)
                 self.net.set_tokens(item.name, new_v)
                 item.set_tokens(new_v)
+                self.on_net_edited("marking")
                 lbl_j.setText(f"{new_v}")
                 lbl_j.setStyleSheet(style_noir + f"font-size: {'22pt' if new_v > 5 else '16pt'};")
 
@@ -461,6 +1172,52 @@ class MainWindow(QWidget):
             
         elif isinstance(item, TransitionItem):
             self.info_layout.addRow(QLabel(f"ID : {item.name}", styleSheet=style_noir))
+            backend_t = self.net.transitions[item.name]
+
+            # paramètres stochastiques (GSPN) : taux exponentiel, ou poids si immédiate
+            self.info_layout.addRow(QLabel("TAUX / POIDS :", styleSheet=style_noir))
+            spin_rate = QDoubleSpinBox()
+            spin_rate.setDecimals(3)
+            spin_rate.setRange(0.001, 1_000_000)
+            spin_rate.setValue(backend_t.rate)
+            spin_rate.setStyleSheet("background-color: white; color: black; border-radius: 5px; padding: 5px;")
+            check_imm = QCheckBox("Immédiate")
+            check_imm.setChecked(backend_t.immediate)
+            check_imm.setStyleSheet(style_noir)
+
+            def set_rate(v):
+                backend_t.rate = v
+                self.on_net_edited("rate")
+            def set_immediate(state):
+                backend_t.immediate = bool(state)
+                self.on_net_edited("rate")
+            spin_rate.valueChanged.connect(set_rate)
+            check_imm.stateChanged.connect(set_immediate)
+            self.info_layout.addRow(spin_rate)
+            self.info_layout.addRow(check_imm)
+
+            # délai (réseaux temporisés) : type de loi + paramètres séparés par des virgules
+            self.info_layout.addRow(QLabel("DÉLAI :", styleSheet=style_noir))
+            combo_delay = QComboBox()
+            combo_delay.addItems(DELAY_KINDS)
+            combo_delay.setCurrentText(backend_t.delay[0])
+            combo_delay.setStyleSheet("background-color: white; color: black; border-radius: 5px; padding: 5px;")
+            edit_delay = QLineEdit(", ".join(f"{v:g}" for v in backend_t.delay[1:]))
+            edit_delay.setStyleSheet("background-color: white; color: black; border-radius: 5px; padding: 5px;")
+
+            def set_delay():
+                try:
+                    params = [float(v) for v in edit_delay.text().split(",") if v.strip()]
+                    backend_t.delay = check_delay((combo_delay.currentText(), *params))
+                    edit_delay.setStyleSheet("background-color: white; color: black; border-radius: 5px; padding: 5px;")
+                    self.on_net_edited("delay")
+                except ValueError as e:
+                    edit_delay.setStyleSheet("background-color: #FF7F7F; color: black; border-radius: 5px; padding: 5px;")
+                    print(f"Délai invalide : {e}")
+            combo_delay.currentTextChanged.connect(lambda _: set_delay())
+            edit_delay.editingFinished.connect(set_delay)
+            self.info_layout.addRow(combo_delay)
+            self.info_layout.addRow(edit_delay)
             
         elif isinstance(item, ArcItem):
             self.info_layout.addRow(QLabel("TYPE : ARC / LIAISON", styleSheet=style_noir))
@@ -484,6 +1241,7 @@ class MainWindow(QWidget):
                 new_weight = max(1, item.weight + delta)
                 item.set_weight(new_weight) # Met à jour le visuel
                 item.backend_arc.weight = new_weight # Met à jour le poids dans le backend (PetriNet)
+                self.on_net_edited("weight")
                 lbl_poids.setText(str(new_weight))
 
             btn_plus_p.clicked.connect(lambda: adjust_weight(1))
@@ -515,20 +1273,18 @@ class MainWindow(QWidget):
         }
         coloring_map = {}
         
-        for p in self.net.places:
-            name = p.name if hasattr(p, 'name') else str(p)
+        for p in self.net.places.values():
             # On récupère le type de donnée de la place
-            coloring_map[name] = getattr(p, 'color_set', 'Integer')
+            coloring_map[p.name] = p.color_set
 
         # Les transitions sont marquées comme ayant des expressions de Garde (G)
-        for t in self.net.transitions:
-            name = t.name if hasattr(t, 'name') else str(t)
-            coloring_map[name] = "Guard"
+        for t in self.net.transitions.values():
+            coloring_map[t.name] = "Guard"
         
         for name, data_type in coloring_map.items():
             item = self.visual_places.get(name) or self.visual_transitions.get(name)
             if item:
-                final_type = getattr(item, 'color_set', data_type)
+                final_type = data_type
                 item.setBrush(QBrush(palette.get(final_type, QColor("#CCCCCC"))))
                 item.setPen(QPen(Qt.white, 1, Qt.DashLine) if final_type == "Guard" else QPen(Qt.black, 2))
         self.view.scene.update()
@@ -1,10 +1,14 @@
 # logic/analysis.py
 # Module pour l'analyse et la visualisation de l'espace d'états d'un réseau de Petri
 
+import time
 import networkx as nx
 import matplotlib.pyplot as plt
 from collections import deque
 from logic.petri_net import PetriNet
+from logic.compiled import CompiledNet
+from logic.reduction import reduce_net
+from logic.reachability import explore_batched
 
 # Classe pour visualiser l'espace d'états
 class StateSpaceVisualizer:
@@ -77,50 +81,39 @@ def simulate_fire(net: PetriNet, t):
         elif arc.transition == t and arc.direction == "transition_to_place":
             arc.place.tokens += arc.weight
 
-def build_state_space(net: PetriNet, visualizer: StateSpaceVisualizer):
+# metrics : ExplorationMetrics optionnel (compteurs, temps par phase, hooks de progression)
+# L'exploration se fait par paquets sur la structure compilée (logic/reachability.explore_batched),
+# le visualiseur est rempli ensuite ; états numérotés dans l'ordre du BFS comme auparavant.
+def build_state_space(net: PetriNet, visualizer: StateSpaceVisualizer, metrics=None):
     # FORCE le marquage actuel sur le marquage initial pour la simulation
     for p in net.places.values():
         p.tokens = p.initial_tokens if hasattr(p, 'initial_tokens') and p.tokens == 0 else p.tokens
 
-    seen = {}
-    queue = deque()       
-    next_id = 0
-    
-    initial_marking = get_marking(net)
-    seen[initial_marking] = next_id
-    visualizer.add_state(next_id, format_marking(net, initial_marking), is_initial=True)
-    queue.append(initial_marking)
-    next_id += 1
-
-    while queue:
-        m_source = queue.popleft()
-        source_id = seen[m_source]
-        apply_marking(net, m_source) 
-
-        enabled = net.get_enabled()
-        if not enabled:
-            visualizer.graph.nodes[source_id]['color'] = '#FF7F7F'
-
-        for t in enabled:
-            simulate_fire(net, t)
-            m_target = get_marking(net)
-            
-            if m_target not in seen:
-                target_id = next_id
-                seen[m_target] = target_id
-                visualizer.add_state(target_id, format_marking(net, m_target))
-                queue.append(m_target)
-                next_id += 1
-            else:
-                target_id = seen[m_target]
-            
-            visualizer.graph.add_edge(source_id, target_id, label=t.name)
-            apply_marking(net, m_source) 
-            
-    apply_marking(net, initial_marking)
+    graph = explore_batched(CompiledNet(net), initial=get_marking(net), metrics=metrics)
+    start = time.perf_counter()
+    fill_visualizer(net, graph, visualizer)
+    if metrics is not None:
+        # libellés des marquages et construction du graphe du visualiseur
+        metrics.add_time("labeling", time.perf_counter() - start)
+    return graph
+
+# Remplit le visualiseur à partir d'un graphe déjà calculé (logic.reachability.ReachabilityGraph)
+def fill_visualizer(net: PetriNet, graph, visualizer: StateSpaceVisualizer):
+    deadlocks = set(graph.deadlocks)
+    for state_id, marking in enumerate(graph.markings):
+        # un marquage initial bloqué reste dessiné comme un blocage (couleur prioritaire)
+        visualizer.add_state(state_id, format_marking(net, marking), is_deadlock=state_id in deadlocks,
+                             is_initial=state_id == 0 and state_id not in deadlocks)
+    names = graph.cn.transition_names
+    for source_id, target_id, t in graph.edges():
+        visualizer.add_transition(source_id, target_id, names[t])
 
 # algrithmes de verification des propriétés
-def checkVivacity(net: PetriNet):
+# reduce : explore le réseau réduit (logic/reduction.py), les transitions tirées sont
+# ramenées aux transitions d'origine
+def checkVivacity(net: PetriNet, reduce=False):
+    reduction = reduce_net(net) if reduce else None
+    original, net = net, reduction.net if reduce else net
     start_marking = get_marking(net)
     visited = {start_marking}
     queue = deque([start_marking])
@@ -143,7 +136,9 @@ def checkVivacity(net: PetriNet):
 
     apply_marking(net, start_marking)
     if deadlock_found: return 0
-    return 2 if len(fired_transitions) == len(net.transitions) else 1
+    if reduction is not None:
+        fired_transitions = reduction.covered_transitions(fired_transitions)
+    return 2 if len(fired_transitions) == len(original.transitions) else 1
 
 def checkLoop(net: PetriNet):
     adj = {n: [] for n in list(net.places.values()) + list(net.transitions.values())}
@@ -0,0 +1,478 @@
+# logic/colored.py
+# Réseaux de Petri colorés (CPN) : places typées contenant des multi-ensembles,
+# arcs portant des expressions, transitions gardées.
+# Les inscriptions reprennent la syntaxe CPN : "2`x ++ y" (multiplicité`expression, séparées par ++).
+# Les expressions et gardes sont des expressions Python restreintes (arithmétique, comparaisons,
+# booléens, tuples, indices et quelques fonctions), évaluées avec les variables liées.
+
+import ast
+import re
+from collections import deque
+from itertools import product
+from logic.petri_net import PetriNet
+
+# Seules fonctions appelables dans une expression
+FUNCTIONS = {"abs": abs, "min": min, "max": max, "len": len, "int": int, "str": str,
+             "bool": bool, "tuple": tuple, "range": range}
+# Noeuds de syntaxe acceptés : pas d'attributs, de lambdas, de compréhensions ni d'affectations
+ALLOWED_NODES = (ast.Expression, ast.BoolOp, ast.BinOp, ast.UnaryOp, ast.Compare, ast.IfExp,
+                 ast.Call, ast.Name, ast.Load, ast.Constant, ast.Tuple, ast.List, ast.Subscript, ast.Slice,
+                 ast.And, ast.Or, ast.Not, ast.USub, ast.UAdd, ast.Add, ast.Sub, ast.Mult, ast.Div,
+                 ast.FloorDiv, ast.Mod, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.In, ast.NotIn)
+TERM_PATTERN = re.compile(r"^\s*(\d+)\s*`\s*(.+?)\s*$")
+IDENTIFIER = re.compile(r"^[A-Za-z_]\w*$")
+
+
+## ---- Ensembles de couleurs ---- ##
+# Un ensemble de couleurs est soit fini (liste de valeurs), soit défini par un type Python
+class ColorSet:
+    def __init__(self, name, values=None, python_type=None):
+        self.name = name
+        self.values = tuple(values) if values is not None else None
+        self.value_set = frozenset(self.values) if values is not None else None
+        self.python_type = python_type
+
+    @property
+    def finite(self):
+        return self.values is not None
+
+    def __contains__(self, color):
+        if self.value_set is not None:
+            return color in self.value_set
+        return self.python_type is None or isinstance(color, self.python_type)
+
+    def __iter__(self):
+        if not self.finite:
+            raise ValueError(f"Color set '{self.name}' is not finite")
+        return iter(self.values)
+
+    def __repr__(self):
+        return f"ColorSet({self.name})"
+
+
+def int_range(name, low, high):
+    return ColorSet(name, range(low, high + 1))
+
+
+def enumerated(name, *values):
+    return ColorSet(name, values)
+
+
+UNIT = ColorSet("Unit", [()])
+BOOLEAN = ColorSet("Boolean", (False, True))
+
+# Ensembles proposés dans l'éditeur (combo "COLOR SET (Σ)")
+STANDARD_COLOR_SETS = {
+    "Integer": ColorSet("Integer", python_type=int),
+    "String": ColorSet("String", python_type=str),
+    "Boolean": BOOLEAN,
+    "Complex": ColorSet("Complex", python_type=complex),
+}
+
+
+## ---- Multi-ensembles ---- ##
+# Représentation comptée : couleur -> multiplicité (jamais de multiplicité nulle stockée)
+class Multiset:
+    __slots__ = ("counts",)
+
+    def __init__(self, colors=None):
+        self.counts = {}
+        if isinstance(colors, dict):
+            for color, n in colors.items():
+                self.add(color, n)
+        elif colors is not None:
+            for color in colors:
+                self.add(color)
+
+    def add(self, color, n=1):
+        if n:
+            total = self.counts.get(color, 0) + n
+            if total < 0:
+                raise ValueError(f"Not enough '{color}' tokens")
+            if total:
+                self.counts[color] = total
+            else:
+                del self.counts[color]
+
+    def count(self, color):
+        return self.counts.get(color, 0)
+
+    def distinct(self):
+        return self.counts.keys()
+
+    def items(self):
+        return self.counts.items()
+
+    def copy(self):
+        m = Multiset()
+        m.counts = dict(self.counts)
+        return m
+
+    # m1 <= m2 : m1 est inclus dans m2
+    def __le__(self, other):
+        return all(other.counts.get(c, 0) >= n for c, n in self.counts.items())
+
+    def __add__(self, other):
+        m = self.copy()
+        for c, n in other.counts.items():
+            m.add(c, n)
+        return m
+
+    def __sub__(self, other):
+        m = self.copy()
+        for c, n in other.counts.items():
+            m.add(c, -n)
+        return m
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+    def __eq__(self, other):
+        return isinstance(other, Multiset) and self.counts == other.counts
+
+    # forme figée, utilisable comme clé (ordre indifférent)
+    def frozen(self):
+        return frozenset(self.counts.items())
+
+    def __hash__(self):
+        return hash(self.frozen())
+
+    def __repr__(self):
+        if not self.counts:
+            return "empty"
+        return "++".join(f"{n}`{c!r}" for c, n in self.counts.items())
+
+
+## ---- Inscriptions et gardes ---- ##
+class Expression:
+    def __init__(self, text):
+        self.text = text.strip()
+        tree = ast.parse(self.text, mode="eval")
+        check_syntax(tree, self.text)
+        self.code = compile(tree, "<cpn>", "eval")
+        self.names = set(self.code.co_names) - set(FUNCTIONS)
+        self.variable = self.text if IDENTIFIER.match(self.text) else None
+
+    def evaluate(self, binding):
+        return eval(self.code, {"__builtins__": {}, **FUNCTIONS}, binding)
+
+
+# Refuse toute construction hors de ALLOWED_NODES ; seules les fonctions de FUNCTIONS sont appelables
+def check_syntax(tree, text):
+    for node in ast.walk(tree):
+        if not isinstance(node, ALLOWED_NODES):
+            raise ValueError(f"Unsupported syntax ({type(node).__name__}) in expression '{text}'")
+        if isinstance(node, ast.Name) and node.id.startswith("_"):
+            raise ValueError(f"Invalid name '{node.id}' in expression '{text}'")
+        if isinstance(node, ast.Call) and (not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS
+                                           or node.keywords):
+            raise ValueError(f"Only {', '.join(FUNCTIONS)} can be called in expression '{text}'")
+
+
+# Inscription d'arc : somme de termes multiplicité`expression
+class Inscription:
+    def __init__(self, text):
+        self.text = text
+        self.terms = []
+        for term in text.split("++"):
+            match = TERM_PATTERN.match(term)
+            if match:
+                self.terms.append((int(match.group(1)), Expression(match.group(2))))
+            else:
+                self.terms.append((1, Expression(term)))
+
+    @property
+    def names(self):
+        return set().union(*(expr.names for _, expr in self.terms))
+
+    # Termes de la forme n`variable : servent d'index pour lier la variable
+    def pattern_variables(self):
+        return [expr.variable for _, expr in self.terms if expr.variable]
+
+    def evaluate(self, binding):
+        result = Multiset()
+        for n, expr in self.terms:
+            value = expr.evaluate(binding)
+            if isinstance(value, Multiset):
+                for c, k in value.items():
+                    result.add(c, n * k)
+            else:
+                result.add(value, n)
+        return result
+
+
+## ---- Réseau coloré ---- ##
+class ColoredPlace:
+    def __init__(self, name, color_set, initial=None):
+        self.name = name
+        self.color_set = color_set
+        self.initial = initial if isinstance(initial, Multiset) else Multiset(initial)
+
+    def __repr__(self):
+        return f"ColoredPlace({self.name}: {self.color_set.name}, {self.initial})"
+
+
+class ColoredTransition:
+    def __init__(self, name, guard=None):
+        self.name = name
+        self.guard = Expression(guard) if guard else None
+
+    def __repr__(self):
+        return f"ColoredTransition({self.name}, guard={self.guard.text if self.guard else None})"
+
+
+class ColoredArc:
+    def __init__(self, place, transition, direction, inscription):
+        if direction not in ['place_to_transition', 'transition_to_place']:
+            raise ValueError("La direction de l'arc doit être 'place_to_transition' ou 'transition_to_place'")
+        self.place = place
+        self.transition = transition
+        self.direction = direction
+        self.inscription = inscription if isinstance(inscription, Inscription) else Inscription(inscription)
+
+    def __repr__(self):
+        return f"ColoredArc({self.place.name}, {self.transition.name}, {self.direction}, {self.inscription.text})"
+
+
+class ColoredPetriNet:
+    def __init__(self):
+        self.places = {}
+        self.transitions = {}
+        self.arcs = []
+        self.variables = {} # nom de variable -> ensemble de couleurs
+        self.plans = {} # plans d'énumération des liaisons, recalculés après modification
+
+    def declare(self, variable, color_set):
+        self.variables[variable] = color_set
+        self.plans = {}
+
+    def add_place(self, name, color_set=UNIT, initial=None):
+        if name in self.places:
+            raise ValueError("A place with that name already exists.")
+        place = ColoredPlace(name, color_set, initial)
+        for color in place.initial.distinct():
+            if color not in color_set:
+                raise ValueError(f"Token {color!r} is not in color set '{color_set.name}'")
+        self.places[name] = place
+        return place
+
+    def add_transition(self, name, guard=None):
+        if name in self.transitions:
+            raise ValueError("A transition with that name already exists.")
+        transition = ColoredTransition(name, guard)
+        self.transitions[name] = transition
+        self.plans = {}
+        return transition
+
+    def add_arc(self, place_name, transition_name, direction, inscription):
+        arc = ColoredArc(self.places[place_name], self.transitions[transition_name], direction, inscription)
+        self.arcs.append(arc)
+        self.plans = {}
+        return arc
+
+    # Construit un réseau coloré équivalent à un réseau P/T (jetons noirs, ensemble Unit)
+    @classmethod
+    def from_petri_net(cls, net: PetriNet):
+        cpn = cls()
+        for p in net.places.values():
+            cpn.add_place(p.name, UNIT, {(): p.initial_tokens})
+        for t in net.transitions.values():
+            cpn.add_transition(t.name)
+        for arc in net.arcs:
+            cpn.add_arc(arc.place.name, arc.transition.name, arc.direction, f"{arc.weight}`()")
+        return cpn
+
+    ## ---- Marquages ---- ##
+    def place_order(self):
+        return list(self.places)
+
+    def initial_marking(self):
+        return tuple(p.initial.copy() for p in self.places.values())
+
+    @staticmethod
+    def key(marking):
+        return tuple(m.frozen() for m in marking)
+
+    ## ---- Liaisons ---- ##
+    # Plan par transition : arcs d'entrée/sortie indexés, variables liées par motif ou libres
+    def plan(self, transition_name):
+        plan = self.plans.get(transition_name)
+        if plan is not None:
+            return plan
+        t = self.transitions[transition_name]
+        order = {name: i for i, name in enumerate(self.places)}
+        inputs = [(order[a.place.name], a.inscription) for a in self.arcs
+                  if a.transition is t and a.direction == 'place_to_transition']
+        outputs = [(order[a.place.name], a.inscription, a.place.color_set) for a in self.arcs
+                   if a.transition is t and a.direction == 'transition_to_place']
+
+        used = set()
+        for _, ins in inputs:
+            used |= ins.names
+        for _, ins, _ in outputs:
+            used |= ins.names
+        if t.guard:
+            used |= t.guard.names
+        variables = [v for v in self.variables if v in used]
+
+        # variable -> places d'entrée dans lesquelles elle apparaît seule (index de liaison)
+        patterns = {}
+        for p, ins in inputs:
+            for v in ins.pattern_variables():
+                if v in self.variables:
+                    patterns.setdefault(v, []).append(p)
+        free = [v for v in variables if v not in patterns]
+        guard_vars = (t.guard.names & set(variables)) if t.guard else set()
+        plan = (t, inputs, outputs, patterns, free, guard_vars)
+        self.plans[transition_name] = plan
+        return plan
+
+    # Énumère les liaisons qui rendent la transition tirable dans le marquage donné
+    # Les variables apparaissant seules sur un arc d'entrée ne prennent que les couleurs
+    # présentes dans la place (la moins fournie d'abord) ; les autres parcourent leur domaine.
+    def bindings(self, transition_name, marking):
+        t, inputs, outputs, patterns, free, guard_vars = self.plan(transition_name)
+        for p, _ in inputs:
+            if not marking[p].counts:
+                return # une place d'entrée vide suffit à bloquer
+        candidates = []
+        for v, places in patterns.items():
+            place = min(places, key=lambda p: len(marking[p].counts))
+            domain = self.variables[v]
+            candidates.append((len(marking[place].counts), v, [c for c in marking[place].distinct() if c in domain]))
+        candidates.sort(key=lambda c: c[0])
+        steps = [(v, colors) for _, v, colors in candidates]
+        steps += [(v, list(self.variables[v])) for v in free]
+
+        def check_guard(binding):
+            return t.guard is None or not guard_vars <= binding.keys() or t.guard.evaluate(binding)
+
+        def extend(i, binding):
+            if i == len(steps):
+                for p, ins in inputs:
+                    if not ins.evaluate(binding) <= marking[p]:
+                        return
+                yield dict(binding)
+                return
+            v, colors = steps[i]
+            for c in colors:
+                binding[v] = c
+                if check_guard(binding):
+                    yield from extend(i + 1, binding)
+            binding.pop(v, None)
+
+        if not steps:
+            if check_guard({}) and all(ins.evaluate({}) <= marking[p] for p, ins in inputs):
+                yield {}
+            return
+        yield from extend(0, {})
+
+    # Toutes les paires (transition, liaison) tirables
+    def enabled(self, marking):
+        return [(name, b) for name in self.transitions for b in self.bindings(name, marking)]
+
+    # Tire la transition avec la liaison donnée, retourne le nouveau marquage
+    def fire(self, marking, transition_name, binding):
+        _, inputs, outputs, _, _, _ = self.plan(transition_name)
+        marking = list(marking)
+        for p, ins in inputs:
+            marking[p] = marking[p] - ins.evaluate(binding)
+        for p, ins, color_set in outputs:
+            produced = ins.evaluate(binding)
+            for c in produced.distinct():
+                if c not in color_set:
+                    raise ValueError(f"Transition '{transition_name}' produces {c!r} outside '{color_set.name}'")
+            marking[p] = marking[p] + produced
+        return tuple(marking)
+
+    ## ---- Espace d'états ---- ##
+    # Exploration directe des marquages colorés (BFS)
+    def explore(self, max_states=None):
+        space = ColoredStateSpace(self.place_order())
+        start = self.initial_marking()
+        space.add_state(start)
+        queue = deque([start])
+        while queue:
+            m = queue.popleft()
+            source_id = space.index[self.key(m)]
+            enabled = self.enabled(m)
+            if not enabled:
+                space.deadlocks.append(source_id)
+            for name, binding in enabled:
+                target = self.fire(m, name, binding)
+                key = self.key(target)
+                target_id = space.index.get(key)
+                if target_id is None:
+                    if max_states is not None and len(space.markings) >= max_states:
+                        space.complete = False
+                        continue
+                    target_id = space.add_state(target)
+                    queue.append(target)
+                space.edges.append((source_id, target_id, name, binding))
+        return space
+
+    # Déplie le réseau en un réseau P/T équivalent (domaines de couleurs finis requis)
+    # Place p, couleur c -> "p[repr(c)]" ; transition t, liaison b -> "t[x=repr(..)]"
+    def unfold(self):
+        net = PetriNet()
+        order = self.place_order()
+        for p in self.places.values():
+            for c in p.color_set:
+                net.add_place(unfolded_name(p.name, c))
+                net.set_tokens(unfolded_name(p.name, c), p.initial.count(c))
+
+        for name in self.transitions:
+            t, inputs, outputs, patterns, free, _ = self.plan(name)
+            variables = sorted(set(patterns) | set(free))
+            for values in product(*(list(self.variables[v]) for v in variables)):
+                binding = dict(zip(variables, values))
+                if t.guard is not None and not t.guard.evaluate(binding):
+                    continue
+                t_name = name if not variables else f"{name}[{','.join(f'{v}={binding[v]!r}' for v in variables)}]"
+                weights = {}
+                for p, ins in inputs:
+                    for c, n in ins.evaluate(binding).items():
+                        color_set = self.places[order[p]].color_set
+                        if c not in color_set:
+                            raise ValueError(f"Transition '{name}' consumes {c!r} outside '{color_set.name}'")
+                        key = (unfolded_name(order[p], c), 'place_to_transition')
+                        weights[key] = weights.get(key, 0) + n
+                for p, ins, color_set in outputs:
+                    for c, n in ins.evaluate(binding).items():
+                        if c not in color_set:
+                            raise ValueError(f"Transition '{name}' produces {c!r} outside '{color_set.name}'")
+                        key = (unfolded_name(order[p], c), 'transition_to_place')
+                        weights[key] = weights.get(key, 0) + n
+                net.add_transition(t_name)
+                for (place_name, direction), w in weights.items():
+                    if direction == 'place_to_transition':
+                        net.add_arc(place_name, t_name, w)
+                    else:
+                        net.add_arc(t_name, place_name, w)
+        return net
+
+
+# repr : deux couleurs distinctes de même texte (1 et "1") donnent deux places distinctes
+def unfolded_name(place_name, color):
+    return place_name if color == () else f"{place_name}[{color!r}]"
+
+
+# Espace d'états d'un réseau coloré
+class ColoredStateSpace:
+    def __init__(self, place_names):
+        self.place_names = place_names
+        self.markings = []
+        self.index = {}
+        self.edges = [] # (source, cible, transition, liaison)
+        self.deadlocks = []
+        self.complete = True
+
+    def add_state(self, marking):
+        state_id = len(self.markings)
+        self.markings.append(marking)
+        self.index[ColoredPetriNet.key(marking)] = state_id
+        return state_id
+
+    @property
+    def num_states(self):
+        return len(self.markings)
@@ -0,0 +1,83 @@
+# logic/compiled.py
+# Structure compilée d'un réseau de Petri : places et transitions indexées par des entiers,
+# pré/post-conditions en tuples. Sert de base aux moteurs rapides (simulation, explorations).
+# Ne contient que des types simples, donc peut être envoyée à d'autres processus.
+
+from logic.petri_net import PetriNet
+
+
+class CompiledNet:
+    def __init__(self, net: PetriNet):
+        self.place_names = list(net.places)
+        self.transition_names = list(net.transitions)
+        self.place_index = {name: i for i, name in enumerate(self.place_names)}
+        self.transition_index = {name: i for i, name in enumerate(self.transition_names)}
+        self.initial = tuple(p.initial_tokens for p in net.places.values())
+        self.rates = tuple(t.rate for t in net.transitions.values())
+        self.immediate = tuple(t.immediate for t in net.transitions.values())
+
+        pre = [{} for _ in self.transition_names]
+        post = [{} for _ in self.transition_names]
+        for arc in net.arcs:
+            t = self.transition_index[arc.transition.name]
+            p = self.place_index[arc.place.name]
+            if arc.direction == 'place_to_transition':
+                pre[t][p] = arc.weight
+            else:
+                post[t][p] = arc.weight
+
+        # pre[t] / post[t] : tuples de (indice de place, poids)
+        self.pre = tuple(tuple(sorted(d.items())) for d in pre)
+        self.post = tuple(tuple(sorted(d.items())) for d in post)
+
+        # delta[t] : effet net du tir de t, uniquement sur les places modifiées
+        self.delta = []
+        for t in range(len(self.transition_names)):
+            change = dict((p, -w) for p, w in pre[t].items())
+            for p, w in post[t].items():
+                change[p] = change.get(p, 0) + w
+            self.delta.append(tuple((p, d) for p, d in sorted(change.items()) if d != 0))
+        self.delta = tuple(self.delta)
+
+        # consumers[p] : transitions dont l'activation dépend de la place p
+        consumers = [[] for _ in self.place_names]
+        for t, arcs in enumerate(self.pre):
+            for p, _ in arcs:
+                consumers[p].append(t)
+        self.consumers = tuple(tuple(c) for c in consumers)
+
+        # affected[t] : transitions à réévaluer après le tir de t
+        self.affected = tuple(
+            tuple(sorted(set(c for p, _ in self.delta[t] for c in self.consumers[p])))
+            for t in range(len(self.transition_names))
+        )
+
+    @property
+    def num_places(self):
+        return len(self.place_names)
+
+    @property
+    def num_transitions(self):
+        return len(self.transition_names)
+
+    # Vérifie si la transition t est tirable dans le marquage m
+    def is_enabled(self, m, t):
+        for p, w in self.pre[t]:
+            if m[p] < w:
+                return False
+        return True
+
+    # Retourne les indices des transitions tirables dans le marquage m
+    def enabled(self, m):
+        return [t for t in range(len(self.pre)) if self.is_enabled(m, t)]
+
+    # Retourne le marquage obtenu en tirant t depuis m (sans vérifier l'activation)
+    def fire(self, m, t):
+        m = list(m)
+        for p, d in self.delta[t]:
+            m[p] += d
+        return tuple(m)
+
+    # Convertit un marquage en dictionnaire nom de place -> jetons
+    def marking_dict(self, m):
+        return dict(zip(self.place_names, m))
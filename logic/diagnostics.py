@@ -0,0 +1,190 @@
+# logic/diagnostics.py
+# Diagnostic structurel du réseau, affiché en direct dans l'éditeur :
+#   - transitions tirables au marquage initial ;
+#   - couverture par des P-invariants (y.C = 0, y >= 0) et des T-invariants (C.x = 0, x >= 0) ;
+#   - cycles du graphe du réseau (composantes fortement connexes, transitions sources et puits) ;
+#   - siphons vides au marquage initial (ils le restent : leurs transitions ne sont jamais tirables) ;
+#   - taille de l'espace d'états : exacte si l'exploration tient dans la limite d'états, sinon
+#     au moins cette limite, et au plus le produit des bornes données par le P-invariant.
+# Calculé sur un CompiledNet (types simples), donc dans un thread d'arrière-plan si besoin.
+# StructuralDiagnostics garde les résultats précédents et ne recalcule que ce qui dépend de la
+# modification : les cycles ne dépendent que des arcs (sans les poids), les invariants que de la
+# matrice d'incidence ; une modification du marquage initial ne recalcule que les tirables, les
+# siphons vides et l'espace d'états (qui reprend le graphe précédent, voir logic/incremental.py).
+
+import math
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+from scipy.sparse.csgraph import connected_components
+from logic.compiled import CompiledNet
+from logic.incremental import IncrementalAnalyzer
+
+ESTIMATE_STATES = 20_000 # limite de l'exploration qui donne la taille de l'espace d'états
+ESTIMATE_WORK = 50_000_000 # limite états x transitions x places (taille des successeurs calculés)
+
+
+# Résultat du diagnostic (noms de places et de transitions)
+class Diagnostics:
+    def __init__(self):
+        self.enabled = [] # transitions tirables au marquage initial
+        self.num_places = 0
+        self.num_transitions = 0
+        self.uncovered_places = [] # places hors de tout P-invariant positif
+        self.uncovered_transitions = [] # transitions hors de tout T-invariant positif
+        self.bounds = {} # place couverte -> borne déduite du P-invariant
+        self.components = 0 # composantes fortement connexes non triviales (cycles)
+        self.strongly_connected = False
+        self.acyclic = [] # places et transitions sur aucun cycle
+        self.sources = [] # transitions sans place d'entrée
+        self.sinks = [] # transitions sans place de sortie
+        self.empty_siphon = [] # places du plus grand siphon vide au marquage initial
+        self.dead = [] # transitions qui consomment dans ce siphon
+        self.states = 0
+        self.exact = False # False : states n'est qu'une borne inférieure
+        self.upper_log10 = None # log10 de la borne supérieure (None : pas de borne structurelle)
+        self.recomputed = () # parties recalculées par cette analyse
+
+    @property
+    def bounded(self):
+        return not self.uncovered_places
+
+
+# Matrice d'incidence C (places x transitions), creuse
+def incidence(cn: CompiledNet):
+    rows, cols, values = [], [], []
+    for t, changes in enumerate(cn.delta):
+        for p, d in changes:
+            rows.append(p)
+            cols.append(t)
+            values.append(d)
+    return sp.csr_matrix((values, (rows, cols)), shape=(cn.num_places, cn.num_transitions), dtype=float)
+
+
+# Plus grand support d'une solution de A.v = 0, v >= 0 (union des supports de tous les invariants)
+# Un seul programme linéaire : max somme(z) avec z <= v, 0 <= z <= 1 ; v est mis à l'échelle
+# pour que z vaille 1 sur tout le support. Retourne (support booléen, v)
+def semiflow_support(A):
+    n = A.shape[1]
+    if A.shape[0] == 0:
+        return np.ones(n, dtype=bool), np.ones(n)
+    if n == 0:
+        return np.zeros(0, dtype=bool), np.zeros(0)
+    identity = sp.identity(n, format="csr")
+    result = linprog(
+        np.concatenate([np.zeros(n), -np.ones(n)]),
+        A_ub=sp.hstack([-identity, identity], format="csr"), b_ub=np.zeros(n),
+        A_eq=sp.hstack([A, sp.csr_matrix(A.shape)], format="csr"), b_eq=np.zeros(A.shape[0]),
+        bounds=[(0, None)] * n + [(0, 1)] * n, method="highs",
+    )
+    if result.status != 0:
+        return np.zeros(n, dtype=bool), np.zeros(n)
+    v = result.x[:n]
+    return result.x[n:] > 0.5, v
+
+
+# Composantes fortement connexes du graphe biparti (places 0..P-1, transitions P..P+T-1)
+# Retourne (nombre de cycles, fortement connexe, noeuds sur aucun cycle)
+def net_cycles(cn: CompiledNet):
+    P, T = cn.num_places, cn.num_transitions
+    src, dst = [], []
+    for t in range(T):
+        for p, _ in cn.pre[t]:
+            src.append(p)
+            dst.append(P + t)
+        for p, _ in cn.post[t]:
+            src.append(P + t)
+            dst.append(p)
+    n = P + T
+    if n == 0:
+        return 0, False, []
+    adjacency = sp.csr_matrix((np.ones(len(src), dtype=np.int8), (src, dst)), shape=(n, n))
+    count, labels = connected_components(adjacency, directed=True, connection="strong")
+    sizes = np.bincount(labels, minlength=count)
+    # un noeud seul est sur un cycle s'il a une boucle (impossible dans un graphe biparti)
+    on_cycle = sizes[labels] > 1
+    return int((sizes > 1).sum()), count == 1 and n > 1, [int(v) for v in np.flatnonzero(~on_cycle)]
+
+
+# Plus grand siphon contenu dans les places vides (point fixe) : toute transition qui produit
+# dans le siphon doit aussi y consommer. Un siphon vide le reste, ses consommateurs sont morts.
+def empty_siphon(cn: CompiledNet):
+    inside = [m == 0 for m in cn.initial]
+    producers = [[] for _ in range(cn.num_places)]
+    for t, arcs in enumerate(cn.post):
+        for p, _ in arcs:
+            producers[p].append(t)
+    inputs = [sum(1 for p, _ in arcs if inside[p]) for arcs in cn.pre] # entrées dans le siphon
+    queue = [p for p in range(cn.num_places) if inside[p] and any(inputs[t] == 0 for t in producers[p])]
+    while queue:
+        p = queue.pop()
+        if not inside[p]:
+            continue
+        inside[p] = False
+        for t in cn.consumers[p]:
+            inputs[t] -= 1
+            if inputs[t] == 0:
+                queue.extend(q for q, _ in cn.post[t] if inside[q])
+    siphon = [p for p in range(cn.num_places) if inside[p]]
+    dead = sorted(set(t for p in siphon for t in cn.consumers[p]))
+    return siphon, dead
+
+
+class StructuralDiagnostics:
+    def __init__(self, max_states=ESTIMATE_STATES):
+        self.max_states = max_states
+        self.analyzer = IncrementalAnalyzer(max_states=max_states)
+        self.arcs_key = None
+        self.cycles = None
+        self.incidence_key = None
+        self.invariants = None
+
+    def analyze(self, net):
+        return self.analyze_compiled(CompiledNet(net))
+
+    def analyze_compiled(self, cn: CompiledNet):
+        recomputed = []
+        places, transitions = cn.place_names, cn.transition_names
+        arcs_key = (tuple(places), tuple(transitions),
+                    tuple(tuple(p for p, _ in arcs) for arcs in cn.pre),
+                    tuple(tuple(p for p, _ in arcs) for arcs in cn.post))
+        if arcs_key != self.arcs_key:
+            self.cycles = net_cycles(cn)
+            self.arcs_key = arcs_key
+            recomputed.append("cycles")
+        incidence_key = (tuple(places), tuple(transitions), cn.delta)
+        if incidence_key != self.incidence_key:
+            C = incidence(cn)
+            self.invariants = (semiflow_support(C.T.tocsr()), semiflow_support(C))
+            self.incidence_key = incidence_key
+            recomputed.append("invariants")
+
+        d = Diagnostics()
+        d.num_places, d.num_transitions = cn.num_places, cn.num_transitions
+        d.enabled = [transitions[t] for t in cn.enabled(cn.initial)]
+
+        (p_support, y), (t_support, _) = self.invariants
+        d.uncovered_places = [places[p] for p in np.flatnonzero(~p_support)]
+        d.uncovered_transitions = [transitions[t] for t in np.flatnonzero(~t_support)]
+        # y.M = y.M0 pour tout marquage accessible, donc M(p) <= y.M0 / y(p) sur le support
+        total = float(np.dot(y, cn.initial)) if len(y) else 0.0
+        d.bounds = {places[p]: int(math.floor(total / y[p] + 1e-9)) for p in np.flatnonzero(p_support)}
+
+        d.components, d.strongly_connected, acyclic = self.cycles
+        P = cn.num_places
+        d.acyclic = [places[v] if v < P else transitions[v - P] for v in acyclic]
+        d.sources = [transitions[t] for t in range(cn.num_transitions) if not cn.pre[t]]
+        d.sinks = [transitions[t] for t in range(cn.num_transitions) if not cn.post[t]]
+
+        siphon, dead = empty_siphon(cn)
+        d.empty_siphon = [places[p] for p in siphon]
+        d.dead = [transitions[t] for t in dead]
+
+        self.analyzer.max_states = max(100, min(self.max_states, ESTIMATE_WORK // max(1, P * cn.num_transitions)))
+        graph = self.analyzer.analyze_compiled(cn).graph
+        d.states, d.exact = graph.num_states, graph.complete
+        if d.bounded:
+            d.upper_log10 = sum(math.log10(b + 1) for b in d.bounds.values())
+        recomputed.append("state space")
+        d.recomputed = tuple(recomputed)
+        return d
@@ -0,0 +1,199 @@
+# logic/graph_export.py
+# Export de l'espace d'états au fil de l'exploration : DOT (Graphviz), GraphML, CSV (liste d'arcs)
+# Les exporteurs sont des hooks (logic/metrics.py) : on les branche sur un ExplorationMetrics
+# passé à n'importe quel explorateur (explore, find_deadlocks, sweep_line, build_state_space...).
+# Chaque état et chaque arc est écrit dès qu'il est découvert, rien n'est gardé en mémoire :
+# le fichier peut dépasser largement ce que networkx ou matplotlib sauraient afficher.
+# Les marquages sont écrits sous forme creuse (places non vides seulement) : "P1=1 P3=2".
+
+import csv
+from xml.sax.saxutils import escape
+from logic.metrics import ExplorationHook, ExplorationMetrics
+from logic.reachability import explore
+
+
+class GraphExporter(ExplorationHook):
+    def __init__(self, target):
+        self.target = target # chemin ou fichier texte ouvert
+        self.file = None
+        self.own_file = False
+        self.place_names = None
+        self.transition_names = None
+
+    # -- Interface des hooks -- #
+    def on_start(self, explorer, cn):
+        if cn is not None:
+            self.place_names = cn.place_names
+            self.transition_names = cn.transition_names
+        self.file = self.open(self.target)
+        self.write_header()
+
+    def on_state(self, state_id, marking):
+        self.write_state(state_id, marking)
+
+    def on_edge(self, source_id, target_id, transition):
+        if not isinstance(transition, str):
+            transition = self.transition_names[transition]
+        self.write_edge(source_id, target_id, transition)
+
+    def on_deadlock(self, state_id):
+        self.write_deadlock(state_id)
+
+    def on_finish(self, metrics):
+        self.write_footer()
+        self.close()
+
+    # -- Fichiers -- #
+    def open(self, target):
+        if hasattr(target, "write"):
+            return target
+        self.own_file = True
+        return open(target, "w", encoding="utf-8", newline="")
+
+    def close(self):
+        if self.own_file and self.file is not None:
+            self.file.close()
+        self.file = None
+
+    def label(self, marking):
+        names = self.place_names
+        if names is None:
+            return " ".join(str(v) for v in marking)
+        return " ".join(f"{names[p]}={v}" for p, v in enumerate(marking) if v)
+
+    # -- À définir pour chaque format -- #
+    def write_header(self):
+        pass
+
+    def write_state(self, state_id, marking):
+        pass
+
+    def write_edge(self, source_id, target_id, transition):
+        pass
+
+    def write_deadlock(self, state_id):
+        pass
+
+    def write_footer(self):
+        pass
+
+
+# DOT : les blocages sont recolorés par une seconde déclaration du noeud (autorisée par Graphviz)
+class DotExporter(GraphExporter):
+    def write_header(self):
+        self.file.write("digraph reachability {\n  node [shape=box, fontsize=10];\n")
+
+    def write_state(self, state_id, marking):
+        extra = ", peripheries=2" if state_id == 0 else ""
+        self.file.write(f'  s{state_id} [label="{dot_escape(self.label(marking))}"{extra}];\n')
+
+    def write_edge(self, source_id, target_id, transition):
+        self.file.write(f'  s{source_id} -> s{target_id} [label="{dot_escape(transition)}"];\n')
+
+    def write_deadlock(self, state_id):
+        self.file.write(f'  s{state_id} [style=filled, fillcolor="#FF7F7F"];\n')
+
+    def write_footer(self):
+        self.file.write("}\n")
+
+
+def dot_escape(text):
+    return text.replace("\\", "\\\\").replace('"', '\\"')
+
+
+# GraphML : marquage en attribut de noeud, transition en attribut d'arc ; la liste des blocages
+# est une donnée du graphe écrite à la fin (seule information gardée jusque-là)
+class GraphMLExporter(GraphExporter):
+    def __init__(self, target):
+        super().__init__(target)
+        self.deadlocks = []
+
+    def write_header(self):
+        self.deadlocks = []
+        self.file.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                        '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+                        '  <key id="marking" for="node" attr.name="marking" attr.type="string"/>\n'
+                        '  <key id="transition" for="edge" attr.name="transition" attr.type="string"/>\n'
+                        '  <key id="deadlocks" for="graph" attr.name="deadlocks" attr.type="string"/>\n'
+                        '  <graph id="reachability" edgedefault="directed">\n')
+
+    def write_state(self, state_id, marking):
+        self.file.write(f'    <node id="s{state_id}"><data key="marking">{escape(self.label(marking))}</data></node>\n')
+
+    def write_edge(self, source_id, target_id, transition):
+        self.file.write(f'    <edge source="s{source_id}" target="s{target_id}">'
+                        f'<data key="transition">{escape(transition)}</data></edge>\n')
+
+    def write_deadlock(self, state_id):
+        self.deadlocks.append(f"s{state_id}")
+
+    def write_footer(self):
+        self.file.write(f'    <data key="deadlocks">{escape(" ".join(self.deadlocks))}</data>\n'
+                        '  </graph>\n</graphml>\n')
+
+
+# CSV : liste d'arcs (source, cible, transition) ; états et blocages dans des fichiers facultatifs
+class CSVExporter(GraphExporter):
+    def __init__(self, target, states=None, deadlocks=None):
+        super().__init__(target)
+        self.states_target = states
+        self.deadlocks_target = deadlocks
+        self.extra_files = []
+
+    def on_start(self, explorer, cn):
+        self.extra_files = []
+        super().on_start(explorer, cn)
+
+    def open_extra(self, target):
+        if hasattr(target, "write"):
+            return target
+        f = open(target, "w", encoding="utf-8", newline="")
+        self.extra_files.append(f)
+        return f
+
+    def write_header(self):
+        self.edges = csv.writer(self.file)
+        self.edges.writerow(["source", "target", "transition"])
+        self.states = self.deadlocks = None
+        if self.states_target is not None:
+            self.states = csv.writer(self.open_extra(self.states_target))
+            self.states.writerow(["id"] + list(self.place_names or []))
+        if self.deadlocks_target is not None:
+            self.deadlocks = csv.writer(self.open_extra(self.deadlocks_target))
+            self.deadlocks.writerow(["id"])
+
+    def write_state(self, state_id, marking):
+        if self.states is not None:
+            self.states.writerow([state_id, *marking])
+
+    def write_edge(self, source_id, target_id, transition):
+        self.edges.writerow([source_id, target_id, transition])
+
+    def write_deadlock(self, state_id):
+        if self.deadlocks is not None:
+            self.deadlocks.writerow([state_id])
+
+    def close(self):
+        super().close()
+        for f in self.extra_files:
+            f.close()
+        self.extra_files = []
+
+
+EXPORTERS = {".dot": DotExporter, ".gv": DotExporter, ".graphml": GraphMLExporter, ".csv": CSVExporter}
+
+
+# Exporteur selon l'extension du fichier
+def exporter_for(filename):
+    for extension, cls in EXPORTERS.items():
+        if filename.lower().endswith(extension):
+            return cls(filename)
+    raise ValueError(f"Unsupported export format for '{filename}' (expected .dot, .graphml or .csv)")
+
+
+# Explore le réseau compilé et écrit son espace d'états dans `filename` (format selon l'extension)
+# listeners : autres hooks à notifier (progression...) ; retourne les métriques de l'exploration
+def export_state_space(cn, filename, max_states=None, listeners=()):
+    metrics = ExplorationMetrics(listeners=[exporter_for(filename), *listeners])
+    explore(cn, max_states=max_states, metrics=metrics)
+    return metrics
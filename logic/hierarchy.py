@@ -0,0 +1,376 @@
+# logic/hierarchy.py
+# Réseaux hiérarchiques : modules réutilisables reliés par des places de fusion
+# Un module est un PetriNet dont certaines places sont des ports. Chaque instance du module
+# relie ses ports à des places de fusion globales. flatten() produit le réseau à plat
+# (places et transitions préfixées par le nom de l'instance), utilisable par toutes les analyses.
+#
+# Analyse compositionnelle : chaque module est exploré une seule fois, ouvert sur ses ports
+# (l'environnement est supposé fournir les jetons des ports). Son système de transitions est
+# réduit par rapport à son interface :
+#   - les transitions sans arc vers un port sont internes (tau) ;
+#   - les composantes fortement connexes de tau sont fusionnées (divergence notée) ;
+#   - un état non divergent dont la seule sortie est un tau est fusionné avec sa cible ;
+#   - enfin une bisimulation forte regroupe les états équivalents.
+# Le produit est ensuite construit sur les modules réduits et le marquage des places de fusion.
+# Les instances identiques (même module, mêmes liaisons) sont interchangeables : l'état global
+# ne garde que le multi-ensemble de leurs états locaux (réduction par symétrie).
+# Le produit conserve les marquages accessibles des places de fusion et la présence de blocages.
+
+from collections import deque
+from logic.petri_net import PetriNet
+from logic.compiled import CompiledNet
+
+
+class Module:
+    def __init__(self, name, net: PetriNet, ports):
+        for port in ports:
+            if port not in net.places:
+                raise ValueError(f"Port '{port}' is not a place of module '{name}'")
+        self.name = name
+        self.net = net
+        self.ports = list(ports)
+
+
+class Instance:
+    def __init__(self, name, module: Module, bindings):
+        self.name = name
+        self.module = module
+        self.bindings = dict(bindings) # port -> place de fusion
+
+
+class HierarchicalNet:
+    def __init__(self):
+        self.fusion = {} # place de fusion -> jetons initiaux
+        self.instances = {}
+
+    def add_fusion_place(self, name, tokens=0):
+        if name in self.fusion:
+            raise ValueError(f"Fusion place '{name}' already exists")
+        self.fusion[name] = tokens
+
+    def add_instance(self, name, module: Module, bindings):
+        if name in self.instances:
+            raise ValueError(f"Instance '{name}' already exists")
+        for port in module.ports:
+            if bindings.get(port) not in self.fusion:
+                raise ValueError(f"Port '{port}' of instance '{name}' is not bound to a fusion place")
+        self.instances[name] = Instance(name, module, bindings)
+        return self.instances[name]
+
+    # Réseau à plat : places de fusion + copies préfixées des places internes et des transitions
+    def flatten(self):
+        places = list(self.fusion.items())
+        transitions = []
+        arcs = []
+        for inst in self.instances.values():
+            net = inst.module.net
+            def rename(place_name):
+                return inst.bindings.get(place_name) or f"{inst.name}.{place_name}"
+            places += [(f"{inst.name}.{p.name}", p.initial_tokens) for p in net.places.values()
+                       if p.name not in inst.bindings]
+            transitions += [f"{inst.name}.{t}" for t in net.transitions]
+            arcs += [(rename(a.place.name), f"{inst.name}.{a.transition.name}", a.direction, a.weight)
+                     for a in net.arcs]
+        flat = PetriNet()
+        flat.add_many(places=places, transitions=transitions, arcs=arcs)
+        for inst in self.instances.values():
+            for t in inst.module.net.transitions.values():
+                copy = flat.transitions[f"{inst.name}.{t.name}"]
+                copy.rate, copy.immediate, copy.delay = t.rate, t.immediate, t.delay
+        return flat
+
+
+## ---- Système de transitions d'un module ---- ##
+# États numérotés ; arcs (source, étiquette, cible), étiquette None pour tau, sinon
+# (pré-conditions sur les ports, effet sur les ports) avec les ports en indices locaux
+class ModuleLTS:
+    def __init__(self, num_states, initial, edges, divergent, explored_states):
+        self.num_states = num_states
+        self.initial = initial
+        self.edges = edges
+        self.divergent = divergent # états qui peuvent enchaîner des tau sans fin
+        self.explored_states = explored_states # taille avant réduction
+
+    def successors(self):
+        out = [[] for _ in range(self.num_states)]
+        for s, label, d in self.edges:
+            out[s].append((label, d))
+        return out
+
+
+# Explore le module seul, ports supposés toujours disponibles
+def module_lts(module: Module, max_states=None):
+    cn = CompiledNet(module.net)
+    ports = [cn.place_index[p] for p in module.ports]
+    port_of = {p: i for i, p in enumerate(ports)}
+    internal = [p for p in range(cn.num_places) if p not in port_of]
+    local_of = {p: i for i, p in enumerate(internal)}
+
+    # pour chaque transition : pré-conditions et effet internes, étiquette d'interface
+    pre_in, delta_in, labels = [], [], []
+    for t in range(cn.num_transitions):
+        pre_in.append(tuple((local_of[p], w) for p, w in cn.pre[t] if p in local_of))
+        delta_in.append(tuple((local_of[p], d) for p, d in cn.delta[t] if p in local_of))
+        port_pre = tuple((port_of[p], w) for p, w in cn.pre[t] if p in port_of)
+        port_delta = tuple((port_of[p], d) for p, d in cn.delta[t] if p in port_of)
+        touches_ports = port_pre or any(p in port_of for p, _ in cn.post[t])
+        labels.append((port_pre, port_delta) if touches_ports else None)
+
+    start = tuple(cn.initial[p] for p in internal)
+    index = {start: 0}
+    markings = [start]
+    edges = []
+    queue = deque([start])
+    while queue:
+        m = queue.popleft()
+        source = index[m]
+        for t in range(cn.num_transitions):
+            if any(m[p] < w for p, w in pre_in[t]):
+                continue
+            target = list(m)
+            for p, d in delta_in[t]:
+                target[p] += d
+            target = tuple(target)
+            target_id = index.get(target)
+            if target_id is None:
+                if max_states is not None and len(markings) >= max_states:
+                    raise ValueError(f"Module '{module.name}' exceeds {max_states} local states "
+                                     "(unbounded when its ports are always available?)")
+                target_id = index[target] = len(markings)
+                markings.append(target)
+                queue.append(target)
+            edges.append((source, labels[t], target_id))
+    return ModuleLTS(len(markings), 0, edges, [False] * len(markings), len(markings))
+
+
+## ---- Réduction par rapport à l'interface ---- ##
+# Composantes fortement connexes du graphe des tau (Tarjan itératif)
+def tau_components(lts: ModuleLTS):
+    n = lts.num_states
+    tau = [[] for _ in range(n)]
+    for s, label, d in lts.edges:
+        if label is None:
+            tau[s].append(d)
+    component = [-1] * n
+    low = [0] * n
+    order = [-1] * n
+    stack, on_stack = [], [False] * n
+    counter = count = 0
+    for root in range(n):
+        if order[root] >= 0:
+            continue
+        work = [(root, 0)]
+        while work:
+            v, i = work.pop()
+            if i == 0:
+                order[v] = low[v] = counter
+                counter += 1
+                stack.append(v)
+                on_stack[v] = True
+            if i < len(tau[v]):
+                work.append((v, i + 1))
+                w = tau[v][i]
+                if order[w] < 0:
+                    work.append((w, 0))
+                elif on_stack[w]:
+                    low[v] = min(low[v], order[w])
+                continue
+            if low[v] == order[v]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component[w] = count
+                    if w == v:
+                        break
+                count += 1
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[v])
+    return component, count
+
+
+# Quotient du système par une partition (bloc de chaque état) ; les tau internes à un bloc
+# disparaissent. diverge : ces tau forment des cycles (composantes de tau) et rendent le bloc
+# divergent ; sinon (chaînes de tau fusionnées) ils sont simplement retirés
+def quotient(lts: ModuleLTS, block, num_blocks, diverge=True):
+    divergent = [False] * num_blocks
+    for s in range(lts.num_states):
+        if lts.divergent[s]:
+            divergent[block[s]] = True
+    edges = set()
+    for s, label, d in lts.edges:
+        bs, bd = block[s], block[d]
+        if label is None and bs == bd:
+            divergent[bs] = divergent[bs] or diverge
+            continue
+        edges.add((bs, label, bd))
+    return ModuleLTS(num_blocks, block[lts.initial], sorted(edges, key=repr), divergent, lts.explored_states)
+
+
+# Fusionne chaque état dont la seule sortie est un tau avec la cible de ce tau
+# Les composantes de tau sont déjà fusionnées : les chaînes se terminent, un tau fusionné
+# n'est qu'un pas interne et ne rend pas le bloc divergent (un blocage y reste un blocage).
+# Un état divergent n'est pas fusionné : sa cible hériterait de la divergence.
+def compress_tau_chains(lts: ModuleLTS):
+    out = lts.successors()
+    forward = list(range(lts.num_states))
+    for s in range(lts.num_states):
+        if len(out[s]) == 1 and out[s][0][0] is None and not lts.divergent[s]:
+            forward[s] = out[s][0][1]
+
+    def resolve(s):
+        path = []
+        while forward[s] != s:
+            path.append(s)
+            s = forward[s]
+        for p in path:
+            forward[p] = s
+        return s
+
+    roots = sorted({resolve(s) for s in range(lts.num_states)})
+    renumber = {r: i for i, r in enumerate(roots)}
+    block = [renumber[resolve(s)] for s in range(lts.num_states)]
+    return quotient(lts, block, len(roots), diverge=False)
+
+
+# Bisimulation forte par raffinement de partition (signatures successives)
+def strong_bisimulation(lts: ModuleLTS):
+    out = lts.successors()
+    block = [1 if d else 0 for d in lts.divergent]
+    num_blocks = len(set(block))
+    while True:
+        signatures = {}
+        new_block = []
+        for s in range(lts.num_states):
+            key = (block[s], frozenset((label, block[d]) for label, d in out[s]))
+            new_block.append(signatures.setdefault(key, len(signatures)))
+        if len(signatures) == num_blocks:
+            break
+        block, num_blocks = new_block, len(signatures)
+    return quotient(lts, new_block, num_blocks)
+
+
+def minimize(lts: ModuleLTS):
+    component, count = tau_components(lts)
+    reduced = quotient(lts, component, count)
+    reduced = compress_tau_chains(reduced)
+    return strong_bisimulation(reduced)
+
+
+## ---- Composition ---- ##
+class CompositionResult:
+    def __init__(self):
+        self.num_states = 0
+        self.num_edges = 0
+        self.deadlocks = 0
+        self.fusion_markings = set() # marquages accessibles des places de fusion
+        self.modules = {} # module -> (états explorés, états après réduction)
+        self.complete = True
+
+    def summary(self):
+        return {
+            "states": self.num_states,
+            "edges": self.num_edges,
+            "deadlocks": self.deadlocks,
+            "fusion_markings": len(self.fusion_markings),
+            "modules": self.modules,
+            "complete": self.complete,
+        }
+
+
+# Analyse compositionnelle d'un HierarchicalNet
+def compose(hnet: HierarchicalNet, max_states=None, max_module_states=100_000):
+    fusion_names = list(hnet.fusion)
+    fusion_index = {name: i for i, name in enumerate(fusion_names)}
+    result = CompositionResult()
+
+    # chaque module n'est exploré et réduit qu'une fois
+    reduced = {}
+    for inst in hnet.instances.values():
+        module = inst.module
+        if id(module) not in reduced:
+            lts = minimize(module_lts(module, max_states=max_module_states))
+            reduced[id(module)] = (lts, lts.successors())
+            result.modules[module.name] = (lts.explored_states, lts.num_states)
+
+    # actions de chaque instance, ports traduits en places de fusion : (pré, effet, cible) par état
+    instances = list(hnet.instances.values())
+    moves = []
+    divergent = []
+    initial_local = []
+    for inst in instances:
+        lts, out = reduced[id(inst.module)]
+        ports = [fusion_index[inst.bindings[p]] for p in inst.module.ports]
+        per_state = []
+        for s in range(lts.num_states):
+            actions = []
+            for label, d in out[s]:
+                if label is None:
+                    actions.append(((), (), d))
+                else:
+                    port_pre, port_delta = label
+                    pre, delta = {}, {}
+                    for p, w in port_pre:
+                        pre[ports[p]] = pre.get(ports[p], 0) + w
+                    for p, v in port_delta:
+                        delta[ports[p]] = delta.get(ports[p], 0) + v
+                    actions.append((tuple(pre.items()), tuple(delta.items()), d))
+            per_state.append(actions)
+        moves.append(per_state)
+        divergent.append(lts.divergent)
+        initial_local.append(lts.initial)
+
+    # groupes d'instances interchangeables (même module, mêmes liaisons)
+    groups = {}
+    for i, inst in enumerate(instances):
+        key = (id(inst.module), tuple(sorted(inst.bindings.items())))
+        groups.setdefault(key, []).append(i)
+    symmetric = [g for g in groups.values() if len(g) > 1]
+    group_of = [0] * len(instances)
+    for number, group in enumerate(groups.values()):
+        for i in group:
+            group_of[i] = number
+
+    def canonical(local):
+        if not symmetric:
+            return tuple(local)
+        local = list(local)
+        for group in symmetric:
+            values = sorted(local[i] for i in group)
+            for i, v in zip(group, values):
+                local[i] = v
+        return tuple(local)
+
+    start = (canonical(initial_local), tuple(hnet.fusion[name] for name in fusion_names))
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        local, fusion = queue.popleft()
+        result.fusion_markings.add(fusion)
+        moved = False
+        done = set() # dans un groupe symétrique, une seule instance par état local suffit
+        for i, s in enumerate(local):
+            if (group_of[i], s) in done:
+                continue
+            done.add((group_of[i], s))
+            for pre, delta, d in moves[i][s]:
+                if any(fusion[p] < w for p, w in pre):
+                    continue
+                moved = True
+                new_fusion = list(fusion)
+                for p, v in delta:
+                    new_fusion[p] += v
+                new_local = list(local)
+                new_local[i] = d
+                target = (canonical(new_local), tuple(new_fusion))
+                result.num_edges += 1
+                if target not in seen:
+                    if max_states is not None and len(seen) >= max_states:
+                        result.complete = False
+                        continue
+                    seen.add(target)
+                    queue.append(target)
+        if not moved and not any(divergent[i][s] for i, s in enumerate(local)):
+            result.deadlocks += 1
+    result.num_states = len(seen)
+    return result
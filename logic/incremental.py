@@ -0,0 +1,169 @@
+# logic/incremental.py
+# Ré-analyse incrémentale après une petite modification du réseau
+# On garde le dernier graphe d'accessibilité. À l'analyse suivante, on compare le réseau compilé
+# avec le précédent :
+#   - marquage initial seul modifié : la relation de transition est inchangée, les successeurs
+#     connus sont réutilisés tels quels (seuls les nouveaux marquages sont explorés, les
+#     marquages devenus inaccessibles disparaissent d'eux-mêmes) ;
+#   - poids d'arc modifié, transition ajoutée ou supprimée : seules les transitions modifiées
+#     sont réévaluées dans les marquages déjà connus, les autres arcs du graphe sont repris ;
+#   - places ajoutées, supprimées ou renommées : les marquages ne sont plus comparables,
+#     on recalcule tout.
+# Les résultats structurels (cycles du graphe du réseau) ne sont recalculés que si
+# l'ensemble des arcs change.
+
+from array import array
+from logic.analysis import checkLoop
+from logic.compiled import CompiledNet
+from logic.reachability import ReachabilityGraph, explore_batched
+
+
+# Résultat d'une analyse : graphe, nature de la modification détectée et statistiques de réutilisation
+class IncrementalResult:
+    def __init__(self, graph, edit, changed_transitions, reused_edges, computed_edges, has_loop):
+        self.graph = graph
+        self.edit = edit # "initial", "none", "marking", "transitions" ou "structure"
+        self.changed_transitions = changed_transitions
+        self.reused_edges = reused_edges
+        self.computed_edges = computed_edges
+        self.has_loop = has_loop
+
+    # Niveau de vivacité comme checkVivacity : 0 blocage, 1 quasi-vivant partiel, 2 toutes tirées
+    @property
+    def vivacity(self):
+        if self.graph.deadlocks:
+            return 0
+        fired = set(self.graph.trans)
+        return 2 if len(fired) == self.graph.cn.num_transitions else 1
+
+    def __repr__(self):
+        return (f"IncrementalResult(edit={self.edit!r}, states={self.graph.num_states}, "
+                f"reused={self.reused_edges}, computed={self.computed_edges})")
+
+
+# Ensemble des arcs (sans les poids) : les résultats structurels n'en dépendent que
+def arc_signature(net):
+    return (frozenset(net.places), frozenset(net.transitions),
+            frozenset((a.place.name, a.transition.name, a.direction) for a in net.arcs))
+
+
+class IncrementalAnalyzer:
+    def __init__(self, max_states=None):
+        self.max_states = max_states
+        self.graph = None
+        self.signature = None
+        self.has_loop = None
+
+    # Oublie le graphe précédent (la prochaine analyse repart de zéro)
+    def invalidate(self):
+        self.graph = None
+        self.signature = None
+        self.has_loop = None
+
+    # Compare le réseau compilé au précédent ; retourne (nature, transitions modifiées)
+    def detect_edit(self, cn: CompiledNet):
+        old = self.graph.cn if self.graph is not None else None
+        if old is None or not self.graph.complete:
+            return "initial", None
+        if old.place_names != cn.place_names:
+            return "structure", None
+        changed = set()
+        for t, name in enumerate(cn.transition_names):
+            u = old.transition_index.get(name)
+            if u is None or old.pre[u] != cn.pre[t] or old.post[u] != cn.post[t]:
+                changed.add(t)
+        removed = set(old.transition_names) - set(cn.transition_names)
+        if changed or removed:
+            return "transitions", changed
+        if old.initial != cn.initial:
+            return "marking", changed
+        return "none", changed
+
+    def analyze(self, net, metrics=None):
+        signature = arc_signature(net)
+        if signature != self.signature:
+            self.has_loop = checkLoop(net)
+            self.signature = signature
+        return self.analyze_compiled(CompiledNet(net), metrics)
+
+    # Même analyse sur un réseau déjà compilé (sans les résultats structurels)
+    def analyze_compiled(self, cn: CompiledNet, metrics=None):
+        edit, changed = self.detect_edit(cn)
+        if edit in ("initial", "structure"):
+            graph = explore_batched(cn, max_states=self.max_states, metrics=metrics)
+            reused, computed = 0, graph.num_edges
+        elif edit == "none":
+            graph = self.graph
+            graph.cn = cn
+            reused, computed = graph.num_edges, 0
+        else:
+            graph, reused, computed = self.reexplore(cn, changed)
+        self.graph = graph
+        return IncrementalResult(graph, edit, sorted(cn.transition_names[t] for t in changed or ()),
+                                 reused, computed, self.has_loop)
+
+    # BFS depuis le nouveau marquage initial, en reprenant les arcs de l'ancien graphe
+    # pour les transitions non modifiées. old_to_new associe les états de l'ancien graphe à
+    # ceux du nouveau : un arc repris ne demande ni tir ni hachage du marquage cible.
+    def reexplore(self, cn: CompiledNet, changed):
+        old = self.graph
+        remap = [cn.transition_index.get(name) for name in old.cn.transition_names]
+        changed_list = sorted(changed)
+        # les arcs sont rangés par source croissante (ordre du BFS) : début des arcs de chaque état
+        first_edge = array('l', [0]) * (old.num_states + 1)
+        for s in old.src:
+            first_edge[s + 1] += 1
+        for s in range(old.num_states):
+            first_edge[s + 1] += first_edge[s]
+        old_to_new = array('l', [-1]) * old.num_states
+        old_dst, old_trans, old_markings = old.dst, old.trans, old.markings
+
+        graph = ReachabilityGraph(cn)
+        start = tuple(cn.initial)
+        graph.add_state(start)
+        origin = [old.index.get(start, -1)] # nouvel état -> ancien état (-1 si inconnu)
+        if origin[0] >= 0:
+            old_to_new[origin[0]] = 0
+        index = graph.index
+        max_states = self.max_states
+        reused = computed = 0
+
+        source_id = 0
+        while source_id < graph.num_states:
+            m = graph.markings[source_id]
+            old_id = origin[source_id]
+            if old_id < 0:
+                moves = [(t, cn.fire(m, t), -1) for t in cn.enabled(m)]
+            else:
+                moves = []
+                for e in range(first_edge[old_id], first_edge[old_id + 1]):
+                    t = remap[old_trans[e]]
+                    if t is not None and t not in changed:
+                        moves.append((t, None, old_dst[e]))
+                moves += [(t, cn.fire(m, t), -1) for t in changed_list if cn.is_enabled(m, t)]
+            if not moves:
+                graph.deadlocks.append(source_id)
+
+            for t, target, target_old in moves:
+                target_id = old_to_new[target_old] if target_old >= 0 else -1
+                if target_id < 0:
+                    if target is None:
+                        target = old_markings[target_old]
+                    target_id = index.get(target, -1)
+                    if target_id < 0:
+                        if max_states is not None and graph.num_states >= max_states:
+                            graph.complete = False
+                            continue
+                        target_id = graph.add_state(target)
+                        if target_old < 0:
+                            target_old = old.index.get(target, -1)
+                        origin.append(target_old)
+                    if target_old >= 0:
+                        old_to_new[target_old] = target_id
+                graph.add_edge(source_id, target_id, t)
+                if t in changed or old_id < 0:
+                    computed += 1
+                else:
+                    reused += 1
+            source_id += 1
+        return graph, reused, computed
@@ -0,0 +1,151 @@
+# logic/metrics.py
+# Instrumentation des explorations : compteurs, chronomètres par phase et crochets (hooks)
+# Un explorateur reçoit un ExplorationMetrics (paramètre metrics) qui compte et chronomètre,
+# et relaie chaque événement aux hooks qui y sont branchés (progression, export...).
+# Sans metrics, les explorateurs ne mesurent rien et gardent leur vitesse.
+
+import json
+import time
+import tracemalloc
+
+PHASES = ("enabling", "firing", "hashing", "labeling")
+PROGRESS_INTERVAL = 0.25 # secondes entre deux appels de on_progress
+PROGRESS_CHECK = 256 # nombre d'états entre deux lectures de l'horloge
+
+
+# Interface des hooks : toutes les méthodes sont facultatives (ne rien faire par défaut)
+class ExplorationHook:
+    def on_start(self, explorer, cn):
+        pass
+
+    def on_state(self, state_id, marking):
+        pass
+
+    def on_edge(self, source_id, target_id, transition):
+        pass
+
+    def on_deadlock(self, state_id):
+        pass
+
+    def on_progress(self, metrics):
+        pass
+
+    def on_finish(self, metrics):
+        pass
+
+
+# Compteurs et chronomètres d'une exploration ; notifie `listeners` (des hooks) pendant et à la fin
+class ExplorationMetrics(ExplorationHook):
+    def __init__(self, listeners=(), track_memory=False):
+        self.listeners = list(listeners)
+        self.track_memory = track_memory
+        self.explorer = None
+        self.states = 0
+        self.edges = 0
+        self.deadlocks = 0
+        self.enabled_checks = 0
+        self.frontier = 0
+        self.peak_frontier = 0
+        self.times = dict.fromkeys(PHASES, 0.0)
+        self.peak_memory = None
+        self.started = None
+        self.elapsed = 0.0
+        self.finished = False
+        self._next_check = PROGRESS_CHECK
+        self._last_progress = 0.0
+        self._own_tracing = False
+
+    # -- Interface utilisée par les explorateurs -- #
+    def on_start(self, explorer, cn):
+        self.explorer = explorer
+        self.started = time.perf_counter()
+        self._last_progress = self.started
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._own_tracing = True
+        for hook in self.listeners:
+            hook.on_start(explorer, cn)
+
+    def on_state(self, state_id, marking):
+        self.states += 1
+        for hook in self.listeners:
+            hook.on_state(state_id, marking)
+        if self.states >= self._next_check:
+            self._next_check = self.states + PROGRESS_CHECK
+            now = time.perf_counter()
+            if now - self._last_progress >= PROGRESS_INTERVAL:
+                self._last_progress = now
+                self.elapsed = now - self.started
+                for hook in self.listeners:
+                    hook.on_progress(self)
+
+    def on_edge(self, source_id, target_id, transition):
+        self.edges += 1
+        for hook in self.listeners:
+            hook.on_edge(source_id, target_id, transition)
+
+    def on_deadlock(self, state_id):
+        self.deadlocks += 1
+        for hook in self.listeners:
+            hook.on_deadlock(state_id)
+
+    def on_finish(self, metrics=None):
+        self.elapsed = time.perf_counter() - self.started
+        self.finished = True
+        if tracemalloc.is_tracing() and self.track_memory:
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            if self._own_tracing:
+                tracemalloc.stop()
+                self._own_tracing = False
+        for hook in self.listeners:
+            hook.on_finish(self)
+
+    def add_time(self, phase, seconds):
+        self.times[phase] += seconds
+
+    def set_frontier(self, size):
+        self.frontier = size
+        if size > self.peak_frontier:
+            self.peak_frontier = size
+
+    # -- Lecture des résultats -- #
+    @property
+    def states_per_second(self):
+        return self.states / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self):
+        return {
+            "explorer": self.explorer,
+            "finished": self.finished,
+            "states": self.states,
+            "edges": self.edges,
+            "deadlocks": self.deadlocks,
+            "enabled_checks": self.enabled_checks,
+            "frontier": self.frontier,
+            "peak_frontier": self.peak_frontier,
+            "elapsed_seconds": self.elapsed,
+            "states_per_second": self.states_per_second,
+            "phase_seconds": dict(self.times),
+            "peak_memory_bytes": self.peak_memory,
+        }
+
+    # Écrit les métriques en JSON (chemin ou fichier ouvert)
+    def dump_json(self, target):
+        if hasattr(target, "write"):
+            json.dump(self.to_dict(), target, indent=2)
+        else:
+            with open(target, "w") as f:
+                json.dump(self.to_dict(), f, indent=2)
+
+
+# Appelle une fonction à chaque progression (et à la fin), par exemple pour une barre d'état
+class ProgressCallback(ExplorationHook):
+    def __init__(self, callback):
+        self.callback = callback
+
+    def on_progress(self, metrics):
+        self.callback(metrics)
+
+    def on_finish(self, metrics):
+        self.callback(metrics)
+
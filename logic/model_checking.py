@@ -0,0 +1,454 @@
+# logic/model_checking.py
+# Vérification de propriétés temporelles (CTL et fragment LTL) à la volée
+# Les successeurs ne sont calculés qu'à la demande : la recherche s'arrête dès qu'un verdict
+# (témoin ou contre-exemple) est trouvé, sans construire tout l'espace d'états.
+#
+# Syntaxe :
+#   atomes      : true, false, deadlock, enabled(T1), P1 + 2*P2 <= 3 (comparaisons linéaires)
+#   booléens    : not / !, and / &, or / |, ->
+#   CTL         : AG f, AF f, AX f, EG f, EF f, EX f, A[f U g], E[f U g]
+#   LTL         : G p, F p, X p, p U q (opérateur unique appliqué à des formules sans temporel,
+#                 interprété sur tous les chemins ; c'est le fragment commun à CTL et LTL)
+# Les chemins sont maximaux : un blocage termine le chemin (EG p est vrai sur un blocage
+# satisfaisant p, AX p y est vrai par vacuité).
+
+import re
+from collections import deque
+from logic.compiled import CompiledNet
+from logic.reduction import reduce_net
+
+TOKEN = re.compile(r'\s*(?:(\d+)|("[^"]*")|(<=|>=|==|!=|->|&&|\|\||[<>()\[\]+\-*!&|,])|([A-Za-z_][\w.]*))')
+COMPARATORS = {"<=": lambda a, b: a <= b, ">=": lambda a, b: a >= b, "<": lambda a, b: a < b,
+               ">": lambda a, b: a > b, "==": lambda a, b: a == b, "!=": lambda a, b: a != b}
+CTL_UNARY = ("AG", "AF", "AX", "EG", "EF", "EX")
+LTL_UNARY = ("G", "F", "X")
+
+
+## ---- Analyse syntaxique ---- ##
+# Les formules sont des tuples (hachables) : ("AG", f), ("cmp", op, gauche, droite)...
+# Une expression linéaire est ((indice de place, coefficient), ...), constante
+class FormulaParser:
+    def __init__(self, text, cn: CompiledNet):
+        self.cn = cn
+        self.tokens = []
+        pos = 0
+        text = text.strip()
+        while pos < len(text):
+            match = TOKEN.match(text, pos)
+            if not match or match.end() == pos:
+                raise ValueError(f"Unexpected character at {pos}: '{text[pos:pos + 10]}'")
+            number, quoted, symbol, word = match.groups()
+            if number is not None:
+                self.tokens.append(("num", int(number)))
+            elif quoted is not None:
+                self.tokens.append(("name", quoted[1:-1]))
+            elif symbol is not None:
+                self.tokens.append(("sym", symbol))
+            else:
+                self.tokens.append(("word", word))
+            pos = match.end()
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self, value=None):
+        token = self.peek()
+        if token[0] is None:
+            raise ValueError("Unexpected end of formula")
+        if value is not None and token[1] != value:
+            raise ValueError(f"Expected '{value}' but found '{token[1]}'")
+        self.pos += 1
+        return token
+
+    def parse(self):
+        formula = self.implication()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Unexpected '{self.peek()[1]}'")
+        return check_ltl_fragment(formula)
+
+    def implication(self):
+        left = self.until()
+        if self.peek() == ("sym", "->"):
+            self.take()
+            return ("or", ("not", left), self.implication())
+        return left
+
+    def until(self):
+        left = self.disjunction()
+        if self.peek() == ("word", "U"):
+            self.take()
+            return ("LTL", "U", left, self.disjunction())
+        return left
+
+    def disjunction(self):
+        left = self.conjunction()
+        while self.peek() in (("word", "or"), ("sym", "|"), ("sym", "||")):
+            self.take()
+            left = ("or", left, self.conjunction())
+        return left
+
+    def conjunction(self):
+        left = self.unary()
+        while self.peek() in (("word", "and"), ("sym", "&"), ("sym", "&&")):
+            self.take()
+            left = ("and", left, self.unary())
+        return left
+
+    def unary(self):
+        kind, value = self.peek()
+        if (kind, value) in (("word", "not"), ("sym", "!")):
+            self.take()
+            return ("not", self.unary())
+        if kind == "word" and value in CTL_UNARY:
+            self.take()
+            return (value, self.unary())
+        if kind == "word" and value in LTL_UNARY:
+            self.take()
+            return ("LTL", value, self.unary())
+        if kind == "word" and value in ("A", "E") and self.tokens[self.pos + 1:self.pos + 2] == [("sym", "[")]:
+            self.take()
+            self.take("[")
+            left = self.implication_without_until()
+            self.take("U")
+            right = self.implication_without_until()
+            self.take("]")
+            return (value + "U", left, right)
+        return self.atom()
+
+    def implication_without_until(self):
+        left = self.disjunction()
+        if self.peek() == ("sym", "->"):
+            self.take()
+            return ("or", ("not", left), self.implication_without_until())
+        return left
+
+    def atom(self):
+        kind, value = self.peek()
+        if kind == "word" and value in ("true", "false"):
+            self.take()
+            return (value,)
+        if kind == "word" and value == "deadlock":
+            self.take()
+            return ("deadlock",)
+        if kind == "word" and value == "enabled":
+            self.take()
+            self.take("(")
+            name = self.take()[1]
+            self.take(")")
+            if name not in self.cn.transition_index:
+                raise ValueError(f"Unknown transition '{name}'")
+            return ("enabled", self.cn.transition_index[name])
+        if (kind, value) == ("sym", "("):
+            # soit une sous-formule, soit le début d'une expression linéaire
+            start = self.pos
+            try:
+                return self.comparison()
+            except ValueError:
+                self.pos = start
+            self.take("(")
+            inner = self.implication()
+            self.take(")")
+            return inner
+        return self.comparison()
+
+    def comparison(self):
+        left = self.linear()
+        kind, op = self.peek()
+        if op not in COMPARATORS:
+            raise ValueError(f"Expected a comparison but found '{op}'")
+        self.take()
+        return ("cmp", op, left, self.linear())
+
+    # somme de termes n*P, P ou n (parenthèses autorisées)
+    def linear(self):
+        coefs = {}
+        const = 0
+        sign = 1
+        if self.peek() == ("sym", "-"):
+            self.take()
+            sign = -1
+        while True:
+            kind, value = self.peek()
+            if (kind, value) == ("sym", "("):
+                self.take()
+                inner, inner_const = self.linear()
+                self.take(")")
+                for p, c in inner:
+                    coefs[p] = coefs.get(p, 0) + sign * c
+                const += sign * inner_const
+            elif kind == "num":
+                self.take()
+                if self.peek() == ("sym", "*"):
+                    self.take()
+                    p = self.place()
+                    coefs[p] = coefs.get(p, 0) + sign * value
+                else:
+                    const += sign * value
+            else:
+                p = self.place()
+                coefs[p] = coefs.get(p, 0) + sign
+            if self.peek() in (("sym", "+"), ("sym", "-")):
+                sign = 1 if self.take()[1] == "+" else -1
+            else:
+                return tuple(sorted(coefs.items())), const
+
+    def place(self):
+        kind, name = self.take()
+        if kind not in ("word", "name") or name not in self.cn.place_index:
+            raise ValueError(f"Unknown place '{name}'")
+        return self.cn.place_index[name]
+
+
+def contains_temporal(f):
+    if f[0] in CTL_UNARY or f[0] in ("AU", "EU", "LTL"):
+        return True
+    return any(isinstance(x, tuple) and x and isinstance(x[0], str) and contains_temporal(x) for x in f[1:])
+
+
+# Un opérateur LTL doit être au sommet et porter sur des formules sans temporel ;
+# il est alors traduit en son équivalent CTL universel
+def check_ltl_fragment(formula):
+    if formula[0] == "LTL":
+        op, *args = formula[1:]
+        if any(contains_temporal(a) for a in args):
+            raise ValueError("Unsupported LTL formula: temporal operators must apply to state propositions")
+        return {"G": ("AG",), "F": ("AF",), "X": ("AX",), "U": ("AU",)}[op] + tuple(args)
+
+    def no_ltl(f):
+        if f[0] == "LTL":
+            raise ValueError("LTL operators (G, F, X, U) are only supported at the top of the formula")
+        for x in f[1:]:
+            if isinstance(x, tuple) and x and isinstance(x[0], str) and x[0] not in ("cmp",):
+                no_ltl(x)
+    no_ltl(formula)
+    return formula
+
+
+## ---- Vérification ---- ##
+# Résultat : verdict, chemin témoin/contre-exemple (noms de transitions), nombre d'états visités
+class Verdict:
+    def __init__(self, formula_text, holds, trace, loop_start, states_explored):
+        self.formula = formula_text
+        self.holds = holds
+        self.trace = trace # témoin si vrai, contre-exemple si faux (None si non pertinent)
+        self.loop_start = loop_start # indice du début de cycle pour un chemin en lasso
+        self.states_explored = states_explored
+
+    def __repr__(self):
+        return f"Verdict({self.formula!r}, holds={self.holds}, trace={self.trace}, states={self.states_explored})"
+
+
+class ModelChecker:
+    def __init__(self, net, max_states=None):
+        self.cn = net if isinstance(net, CompiledNet) else CompiledNet(net)
+        self.max_states = max_states
+        self.succ = {} # marquage -> [(transition, successeur)] calculé à la demande
+        self.memo = {} # (formule, marquage) -> bool
+
+    def successors(self, m):
+        result = self.succ.get(m)
+        if result is None:
+            if self.max_states is not None and len(self.succ) >= self.max_states:
+                raise RuntimeError(f"Exploration limit of {self.max_states} states reached")
+            result = [(t, self.cn.fire(m, t)) for t in self.cn.enabled(m)]
+            self.succ[m] = result
+        return result
+
+    # Vérifie une formule (texte) depuis le marquage initial
+    def check(self, text):
+        formula = FormulaParser(text, self.cn).parse()
+        m0 = tuple(self.cn.initial)
+        negated = False
+        while formula[0] == "not":
+            negated = not negated
+            formula = formula[1]
+        holds, path, loop = self.evaluate_with_trace(formula, m0)
+        names = [self.cn.transition_names[t] for t in path] if path is not None else None
+        return Verdict(text, holds != negated, names, loop, len(self.succ))
+
+    # Évaluation au sommet : produit aussi le chemin témoin ou contre-exemple
+    def evaluate_with_trace(self, f, m):
+        op = f[0]
+        if op == "EF":
+            path = self.search_until(("true",), f[1], m)
+            return path is not None, path, None
+        if op == "AG":
+            path = self.search_until(("true",), ("not", f[1]), m)
+            return path is None, path, None
+        if op == "EU":
+            path = self.search_until(f[1], f[2], m)
+            return path is not None, path, None
+        if op == "EG":
+            lasso = self.search_globally(f[1], m)
+            return (lasso is not None,) + (lasso if lasso else (None, None))
+        if op == "AF":
+            lasso = self.search_globally(("not", f[1]), m)
+            return (lasso is None,) + (lasso if lasso else (None, None))
+        if op == "AU":
+            # A[f U g] = not (E[not g U (not f and not g)] or EG not g)
+            path = self.search_until(("not", f[2]), ("and", ("not", f[1]), ("not", f[2])), m)
+            if path is not None:
+                return False, path, None
+            lasso = self.search_globally(("not", f[2]), m)
+            return (lasso is None,) + (lasso if lasso else (None, None))
+        if op in ("EX", "AX"):
+            for t, target in self.successors(m):
+                value = self.evaluate(f[1], target)
+                if value == (op == "EX"):
+                    return value, [t], None
+            return op == "AX", None, None
+        return self.evaluate(f, m), None, None
+
+    # Évaluation d'une formule d'état (avec mémoïsation des sous-formules temporelles)
+    def evaluate(self, f, m):
+        op = f[0]
+        if op == "true":
+            return True
+        if op == "false":
+            return False
+        if op == "cmp":
+            _, cmp, (left, lc), (right, rc) = f
+            return COMPARATORS[cmp](sum(m[p] * c for p, c in left) + lc, sum(m[p] * c for p, c in right) + rc)
+        if op == "deadlock":
+            return not self.successors(m)
+        if op == "enabled":
+            return self.cn.is_enabled(m, f[1])
+        if op == "not":
+            return not self.evaluate(f[1], m)
+        if op == "and":
+            return self.evaluate(f[1], m) and self.evaluate(f[2], m)
+        if op == "or":
+            return self.evaluate(f[1], m) or self.evaluate(f[2], m)
+
+        key = (f, m)
+        value = self.memo.get(key)
+        if value is None:
+            value = self.evaluate_with_trace(f, m)[0]
+            self.memo[key] = value
+        return value
+
+    # Cherche un chemin f* g (BFS, donc le plus court) ; retourne les transitions ou None
+    # En cas d'échec, aucun état visité ne satisfait E[f U g] : on le mémorise
+    def search_until(self, f, g, m):
+        if self.evaluate(g, m):
+            return []
+        if not self.evaluate(f, m):
+            return None
+        parents = {m: None}
+        queue = deque([m])
+        while queue:
+            current = queue.popleft()
+            for t, target in self.successors(current):
+                if target in parents:
+                    continue
+                parents[target] = (current, t)
+                if self.evaluate(g, target):
+                    return self.rebuild(parents, target)
+                if self.evaluate(f, target):
+                    queue.append(target)
+        formula = ("EU", f, g)
+        for state in parents:
+            self.memo[(formula, state)] = False
+        return None
+
+    # Cherche un chemin maximal restant dans f (cycle ou blocage) par DFS
+    # Retourne (transitions, indice du début de cycle) ou None
+    def search_globally(self, f, m):
+        if not self.evaluate(f, m):
+            return None
+        finished = set()
+        on_stack = {m: 0}
+        stack = [(m, iter(self.successors(m)))]
+        fired = [] # transitions le long de la pile
+        if not self.succ[m]:
+            return [], None
+        while stack:
+            current, it = stack[-1]
+            advanced = False
+            for t, target in it:
+                if target in on_stack:
+                    return fired + [t], on_stack[target]
+                if target in finished or not self.evaluate(f, target):
+                    continue
+                succs = self.successors(target)
+                fired.append(t)
+                if not succs:
+                    return fired, None # blocage : chemin maximal fini
+                on_stack[target] = len(fired)
+                stack.append((target, iter(succs)))
+                advanced = True
+                break
+            if not advanced:
+                stack.pop()
+                del on_stack[current]
+                finished.add(current)
+                if fired:
+                    fired.pop()
+        formula = ("EG", f)
+        for state in finished:
+            self.memo[(formula, state)] = False
+        return None
+
+    @staticmethod
+    def rebuild(parents, target):
+        path = []
+        while parents[target] is not None:
+            target, t = parents[target]
+            path.append(t)
+        path.reverse()
+        return path
+
+
+# Places et transitions citées par une formule (noms)
+def formula_names(f, cn: CompiledNet):
+    places, transitions = set(), set()
+    if f[0] == "cmp":
+        for coefs, _ in f[2:]:
+            places.update(cn.place_names[p] for p, _ in coefs)
+    elif f[0] == "enabled":
+        # les pré-places décident de l'activation : elles ne doivent pas être fusionnées
+        transitions.add(cn.transition_names[f[1]])
+        places.update(cn.place_names[p] for p, _ in cn.pre[f[1]])
+    else:
+        for x in f[1:]:
+            if isinstance(x, tuple) and x and isinstance(x[0], str):
+                sub_places, sub_transitions = formula_names(x, cn)
+                places |= sub_places
+                transitions |= sub_transitions
+    return places, transitions
+
+
+# La réduction fusionne des tirs successifs : les états intermédiaires disparaissent.
+# Seules les propriétés d'accessibilité (EF, AG sur une formule sans temporel) sont conservées ;
+# EG, AF, A[U], E[U], LTL et les opérateurs imbriqués portent sur les chemins et sont vérifiés
+# sur le réseau d'origine.
+REDUCIBLE = ("EF", "AG")
+
+
+def reduction_preserves(f, inside=False):
+    if f[0] in CTL_UNARY or f[0] in ("AU", "EU", "LTL"):
+        if inside or f[0] not in REDUCIBLE:
+            return False
+        inside = True
+    return all(reduction_preserves(x, inside) for x in f[1:]
+               if isinstance(x, tuple) and x and isinstance(x[0], str))
+
+
+# Raccourci : vérifie une formule sur un PetriNet
+# reduce : vérifie sur le réseau réduit en gardant les noeuds cités par la formule, puis déplie
+# la trace sur le réseau d'origine (sans effet si la formule n'est pas une propriété EF / AG)
+def check_formula(net, text, max_states=None, reduce=False):
+    if reduce:
+        cn = CompiledNet(net)
+        formula = FormulaParser(text, cn).parse()
+        if reduction_preserves(formula):
+            places, transitions = formula_names(formula, cn)
+            reduction = reduce_net(net, keep=places | transitions)
+            verdict = ModelChecker(reduction.net, max_states=max_states).check(text)
+            if verdict.trace is not None:
+                if verdict.loop_start is not None:
+                    verdict.loop_start = len(reduction.expand_trace(verdict.trace[:verdict.loop_start]))
+                verdict.trace = reduction.expand_trace(verdict.trace)
+            return verdict
+    return ModelChecker(net, max_states=max_states).check(text)
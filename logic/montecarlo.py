@@ -0,0 +1,145 @@
+# logic/montecarlo.py
+# Analyse statistique par marches aléatoires (Monte-Carlo) pour les réseaux trop grands à énumérer
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+from logic.compiled import CompiledNet
+from logic.simulation import Simulator
+
+CHUNK_SIZE = 64 # marches par tâche ; la graine dépend du numéro de tâche, pas du nombre de workers
+
+
+# Statistiques agrégées au fil de l'eau, sans conserver les traces
+# Tous les compteurs sont entiers : la fusion est exacte et indépendante de l'ordre
+class MonteCarloStats:
+    def __init__(self, cn: CompiledNet, max_steps):
+        self.place_names = cn.place_names
+        self.transition_names = cn.transition_names
+        self.max_steps = max_steps
+        self.walks = 0
+        self.total_steps = 0
+        self.fire_counts = [0] * cn.num_transitions
+        self.token_time = [0] * cn.num_places # somme sur le temps (en pas) des jetons
+        self.max_tokens = list(cn.initial)
+        self.deadlocks = 0
+        self.deadlock_steps = {} # pas du blocage -> nombre de marches
+
+    # Ajoute les statistiques d'un autre lot
+    def merge(self, other):
+        self.walks += other.walks
+        self.total_steps += other.total_steps
+        self.fire_counts = [a + b for a, b in zip(self.fire_counts, other.fire_counts)]
+        self.token_time = [a + b for a, b in zip(self.token_time, other.token_time)]
+        self.max_tokens = [max(a, b) for a, b in zip(self.max_tokens, other.max_tokens)]
+        self.deadlocks += other.deadlocks
+        for step, count in other.deadlock_steps.items():
+            self.deadlock_steps[step] = self.deadlock_steps.get(step, 0) + count
+        return self
+
+    # Probabilité d'atteindre un blocage en au plus max_steps tirs
+    @property
+    def deadlock_probability(self):
+        return self.deadlocks / self.walks if self.walks else 0.0
+
+    # Fréquence de tir de chaque transition (part des tirs totaux)
+    def firing_frequencies(self):
+        total = self.total_steps or 1
+        return {name: count / total for name, count in zip(self.transition_names, self.fire_counts)}
+
+    # Nombre moyen de jetons par place (moyenne temporelle sur toutes les marches)
+    def mean_tokens(self):
+        duration = self.total_steps + self.walks or 1
+        return {name: s / duration for name, s in zip(self.place_names, self.token_time)}
+
+    def max_tokens_dict(self):
+        return dict(zip(self.place_names, self.max_tokens))
+
+    # Quantile de la distribution du temps avant blocage (parmi les marches bloquées)
+    def time_to_deadlock_quantile(self, q):
+        if not self.deadlocks:
+            return None
+        target = q * self.deadlocks
+        seen = 0
+        for step in sorted(self.deadlock_steps):
+            seen += self.deadlock_steps[step]
+            if seen >= target:
+                return step
+        return max(self.deadlock_steps)
+
+    def mean_time_to_deadlock(self):
+        if not self.deadlocks:
+            return None
+        return sum(step * count for step, count in self.deadlock_steps.items()) / self.deadlocks
+
+    # Résumé sérialisable (pour le rapport ou un export)
+    def summary(self):
+        return {
+            "walks": self.walks,
+            "max_steps": self.max_steps,
+            "total_steps": self.total_steps,
+            "deadlock_probability": self.deadlock_probability,
+            "mean_time_to_deadlock": self.mean_time_to_deadlock(),
+            "time_to_deadlock_quantiles": {q: self.time_to_deadlock_quantile(q) for q in (0.1, 0.5, 0.9)},
+            "firing_frequencies": self.firing_frequencies(),
+            "mean_tokens": self.mean_tokens(),
+            "max_tokens": self.max_tokens_dict(),
+        }
+
+
+# Exécute un lot de marches aléatoires (fonction de worker, doit rester au niveau du module)
+def run_walks(cn: CompiledNet, seed, chunk_index, walks, max_steps):
+    stats = MonteCarloStats(cn, max_steps)
+    sim = Simulator(cn, policy="random")
+    sim.rng = random.Random(f"{seed}:{chunk_index}")
+    delta = cn.delta
+    fire_counts = stats.fire_counts
+    token_time = stats.token_time
+    max_tokens = stats.max_tokens
+
+    for _ in range(walks):
+        sim.reset()
+        marking = sim.marking
+        last_change = [0] * cn.num_places # pas du dernier changement de chaque place
+        step = 0
+        while True:
+            t = sim.choose()
+            if t is None:
+                stats.deadlocks += 1
+                stats.deadlock_steps[step] = stats.deadlock_steps.get(step, 0) + 1
+                break
+            if step == max_steps:
+                break
+            step += 1
+            for p, d in delta[t]:
+                token_time[p] += marking[p] * (step - last_change[p])
+                last_change[p] = step
+            sim.fire(t)
+            fire_counts[t] += 1
+            for p, d in delta[t]:
+                if d > 0 and marking[p] > max_tokens[p]:
+                    max_tokens[p] = marking[p]
+        # on clôture l'intégrale temporelle (le marquage final compte pour un pas)
+        for p in range(cn.num_places):
+            token_time[p] += marking[p] * (step + 1 - last_change[p])
+        stats.total_steps += step
+        stats.walks += 1
+    return stats
+
+
+# Lance `walks` marches de `max_steps` tirs maximum depuis le marquage initial
+# workers=1 exécute tout dans le processus courant ; le résultat ne dépend que de seed
+def run_monte_carlo(net, walks=1000, max_steps=1000, seed=0, workers=None):
+    cn = net if isinstance(net, CompiledNet) else CompiledNet(net)
+    chunks = [(i, min(CHUNK_SIZE, walks - start)) for i, start in enumerate(range(0, walks, CHUNK_SIZE))]
+    stats = MonteCarloStats(cn, max_steps)
+
+    if workers == 1 or len(chunks) <= 1:
+        for i, size in chunks:
+            stats.merge(run_walks(cn, seed, i, size, max_steps))
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_walks, cn, seed, i, size, max_steps) for i, size in chunks]
+        for future in futures:
+            stats.merge(future.result())
+    return stats
@@ -0,0 +1,256 @@
+# logic/parameter_sweep.py
+# Balayage de paramètres : jetons initiaux et poids d'arcs parcourent des plages de valeurs,
+# chaque point de la grille est analysé (nombre d'états, blocage, bornes, vivacité).
+# La structure du réseau n'est compilée qu'une fois ; chaque point n'en modifie que le marquage
+# initial et les poids (copie légère du CompiledNet).
+# Les points qui ne diffèrent que par le marquage initial ont la même relation de transition :
+# ils sont analysés à la suite par un même IncrementalAnalyzer, qui reprend les successeurs déjà
+# calculés au lieu de les recalculer (réutilisation exacte, voir logic/incremental.py).
+# Usage : python -m logic.parameter_sweep modele.petri --tokens P1=0:4 --weight "P1->T1=1,2" --output table.csv
+
+import argparse
+import copy
+import csv
+import itertools
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+from logic.petri_net import PetriNet
+from logic.compiled import CompiledNet
+from logic.incremental import IncrementalAnalyzer
+
+DIRECTIONS = {"place_to_transition": "{0}->{1}", "transition_to_place": "{1}->{0}"}
+
+
+# Nom d'un arc dans la table et en ligne de commande : "P1->T1" (entrée) ou "T1->P1" (sortie)
+def arc_label(arc_key):
+    place, transition, direction = arc_key
+    return DIRECTIONS[direction].format(place, transition)
+
+
+def parse_arc(net: PetriNet, text):
+    source, _, target = text.partition("->")
+    if source in net.places and target in net.transitions:
+        key = (source, target, "place_to_transition")
+    elif source in net.transitions and target in net.places:
+        key = (target, source, "transition_to_place")
+    else:
+        raise ValueError(f"Unknown arc '{text}' (expected Place->Transition or Transition->Place)")
+    if key not in net.arc_index:
+        raise ValueError(f"No arc '{text}' in the net")
+    return key
+
+
+# Plage de valeurs : "3", "0:4" (bornes incluses), "0:10:2" ou "1,2,5"
+def parse_values(text):
+    if "," in text:
+        return [int(v) for v in text.split(",")]
+    parts = [int(v) for v in text.split(":")]
+    if len(parts) == 1:
+        return parts
+    start, stop, step = parts[0], parts[1], parts[2] if len(parts) > 2 else 1
+    return list(range(start, stop + 1, step))
+
+
+# Copie du réseau compilé avec d'autres jetons initiaux et poids d'arcs
+# tokens : {indice de place: jetons} ; weights : {(place, transition, "pre"|"post"): poids}
+def with_parameters(base: CompiledNet, tokens, weights):
+    cn = copy.copy(base)
+    if tokens:
+        initial = list(base.initial)
+        for p, value in tokens.items():
+            initial[p] = value
+        cn.initial = tuple(initial)
+    if weights:
+        pre, post, delta = list(base.pre), list(base.post), list(base.delta)
+        changed = {t for _, t, _ in weights}
+        for t in changed:
+            t_pre, t_post = dict(base.pre[t]), dict(base.post[t])
+            for (p, u, side), w in weights.items():
+                if u == t:
+                    (t_pre if side == "pre" else t_post)[p] = w
+            pre[t], post[t] = tuple(sorted(t_pre.items())), tuple(sorted(t_post.items()))
+            change = {p: -w for p, w in t_pre.items()}
+            for p, w in t_post.items():
+                change[p] = change.get(p, 0) + w
+            delta[t] = tuple((p, d) for p, d in sorted(change.items()) if d != 0)
+        cn.pre, cn.post, cn.delta = tuple(pre), tuple(post), tuple(delta)
+        # les transitions à réévaluer dépendent des places réellement modifiées par le tir
+        cn.affected = tuple(
+            tuple(sorted(set(c for p, _ in cn.delta[t] for c in cn.consumers[p])))
+            for t in range(cn.num_transitions))
+    return cn
+
+
+# Propriétés d'un graphe d'accessibilité complet ou partiel
+# vivant : toute composante fortement connexe terminale contient un arc de chaque transition
+def graph_properties(graph):
+    cn = graph.cn
+    markings = np.array(graph.markings, dtype=np.int64).reshape(graph.num_states, cn.num_places)
+    bounds = markings.max(axis=0) if graph.num_states else np.zeros(cn.num_places, dtype=np.int64)
+    fired = set(graph.trans)
+    live = None
+    if graph.complete:
+        n = graph.num_states
+        # array('l') ou tableau NumPy : conversion par valeur, la taille de 'l' dépend de la plateforme
+        src, dst, trans = (np.asarray(a, dtype=np.int64) for a in (graph.src, graph.dst, graph.trans))
+        adjacency = sp.csr_matrix((np.ones(len(src), dtype=np.int8), (src, dst)), shape=(n, n))
+        _, labels = connected_components(adjacency, directed=True, connection="strong")
+        leaving = np.zeros(labels.max() + 1 if n else 0, dtype=bool)
+        leaving[labels[src][labels[src] != labels[dst]]] = True
+        inside = labels[src] == labels[dst]
+        live = True
+        for component in np.flatnonzero(~leaving):
+            in_component = inside & (labels[src] == component)
+            if len(np.unique(trans[in_component])) < cn.num_transitions:
+                live = False
+                break
+    return {
+        "states": graph.num_states,
+        "edges": graph.num_edges,
+        "complete": graph.complete,
+        "deadlock": bool(graph.deadlocks),
+        "quasi_live": len(fired) == cn.num_transitions,
+        "live": live,
+        "max_bound": int(bounds.max()) if len(bounds) else 0,
+        "bounds": dict(zip(cn.place_names, (int(b) for b in bounds))),
+    }
+
+
+# Analyse une suite de marquages initiaux pour des poids donnés (une tâche du pool)
+# Les points sont triés : deux points voisins partagent plus de marquages accessibles
+def analyze_points(base, weights, token_points, max_states):
+    analyzer = IncrementalAnalyzer(max_states=max_states)
+    cn_weights = with_parameters(base, None, weights)
+    rows = []
+    for tokens in sorted(token_points, key=lambda point: tuple(sorted(point.items()))):
+        result = analyzer.analyze_compiled(with_parameters(cn_weights, tokens, None))
+        row = graph_properties(result.graph)
+        row["reused_edges"] = result.reused_edges
+        rows.append((tokens, row))
+    return rows
+
+
+class SweepTable:
+    def __init__(self, parameters, rows):
+        self.parameters = parameters # noms des colonnes de paramètres
+        self.rows = rows # dicts : paramètres puis résultats
+
+    COLUMNS = ("states", "edges", "complete", "deadlock", "quasi_live", "live", "max_bound", "reused_edges")
+
+    def to_csv(self, target):
+        own = not hasattr(target, "write")
+        f = open(target, "w", newline="", encoding="utf-8") if own else target
+        try:
+            writer = csv.writer(f)
+            writer.writerow(list(self.parameters) + list(self.COLUMNS) + ["bounds"])
+            for row in self.rows:
+                bounds = " ".join(f"{name}={value}" for name, value in row["bounds"].items())
+                writer.writerow([row[c] for c in self.parameters] + [row[c] for c in self.COLUMNS] + [bounds])
+        finally:
+            if own:
+                f.close()
+
+
+# Analyse chaque point de la grille tokens x weights
+# tokens : {place: valeurs} ; weights : {(place, transition, direction): valeurs} (clés de net.arc_index)
+# workers=1 exécute tout dans le processus courant
+def run_sweep(net: PetriNet, tokens=None, weights=None, max_states=None, workers=None):
+    tokens, weights = tokens or {}, weights or {}
+    base = CompiledNet(net)
+    for name in tokens:
+        if name not in base.place_index:
+            raise ValueError(f"Unknown place '{name}'")
+    for key in weights:
+        if key not in net.arc_index:
+            raise ValueError(f"Unknown arc {key}")
+    for values in list(tokens.values()) + list(weights.values()):
+        if not values:
+            raise ValueError("Empty range of values")
+    if any(w < 1 for values in weights.values() for w in values):
+        raise ValueError("Arc weights must be at least 1")
+
+    token_names, arc_keys = list(tokens), list(weights)
+    token_grid = [dict(zip((base.place_index[n] for n in token_names), values))
+                  for values in itertools.product(*tokens.values())]
+    tasks = []
+    for values in itertools.product(*weights.values()):
+        w = {(base.place_index[p], base.transition_index[t], "pre" if d == "place_to_transition" else "post"): v
+             for (p, t, d), v in zip(arc_keys, values)}
+        tasks.append((w, dict(zip(arc_keys, values)), token_grid))
+
+    # un groupe de poids trop gros pour les workers disponibles est découpé (moins de réutilisation)
+    workers = workers or os.cpu_count() or 1
+    pieces = max(1, workers // len(tasks)) if workers > 1 else 1
+    jobs = []
+    for w, labels, grid in tasks:
+        size = math.ceil(len(grid) / min(pieces, len(grid)))
+        for start in range(0, len(grid), size):
+            jobs.append((w, labels, grid[start:start + size]))
+
+    if workers == 1 or len(jobs) <= 1:
+        outputs = [analyze_points(base, w, grid, max_states) for w, _, grid in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(analyze_points, base, w, grid, max_states) for w, _, grid in jobs]
+            outputs = [future.result() for future in futures]
+
+    rows = []
+    for (_, labels, _), output in zip(jobs, outputs):
+        for point, result in output:
+            row = {name: point[base.place_index[name]] for name in token_names}
+            row.update((arc_label(key), value) for key, value in labels.items())
+            row.update(result)
+            rows.append(row)
+    rows.sort(key=lambda r: tuple(r[c] for c in token_names + [arc_label(k) for k in arc_keys]))
+    return SweepTable(token_names + [arc_label(k) for k in arc_keys], rows)
+
+
+## ---- Ligne de commande ---- ##
+def load_net(filename):
+    net = PetriNet()
+    if filename.lower().endswith(".pnml"):
+        from logic.pnml import read_pnml
+        read_pnml(filename, net)
+    else:
+        from logic.updownload import read_model # import local : updownload dépend de PyQt
+        read_model(filename, net)
+    return net
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Balayage de paramètres d'un réseau de Petri")
+    parser.add_argument("model", help="fichier du réseau (.petri, .petri.gz, .petri.zst, .json, .pnml)")
+    parser.add_argument("--tokens", action="append", default=[], metavar="PLACE=VALEURS",
+                        help="jetons initiaux d'une place, par exemple P1=0:4 ou P1=1,3 (répétable)")
+    parser.add_argument("--weight", action="append", default=[], metavar="ARC=VALEURS",
+                        help='poids d\'un arc, par exemple "P1->T1=1:3" ou "T1->P2=2,4" (répétable)')
+    parser.add_argument("--max-states", type=int, default=None, help="limite d'états par point")
+    parser.add_argument("--workers", type=int, default=None, help="processus (défaut : nombre de coeurs)")
+    parser.add_argument("--output", default=None, help="table CSV (défaut : sortie standard)")
+    args = parser.parse_args(argv)
+
+    net = load_net(args.model)
+    try:
+        tokens = {}
+        for option in args.tokens:
+            name, _, values = option.rpartition("=")
+            tokens[name] = parse_values(values)
+        weights = {}
+        for option in args.weight:
+            arc, _, values = option.rpartition("=")
+            weights[parse_arc(net, arc)] = parse_values(values)
+        table = run_sweep(net, tokens, weights, max_states=args.max_states, workers=args.workers)
+    except ValueError as e:
+        parser.error(str(e))
+    table.to_csv(args.output or sys.stdout)
+    if args.output:
+        print(f"{len(table.rows)} points écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
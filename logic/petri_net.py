@@ -7,6 +7,7 @@ class Place:
         self.name = name
         self.initial_tokens = 0
         self.tokens = 0
+        self.color_set = "Integer" # ensemble de couleurs (voir logic.colored.STANDARD_COLOR_SETS)
 
     # Impression débug pour une place
     def __repr__(self):
@@ -17,6 +18,11 @@ class Place:
 class Transition:
     def __init__(self, name):
         self.name = name
+        # Réseaux stochastiques (GSPN) : taux de la loi exponentielle, ou poids si immédiate
+        self.rate = 1.0
+        self.immediate = False
+        # Réseaux temporisés : (type, paramètres...), voir logic.timed.DELAY_KINDS
+        self.delay = ("deterministic", 0.0)
 
     # Impression débug pour une transition
     def __repr__(self):
@@ -47,14 +53,17 @@ class Arc:
             return f"Arc({self.transition.name} -> {self.place.name}, Poids={self.weight})"
 
 
+# Vérifie un nombre entier de jetons ou un poids d'arc lu dans un fichier (au moins `minimum`)
+def check_count(value, what, minimum=0):
+    if not isinstance(value, int) or isinstance(value, bool) or value < minimum:
+        raise ValueError(f"Invalid {what}: {value!r}")
+    return value
+
+
 # Représente l'ensemble d'un réseau de Petri
 class PetriNet:
     def __init__(self):
-        self.places = {}
-        self.transitions = {}
-        self.arcs = []
-        self.place_counter = 0
-        self.transition_counter = 0
+        self.wipe()
 
     # Pour entièrement reset le réseau
     def wipe(self):
@@ -63,6 +72,10 @@ class PetriNet:
         self.arcs = []
         self.place_counter = 0
         self.transition_counter = 0
+        # Index pour des accès en O(1) : (place, transition, direction) -> arc, et arcs par noeud
+        self.arc_index = {}
+        self.place_arcs = {}
+        self.transition_arcs = {}
 
     ## ---- Méthodes pour les places ---- ##
     # Rajoute une place
@@ -75,20 +88,12 @@ class PetriNet:
 
         place = Place(name)
         self.places[name] = place
+        self.place_arcs[name] = []
         return place
     
     # Supprime une place
     def delete_place(self, name):
-        place = self.places.pop(name, None)
-        if not place: # safety
-            return
-        
-        # Supprime aussi les arcs associés
-        new_arcs = []
-        for arc in self.arcs:
-            if arc.place != place:
-                new_arcs.append(arc)
-        self.arcs = new_arcs
+        self.delete_many(place_names=[name])
 
     # Update le nombre de jetons initial d'une place et donc son nombre actuel de jetons
     def set_tokens(self, place_name, amount):
@@ -108,20 +113,12 @@ class PetriNet:
 
         transition = Transition(name)
         self.transitions[name] = transition
+        self.transition_arcs[name] = []
         return transition
     
     # Supprime une transition
     def delete_transition(self, name):
-        transition = self.transitions.pop(name, None)
-        if not transition: # safety
-            return
-        
-        # Supprime aussi les arcs associés
-        new_arcs = []
-        for arc in self.arcs:
-            if arc.transition != transition:
-                new_arcs.append(arc)
-        self.arcs = new_arcs
+        self.delete_many(transition_names=[name])
 
     ## ---- Méthodes pour les arcs ---- ##
     # Rajoute un arc, si possible
@@ -145,45 +142,95 @@ class PetriNet:
             raise ValueError("An arc must connect a place and a transition.")
 
         # on vérifie que l'arc n'existe pas déjà
-        for arc in self.arcs:
-            if arc.place == place and arc.transition == transition and arc.direction == direction:
-                raise ValueError("This arc already exists.")
+        if (place.name, transition.name, direction) in self.arc_index:
+            raise ValueError("This arc already exists.")
 
         # on créé l'arc
         arc = Arc(place, transition, direction, weight)
-        self.arcs.append(arc)
+        self.index_arc(arc)
         return arc
+
+    # Enregistre un arc dans la liste et dans les index
+    def index_arc(self, arc):
+        self.arcs.append(arc)
+        self.arc_index[(arc.place.name, arc.transition.name, arc.direction)] = arc
+        self.place_arcs[arc.place.name].append(arc)
+        self.transition_arcs[arc.transition.name].append(arc)
     
     # Supprime un arc
     def delete_arc(self, place_name, transition_name, direction):
-        place = self.places.get(place_name)
-        transition = self.transitions.get(transition_name)
-        if not place or not transition: # safety
+        arc = self.arc_index.get((place_name, transition_name, direction))
+        if not arc: # safety
             return
-        
-        # Recrée la liste des arcs sans celui à supprimer
+        self.delete_many(arcs=[arc])
+
+    ## ---- Opérations groupées ---- ##
+    # Ajoute en une fois des places (nom, jetons initiaux[, ensemble de couleurs]), des transitions
+    # (nom, ou (nom, taux, immédiate, délai)) et des arcs (place, transition, direction, poids).
+    # Retourne les objets créés.
+    def add_many(self, places=(), transitions=(), arcs=()):
+        places = list(places) # parcourue deux fois : un générateur perdrait les jetons
+        new_places = [self.add_place(name) for name in (p[0] for p in places)]
+        for place, (_, tokens, *color_set) in zip(new_places, places):
+            place.initial_tokens = tokens
+            place.tokens = tokens
+            if color_set:
+                place.color_set = color_set[0]
+        new_transitions = []
+        for entry in transitions:
+            if isinstance(entry, str):
+                new_transitions.append(self.add_transition(entry))
+            else:
+                name, rate, immediate, delay = entry
+                transition = self.add_transition(name)
+                transition.rate, transition.immediate, transition.delay = rate, immediate, delay
+                new_transitions.append(transition)
+
         new_arcs = []
-        for arc in self.arcs:
-            if not (arc.place == place and arc.transition == transition and arc.direction == direction):
-                new_arcs.append(arc)
-        self.arcs = new_arcs
+        for place_name, transition_name, direction, weight in arcs:
+            if direction == 'place_to_transition':
+                new_arcs.append(self.add_arc(place_name, transition_name, weight))
+            else:
+                new_arcs.append(self.add_arc(transition_name, place_name, weight))
+        return new_places, new_transitions, new_arcs
+
+    # Supprime en une fois des places, des transitions et des arcs
+    # La liste des arcs n'est reconstruite qu'une seule fois
+    def delete_many(self, place_names=(), transition_names=(), arcs=()):
+        removed = {id(arc): arc for arc in arcs}
+        for name in place_names:
+            if self.places.pop(name, None):
+                removed.update((id(arc), arc) for arc in self.place_arcs.pop(name))
+        for name in transition_names:
+            if self.transitions.pop(name, None):
+                removed.update((id(arc), arc) for arc in self.transition_arcs.pop(name))
+        if not removed:
+            return
+
+        self.arcs = [arc for arc in self.arcs if id(arc) not in removed]
+
+        # on ne retouche que les listes des noeuds restants qui ont perdu un arc
+        touched_places = set()
+        touched_transitions = set()
+        for arc in removed.values():
+            self.arc_index.pop((arc.place.name, arc.transition.name, arc.direction), None)
+            touched_places.add(arc.place.name)
+            touched_transitions.add(arc.transition.name)
+        for name in touched_places:
+            if name in self.place_arcs:
+                self.place_arcs[name] = [a for a in self.place_arcs[name] if id(a) not in removed]
+        for name in touched_transitions:
+            if name in self.transition_arcs:
+                self.transition_arcs[name] = [a for a in self.transition_arcs[name] if id(a) not in removed]
 
     # ---- Méthodes d'analyse du réseau ---- ##
     # Donne les arcs entrants
     def get_arcs_entrants(self, transition):
-        arcs_entrants = []
-        for arc in self.arcs:
-            if arc.transition == transition and arc.direction == 'place_to_transition':
-                arcs_entrants.append(arc)
-        return arcs_entrants
+        return [arc for arc in self.transition_arcs[transition.name] if arc.direction == 'place_to_transition']
 
     # Donne les arcs sortants
     def get_arcs_sortants(self, transition):
-        arcs_sortants = []
-        for arc in self.arcs:
-            if arc.transition == transition and arc.direction == 'transition_to_place':
-                arcs_sortants.append(arc)
-        return arcs_sortants
+        return [arc for arc in self.transition_arcs[transition.name] if arc.direction == 'transition_to_place']
 
     # Retourne la liste des transitions tirables
     def get_enabled(self):
@@ -194,6 +241,33 @@ class PetriNet:
                 enabled.append(transition)
         return enabled
     
+    # Cherche une séquence de tirs (la plus courte) menant au marquage cible {place: jetons}
+    # Les places non citées sont libres ; voir logic/reachability.find_marking
+    def find_path(self, target, max_states=None, weight=1.0):
+        from logic.compiled import CompiledNet # import local : compiled dépend de ce module
+        from logic.reachability import find_marking
+        cn = CompiledNet(self)
+        for name in target:
+            if name not in cn.place_index:
+                raise ValueError(f"Unknown place '{name}'")
+        return find_marking(cn, {cn.place_index[n]: v for n, v in target.items()},
+                            max_states=max_states, weight=weight)
+
+    # Indique si le marquage cible est accessible depuis le marquage initial
+    def is_reachable(self, target, max_states=None):
+        return self.find_path(target, max_states=max_states).reachable
+
+    # Réseau réduit par les règles de logic/reduction.py, avec la correspondance vers ce réseau
+    # keep : places et transitions à conserver (celles citées par les propriétés à vérifier)
+    def reduce(self, keep=()):
+        from logic.reduction import reduce_net # import local : reduction dépend de ce module
+        return reduce_net(self, keep)
+
+    # Préfixe fini complet du dépliage (réseaux saufs), voir logic/unfolding.py
+    def unfold(self, max_events=None):
+        from logic.unfolding import unfold # import local : unfolding dépend de ce module
+        return unfold(self, max_events=max_events)
+
     # affichage debug pourle marquage actuel du réseau
     def display_marking(self):
         print("\n--- Marquage Actuel ---")
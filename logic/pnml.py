@@ -0,0 +1,188 @@
+# logic/pnml.py
+# Import / export PNML (format d'échange standard des outils de réseaux de Petri, P/T nets)
+# La lecture est incrémentale (iterparse) : chaque place, transition ou arc est traité à la
+# fermeture de sa balise puis détaché de l'arbre, la mémoire ne dépend donc pas de la taille du
+# fichier XML. Le réseau est construit par paquets avec PetriNet.add_many ; les positions sont
+# retournées à part pour ne créer les items de la scène que si l'interface en a besoin.
+# L'écriture produit le fichier au fil de l'eau, sans construire d'arbre XML.
+
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import quoteattr, escape
+from logic.petri_net import PetriNet, check_count
+
+PNML_NAMESPACE = "http://www.pnml.org/version-2009/grammar/pnml"
+PTNET_TYPE = "http://www.pnml.org/version-2009/grammar/ptnet"
+BATCH_SIZE = 5000 # éléments accumulés avant un appel à add_many
+NODE_TAGS = frozenset(("place", "transition", "arc"))
+
+
+def local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+# Cherche un enfant par nom local (les fichiers PNML ont un espace de noms, parfois aucun)
+def child(element, name):
+    for sub in element:
+        if local_name(sub.tag) == name:
+            return sub
+    return None
+
+
+# Texte d'un label PNML : <label><text>valeur</text></label>
+def label_text(element, name):
+    label = child(element, name)
+    if label is None:
+        return None
+    text = child(label, "text")
+    return text.text.strip() if text is not None and text.text else None
+
+
+# Entier d'un label (marquage initial, inscription d'arc), `default` si le label est absent
+def count_label(element, name, default, what, minimum=0):
+    text = label_text(element, name)
+    if text is None:
+        return default
+    try:
+        value = int(text)
+    except ValueError:
+        raise ValueError(f"Invalid {what}: {text!r}")
+    return check_count(value, what, minimum)
+
+
+def position(element):
+    graphics = child(element, "graphics")
+    pos = child(graphics, "position") if graphics is not None else None
+    if pos is None:
+        return None
+    return float(pos.get("x", 0)), float(pos.get("y", 0))
+
+
+# Lit un fichier PNML (chemin ou fichier ouvert) dans `net` (nouveau PetriNet si absent)
+# Retourne (net, positions) avec positions : nom -> (x, y) pour les noeuds qui en ont
+# Les noms PNML sont utilisés s'ils sont uniques, sinon l'identifiant de l'élément
+def read_pnml(source, net=None):
+    net = net if net is not None else PetriNet()
+    names = {} # identifiant PNML -> nom dans le réseau
+    kinds = {} # identifiant PNML -> "place" / "transition"
+    used = set(net.places) | set(net.transitions)
+    layout = {}
+    places, transitions, arcs, pending = [], [], [], []
+
+    def unique(element_id, name):
+        for candidate in (name, element_id):
+            if candidate and candidate not in used:
+                break
+        else:
+            suffix = 1
+            while f"{element_id}.{suffix}" in used:
+                suffix += 1
+            candidate = f"{element_id}.{suffix}"
+        used.add(candidate)
+        return candidate
+
+    def read_node(tag, element):
+        element_id = element.get("id")
+        if element_id is None:
+            raise ValueError(f"PNML {tag} without id")
+        if tag == "arc":
+            weight = count_label(element, "inscription", 1, f"weight of arc '{element_id}'", minimum=1)
+            pending.append((element.get("source"), element.get("target"), weight))
+            return
+        name = unique(element_id, label_text(element, "name"))
+        names[element_id] = name
+        kinds[element_id] = tag
+        pos = position(element)
+        if pos is not None:
+            layout[name] = pos
+        if tag == "place":
+            places.append((name, count_label(element, "initialMarking", 0, f"initial marking of place '{element_id}'")))
+        else:
+            transitions.append(name)
+
+    def flush(final=False):
+        if places or transitions:
+            net.add_many(places=places, transitions=transitions)
+            places.clear()
+            transitions.clear()
+        # un arc n'est ajouté que lorsque ses deux extrémités existent
+        ready = [a for a in pending if a[0] in names and a[1] in names]
+        waiting = [a for a in pending if not (a[0] in names and a[1] in names)]
+        for source_id, target_id, weight in ready:
+            if kinds[source_id] == kinds[target_id]:
+                raise ValueError(f"Arc between two {kinds[source_id]}s: {source_id} -> {target_id}")
+            if kinds[source_id] == "place":
+                arcs.append((names[source_id], names[target_id], "place_to_transition", weight))
+            else:
+                arcs.append((names[target_id], names[source_id], "transition_to_place", weight))
+        if final and waiting:
+            raise ValueError(f"Arc references unknown node: {waiting[0][0]} -> {waiting[0][1]}")
+        pending[:] = waiting
+        if arcs:
+            net.add_many(arcs=arcs)
+            arcs.clear()
+
+    count = 0
+    depth = 0 # > 0 à l'intérieur d'une place, transition ou arc
+    stack = [] # éléments ouverts, pour détacher de leur parent ceux déjà traités
+    tags = {} # balise complète -> nom local
+    for event, element in ET.iterparse(source, events=("start", "end")):
+        tag = tags.get(element.tag)
+        if tag is None:
+            tag = tags[element.tag] = local_name(element.tag)
+        if event == "start":
+            stack.append(element)
+            if tag in NODE_TAGS:
+                depth += 1
+            continue
+        stack.pop()
+        if tag in NODE_TAGS:
+            depth -= 1
+            read_node(tag, element)
+            count += 1
+            if count % BATCH_SIZE == 0:
+                flush()
+        if depth == 0 and stack:
+            stack[-1].remove(element)
+    flush(final=True)
+    return net, layout
+
+
+# Écrit le réseau en PNML (chemin ou fichier texte ouvert)
+# layout : nom -> (x, y), facultatif (les noeuds sans position n'ont pas de <graphics>)
+def write_pnml(target, net: PetriNet, layout=None, net_id="net"):
+    if hasattr(target, "write"):
+        _write(target, net, layout or {}, net_id)
+    else:
+        with open(target, "w", encoding="utf-8") as f:
+            _write(f, net, layout or {}, net_id)
+
+
+def _write(f, net, layout, net_id):
+    # identifiants XML : préfixes distincts, les noms restent dans <name>
+    place_ids = {name: f"p{i}" for i, name in enumerate(net.places)}
+    transition_ids = {name: f"t{i}" for i, name in enumerate(net.transitions)}
+
+    def graphics(name):
+        pos = layout.get(name)
+        if pos is None:
+            return ""
+        return f'<graphics><position x="{pos[0]:g}" y="{pos[1]:g}"/></graphics>'
+
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    f.write(f'<pnml xmlns="{PNML_NAMESPACE}">\n')
+    f.write(f'  <net id={quoteattr(net_id)} type="{PTNET_TYPE}">\n')
+    f.write('    <page id="page0">\n')
+    for name, place in net.places.items():
+        marking = (f"<initialMarking><text>{place.initial_tokens}</text></initialMarking>"
+                   if place.initial_tokens else "")
+        f.write(f'      <place id="{place_ids[name]}"><name><text>{escape(name)}</text></name>'
+                f'{graphics(name)}{marking}</place>\n')
+    for name in net.transitions:
+        f.write(f'      <transition id="{transition_ids[name]}"><name><text>{escape(name)}</text></name>'
+                f'{graphics(name)}</transition>\n')
+    for i, arc in enumerate(net.arcs):
+        p, t = place_ids[arc.place.name], transition_ids[arc.transition.name]
+        source, target = (p, t) if arc.direction == "place_to_transition" else (t, p)
+        inscription = f"<inscription><text>{arc.weight}</text></inscription>" if arc.weight != 1 else ""
+        f.write(f'      <arc id="a{i}" source="{source}" target="{target}">{inscription}</arc>\n')
+    f.write('    </page>\n  </net>\n</pnml>\n')
@@ -0,0 +1,863 @@
+# logic/reachability.py
+# Exploration compacte du graphe d'accessibilité sur la structure compilée
+# Les arcs du graphe sont stockés dans des tableaux d'entiers plutôt que dans networkx,
+# ce qui permet de traiter des centaines de milliers d'états.
+
+import heapq
+import math
+import time
+from array import array
+from collections import deque
+import numpy as np
+import scipy.sparse as sp
+from scipy.optimize import linprog
+from logic.compiled import CompiledNet
+
+
+# Graphe d'accessibilité : marquages numérotés dans l'ordre de découverte (BFS)
+class ReachabilityGraph:
+    def __init__(self, cn: CompiledNet):
+        self.cn = cn
+        self.markings = [] # id -> marquage
+        self.index = {} # marquage -> id
+        self.src = array('l')
+        self.dst = array('l')
+        self.trans = array('l')
+        self.deadlocks = []
+        self.complete = True # False si l'exploration a été interrompue par max_states
+
+    @property
+    def num_states(self):
+        return len(self.markings)
+
+    @property
+    def num_edges(self):
+        return len(self.src)
+
+    def add_state(self, m):
+        state_id = len(self.markings)
+        self.markings.append(m)
+        self.index[m] = state_id
+        return state_id
+
+    def add_edge(self, source_id, target_id, t):
+        self.src.append(source_id)
+        self.dst.append(target_id)
+        self.trans.append(t)
+
+    # Itère sur les arcs (source, cible, indice de transition)
+    def edges(self):
+        return zip(self.src, self.dst, self.trans)
+
+
+# Explore le graphe d'accessibilité depuis le marquage initial (ou `initial`)
+# enabled : fonction marquage -> transitions à considérer (par défaut toutes les tirables)
+# metrics : ExplorationMetrics optionnel (compteurs, temps par phase, hooks)
+def explore(cn: CompiledNet, initial=None, enabled=None, max_states=None, metrics=None):
+    graph = ReachabilityGraph(cn)
+    enabled = enabled or cn.enabled
+    delta = cn.delta
+
+    start = tuple(cn.initial if initial is None else initial)
+    graph.add_state(start)
+    queue = deque([start])
+    index = graph.index
+    if metrics is not None:
+        clock = time.perf_counter
+        metrics.on_start("explore", cn)
+        metrics.on_state(0, start)
+
+    while queue:
+        m = queue.popleft()
+        source_id = index[m]
+        if metrics is not None:
+            metrics.set_frontier(len(queue) + 1)
+            t0 = clock()
+            ts = enabled(m)
+            metrics.add_time("enabling", clock() - t0)
+            metrics.enabled_checks += cn.num_transitions
+        else:
+            ts = enabled(m)
+        if not ts:
+            graph.deadlocks.append(source_id)
+            if metrics is not None:
+                metrics.on_deadlock(source_id)
+        for t in ts:
+            if metrics is not None:
+                t0 = clock()
+            target = list(m)
+            for p, d in delta[t]:
+                target[p] += d
+            target = tuple(target)
+            if metrics is not None:
+                t1 = clock()
+                metrics.add_time("firing", t1 - t0)
+            target_id = index.get(target)
+            if target_id is None:
+                if max_states is not None and graph.num_states >= max_states:
+                    graph.complete = False
+                    continue
+                target_id = graph.add_state(target)
+                queue.append(target)
+                if metrics is not None:
+                    metrics.add_time("hashing", clock() - t1)
+                    metrics.on_state(target_id, target)
+            elif metrics is not None:
+                metrics.add_time("hashing", clock() - t1)
+            graph.add_edge(source_id, target_id, t)
+            if metrics is not None:
+                metrics.on_edge(source_id, target_id, t)
+    if metrics is not None:
+        metrics.set_frontier(0)
+        metrics.on_finish()
+    return graph
+
+## ---- Exploration par paquets (NumPy) ---- ##
+# BFS dont la frontière est un tableau 2-D (un marquage par ligne), traitée par paquets :
+#   - activation de toutes les transitions pour tout le paquet en une opération, à partir des
+#     pré-conditions rangées en tableau (transitions x arcs d'entrée, complété par une colonne
+#     fictive toujours nulle) ;
+#   - successeurs par une seule addition vectorisée des effets (delta) des transitions tirées ;
+#   - dédoublonnage en bloc : chaque marquage est compacté en clé (KeyPacker), les clés du paquet
+#     sont triées puis cherchées par dichotomie parmi les marquages déjà vus, rangés en tableaux
+#     triés fusionnés par tailles doublantes.
+# Numéros d'états, ordre des arcs et blocages sont identiques à ceux de explore.
+BATCH_ELEMENTS = 1 << 22 # taille visée des tableaux intermédiaires d'un paquet
+
+
+# Graphe produit par explore_batched : même interface que ReachabilityGraph (lecture seule),
+# marquages dans un tableau (états x places) ; liste de tuples et index construits à la demande
+class ArrayGraph(ReachabilityGraph):
+    def __init__(self, cn: CompiledNet, states, src, dst, trans, deadlocks, complete):
+        self.cn = cn
+        self.states = states
+        self.src = src
+        self.dst = dst
+        self.trans = trans
+        self.deadlocks = deadlocks
+        self.complete = complete
+        self._markings = None
+        self._index = None
+
+    @property
+    def markings(self):
+        if self._markings is None:
+            self._markings = [tuple(m) for m in self.states.tolist()]
+        return self._markings
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = {m: i for i, m in enumerate(self.markings)}
+        return self._index
+
+    @property
+    def num_states(self):
+        return len(self.states)
+
+    def edges(self):
+        return zip(self.src.tolist(), self.dst.tolist(), self.trans.tolist())
+
+
+# Ensemble de marquages vus : tableaux de clés triées (avec leurs numéros d'états)
+class SortedRuns:
+    def __init__(self):
+        self.runs = []
+
+    def lookup(self, keys):
+        ids = np.full(len(keys), -1, dtype=np.int64)
+        for run_keys, run_ids in self.runs:
+            pos = np.minimum(np.searchsorted(run_keys, keys), len(run_keys) - 1)
+            hit = run_keys[pos] == keys
+            ids[hit] = run_ids[pos[hit]]
+        return ids
+
+    # keys : clés triées, absentes de l'ensemble et sans doublons
+    def add(self, keys, ids):
+        if not len(keys):
+            return
+        self.runs.append((keys, ids))
+        # fusion tant que le tableau précédent n'est pas au moins deux fois plus grand
+        while len(self.runs) > 1 and len(self.runs[-2][0]) <= 2 * len(self.runs[-1][0]):
+            (k2, i2), (k1, i1) = self.runs.pop(), self.runs.pop()
+            pos = np.searchsorted(k1, k2) + np.arange(len(k2))
+            rest = np.ones(len(k1) + len(k2), dtype=bool)
+            rest[pos] = False
+            keys, ids = np.empty(len(rest), dtype=k1.dtype), np.empty(len(rest), dtype=np.int64)
+            keys[pos], keys[rest] = k2, k1
+            ids[pos], ids[rest] = i2, i1
+            self.runs.append((keys, ids))
+
+
+# Compactage des marquages en clés : chaque place reçoit le nombre de bits de son plus grand
+# nombre de jetons vu (au moins 1), les places sont rangées dans des mots de 64 bits.
+# Un seul mot donne des clés uint64 (tri numérique rapide), sinon les mots forment une clé np.void.
+class KeyPacker:
+    def __init__(self, widths):
+        self.widths = [max(1, min(63, w)) for w in widths]
+        self.words = []
+        places, shift = [], 0
+        for p, w in enumerate(self.widths):
+            if shift + w > 64:
+                self.words.append(places)
+                places, shift = [], 0
+            places.append((p, shift))
+            shift += w
+        self.words.append(places)
+        # les places d'un mot sont consécutives : tranche de colonnes et multiplicateurs 2**décalage
+        self.words = [(word[0][0], word[-1][0] + 1, np.array([1 << s for _, s in word], dtype=np.uint64))
+                      for word in self.words]
+
+    # None si les jetons tiennent dans les largeurs, sinon les largeurs nécessaires (doublées)
+    def wider(self, rows):
+        needed = [int(v).bit_length() for v in rows.max(axis=0)]
+        if all(n <= w for n, w in zip(needed, self.widths)):
+            return None
+        return [max(w, 2 * w if n > w else w, n) for n, w in zip(needed, self.widths)]
+
+    def keys(self, rows):
+        packed = np.empty((len(rows), len(self.words)), dtype=np.uint64)
+        unsigned = rows.view(np.uint64) # jetons positifs : même représentation
+        for i, (first, stop, multipliers) in enumerate(self.words):
+            packed[:, i] = unsigned[:, first:stop] @ multipliers
+        if len(self.words) == 1:
+            return packed[:, 0]
+        return packed.view(np.dtype((np.void, 8 * len(self.words)))).ravel()
+
+
+# Regroupe des clés : (clés distinctes triées, indice de première apparition, inverse)
+def group_keys(keys):
+    order = np.argsort(keys)
+    ordered = keys[order]
+    boundary = np.ones(len(keys), dtype=bool)
+    boundary[1:] = ordered[1:] != ordered[:-1]
+    starts = np.flatnonzero(boundary)
+    inverse = np.empty(len(keys), dtype=np.intp)
+    inverse[order] = np.cumsum(boundary) - 1
+    return ordered[starts], np.minimum.reduceat(order, starts), inverse
+
+
+# BFS par paquets ; mêmes paramètres et même résultat que explore (ArrayGraph)
+# metrics : les hooks sont appelés paquet par paquet (états, puis arcs, puis blocages)
+def explore_batched(cn: CompiledNet, initial=None, max_states=None, metrics=None):
+    P, T = cn.num_places, cn.num_transitions
+    if not P or not T:
+        return explore(cn, initial=initial, max_states=max_states, metrics=metrics)
+    # colonne P fictive : toujours 0, visée par les arcs de remplissage (poids 0, effet 0)
+    K = max(1, max(len(arcs) for arcs in cn.pre))
+    D = max(1, max(len(arcs) for arcs in cn.delta))
+    pre_p = np.full((T, K), P, dtype=np.intp)
+    pre_w = np.zeros((T, K), dtype=np.int64)
+    delta_p = np.full((T, D), P, dtype=np.intp)
+    delta_d = np.zeros((T, D), dtype=np.int64)
+    for t in range(T):
+        for k, (p, w) in enumerate(cn.pre[t]):
+            pre_p[t, k], pre_w[t, k] = p, w
+        for k, (p, d) in enumerate(cn.delta[t]):
+            delta_p[t, k], delta_d[t, k] = p, d
+
+    start = np.zeros((1, P + 1), dtype=np.int64)
+    start[0, :P] = cn.initial if initial is None else initial
+    packer = KeyPacker([int(v).bit_length() for v in start[0, :P]])
+    seen = SortedRuns()
+    seen.add(packer.keys(start[:, :P]), np.zeros(1, dtype=np.int64))
+    states = [start[:, :P]]
+    src, dst, trans, deadlocks = [], [], [], []
+    num_states = 1
+    complete = True
+    degree = float(T) # successeurs par marquage, estimé sur le paquet précédent
+    if metrics is not None:
+        clock = time.perf_counter
+        metrics.on_start("explore_batched", cn)
+        metrics.on_state(0, tuple(int(v) for v in start[0, :P]))
+
+    frontier, frontier_ids = start, np.zeros(1, dtype=np.int64)
+    while len(frontier):
+        next_rows, next_ids = [], []
+        begin = 0
+        while begin < len(frontier):
+            size = max(1, int(BATCH_ELEMENTS // max(T * K, degree * (P + 1), 1)))
+            rows, ids = frontier[begin:begin + size], frontier_ids[begin:begin + size]
+            begin += len(rows)
+            if metrics is not None:
+                metrics.set_frontier(len(frontier) - begin + len(rows) + sum(len(r) for r in next_rows))
+                t0 = clock()
+            enabled = (rows[:, pre_p] >= pre_w).all(axis=2)
+            source, t_idx = np.nonzero(enabled)
+            dead = ids[~enabled.any(axis=1)]
+            if metrics is not None:
+                t1 = clock()
+                metrics.add_time("enabling", t1 - t0)
+                metrics.enabled_checks += len(rows) * T
+            succ = rows[source]
+            succ[np.arange(len(succ))[:, None], delta_p[t_idx]] += delta_d[t_idx]
+            degree = max(1.0, len(succ) / len(rows))
+            if metrics is not None:
+                t2 = clock()
+                metrics.add_time("firing", t2 - t1)
+
+            if len(succ):
+                widths = packer.wider(succ[:, :P])
+                if widths is not None:
+                    # une place dépasse sa largeur : toutes les clés sont refaites plus larges
+                    packer = KeyPacker(widths)
+                    seen = SortedRuns()
+                    keys = packer.keys(np.concatenate(states))
+                    order = np.argsort(keys)
+                    seen.add(keys[order], order.astype(np.int64))
+                keys = packer.keys(succ[:, :P])
+                unique, first, inverse = group_keys(keys)
+                found = seen.lookup(unique)
+                # nouveaux marquages numérotés dans l'ordre de leur première apparition
+                new = np.flatnonzero(found < 0)
+                new = new[np.argsort(first[new], kind="stable")]
+                if max_states is not None and num_states + len(new) > max_states:
+                    complete = False
+                    new = new[:max(0, max_states - num_states)]
+                found[new] = np.arange(num_states, num_states + len(new))
+                ordered = np.sort(new) # les clés distinctes sont triées : on garde cet ordre
+                seen.add(unique[ordered], found[ordered])
+                new_rows = succ[first[new]]
+                targets = found[inverse]
+                kept = targets >= 0
+                edge_src, edge_dst, edge_t = ids[source][kept], targets[kept], t_idx[kept]
+                src.append(edge_src)
+                dst.append(edge_dst)
+                trans.append(edge_t)
+                if len(new):
+                    states.append(new_rows[:, :P])
+                    next_rows.append(new_rows)
+                    next_ids.append(found[new])
+                if metrics is not None:
+                    metrics.add_time("hashing", clock() - t2)
+                    for state_id, m in zip(range(num_states, num_states + len(new)), new_rows[:, :P].tolist()):
+                        metrics.on_state(state_id, tuple(m))
+                    for s, d, t in zip(edge_src.tolist(), edge_dst.tolist(), edge_t.tolist()):
+                        metrics.on_edge(s, d, t)
+                num_states += len(new)
+            deadlocks.extend(dead.tolist())
+            if metrics is not None:
+                for state_id in dead.tolist():
+                    metrics.on_deadlock(state_id)
+        if next_rows:
+            frontier, frontier_ids = np.concatenate(next_rows), np.concatenate(next_ids)
+        else:
+            frontier = frontier[:0]
+
+    empty = np.zeros(0, dtype=np.int64)
+    graph = ArrayGraph(cn, np.concatenate(states), np.concatenate(src) if src else empty,
+                       np.concatenate(dst) if dst else empty, np.concatenate(trans).astype(np.int64) if trans else empty,
+                       deadlocks, complete)
+    if metrics is not None:
+        metrics.set_frontier(0)
+        metrics.on_finish()
+    return graph
+
+
+## ---- Recherche de blocages ---- ##
+# Un blocage trouvé : marquage mort et plus courte séquence de tirs depuis le marquage initial
+class Deadlock:
+    def __init__(self, marking, trace):
+        self.marking = marking # nom de place -> jetons
+        self.trace = trace # noms des transitions
+
+    def __repr__(self):
+        return f"Deadlock({self.marking}, trace={self.trace})"
+
+
+# BFS qui s'arrête dès que `limit` marquages morts sont trouvés (tous si limit=None)
+# Les prédécesseurs sont gardés dans deux tableaux d'entiers (état parent, transition)
+# indexés par numéro d'état : pas de graphe, et le BFS garantit des traces minimales.
+# Retourne (blocages, nombre d'états visités, exploration complète ou non)
+def find_deadlocks(cn: CompiledNet, limit=1, initial=None, max_states=None, metrics=None):
+    start = tuple(cn.initial if initial is None else initial)
+    markings = [start]
+    index = {start: 0}
+    parent = array('l', [-1])
+    via = array('l', [-1])
+    delta = cn.delta
+    found = []
+    complete = True
+    head = 0
+    if metrics is not None:
+        clock = time.perf_counter
+        metrics.on_start("find_deadlocks", cn)
+        metrics.on_state(0, start)
+
+    while head < len(markings):
+        m = markings[head]
+        if metrics is not None:
+            metrics.set_frontier(len(markings) - head)
+            t0 = clock()
+            ts = cn.enabled(m)
+            metrics.add_time("enabling", clock() - t0)
+            metrics.enabled_checks += cn.num_transitions
+        else:
+            ts = cn.enabled(m)
+        if not ts:
+            if metrics is not None:
+                metrics.on_deadlock(head)
+            trace = []
+            state = head
+            while parent[state] >= 0:
+                trace.append(cn.transition_names[via[state]])
+                state = parent[state]
+            trace.reverse()
+            found.append(Deadlock(cn.marking_dict(m), trace))
+            if limit is not None and len(found) >= limit:
+                if metrics is not None:
+                    metrics.on_finish()
+                return found, len(markings), False
+        for t in ts:
+            if metrics is not None:
+                t0 = clock()
+            target = list(m)
+            for p, d in delta[t]:
+                target[p] += d
+            target = tuple(target)
+            if metrics is not None:
+                t1 = clock()
+                metrics.add_time("firing", t1 - t0)
+            target_id = index.get(target)
+            if target_id is None:
+                if max_states is not None and len(markings) >= max_states:
+                    complete = False
+                    continue
+                target_id = len(markings)
+                index[target] = target_id
+                markings.append(target)
+                parent.append(head)
+                via.append(t)
+                if metrics is not None:
+                    metrics.add_time("hashing", clock() - t1)
+                    metrics.on_state(target_id, target)
+            elif metrics is not None:
+                metrics.add_time("hashing", clock() - t1)
+            if metrics is not None:
+                metrics.on_edge(head, target_id, t)
+        head += 1
+    if metrics is not None:
+        metrics.on_finish()
+    return found, len(markings), complete
+
+
+## ---- Exploration par balayage (sweep-line) ---- ##
+# Résultat : nombre d'états et d'arcs, marquages morts (nom -> jetons), pic d'états gardés
+class SweepResult:
+    def __init__(self):
+        self.num_states = 0
+        self.num_edges = 0
+        self.deadlocks = []
+        self.peak_states = 0 # plus grand nombre de marquages gardés en mémoire en même temps
+        self.sweeps = 0
+        self.regressions = 0 # arcs qui font reculer la mesure de progression
+        self.complete = True
+
+    # Sans régression, chaque état n'est compté qu'une fois ; sinon num_states est un majorant
+    @property
+    def exact(self):
+        return self.regressions == 0
+
+    def __repr__(self):
+        return (f"SweepResult(states={self.num_states}, deadlocks={len(self.deadlocks)}, "
+                f"peak={self.peak_states}, sweeps={self.sweeps}, regressions={self.regressions})")
+
+
+# Mesure de progression linéaire : somme des jetons pondérés {nom de place: coefficient}
+def linear_progress(cn: CompiledNet, weights):
+    terms = [(cn.place_index[name], c) for name, c in weights.items()]
+    return lambda m: sum(m[p] * c for p, c in terms)
+
+
+# Explore par ordre de progression croissante (progress : marquage -> nombre, ou dict de
+# coefficients de places). Les marquages d'une valeur de progression déjà dépassée ne peuvent
+# plus être atteints si la mesure ne recule jamais : ils sont oubliés, la mémoire est celle des
+# couches en cours. Un arc qui fait reculer la mesure (régression) garde sa cible à part et
+# celle-ci démarre un nouveau balayage une fois le précédent terminé (balayage généralisé).
+def sweep_line(cn: CompiledNet, progress, initial=None, max_states=None, metrics=None):
+    delta = cn.delta
+    increments = None # progression linéaire : accroissement constant par transition
+    if isinstance(progress, dict):
+        weights = {cn.place_index[name]: c for name, c in progress.items()}
+        increments = [sum(weights.get(p, 0) * d for p, d in delta[t]) for t in range(cn.num_transitions)]
+        progress = linear_progress(cn, progress)
+    result = SweepResult()
+    start = tuple(cn.initial if initial is None else initial)
+    persistent = {start: 0} # cibles de régressions, gardées jusqu'à la fin
+    roots = [start]
+    next_id = 1
+    if metrics is not None:
+        metrics.on_start("sweep_line", cn)
+        metrics.on_state(0, start)
+
+    while roots:
+        result.sweeps += 1
+        layers = {} # progression -> {marquage: id} (traités ou à traiter)
+        pending = {} # progression -> marquages à traiter
+        heap = []
+        stored = 0
+        for m in roots:
+            value = progress(m)
+            if value not in layers:
+                layers[value], pending[value] = {}, []
+                heapq.heappush(heap, value)
+            if m not in layers[value]:
+                layers[value][m] = persistent[m]
+                pending[value].append(m)
+                stored += 1
+        roots = []
+
+        while heap:
+            value = heapq.heappop(heap)
+            layer, todo = layers[value], pending[value]
+            while todo:
+                m = todo.pop()
+                source_id = layer[m]
+                if metrics is not None:
+                    metrics.set_frontier(stored)
+                ts = cn.enabled(m)
+                if not ts:
+                    result.deadlocks.append(cn.marking_dict(m))
+                    if metrics is not None:
+                        metrics.on_deadlock(source_id)
+                for t in ts:
+                    target = list(m)
+                    for p, d in delta[t]:
+                        target[p] += d
+                    target = tuple(target)
+                    target_value = value + increments[t] if increments is not None else progress(target)
+                    if target_value < value:
+                        result.regressions += 1
+                        target_id = persistent.get(target)
+                        if target_id is None:
+                            target_id = persistent[target] = next_id
+                            next_id += 1
+                            roots.append(target)
+                            if metrics is not None:
+                                metrics.on_state(target_id, target)
+                    else:
+                        target_layer = layers.get(target_value)
+                        if target_layer is None:
+                            target_layer = layers[target_value] = {}
+                            pending[target_value] = []
+                            heapq.heappush(heap, target_value)
+                        target_id = target_layer.get(target)
+                        if target_id is None:
+                            if max_states is not None and next_id >= max_states:
+                                result.complete = False
+                                continue
+                            target_id = target_layer[target] = next_id
+                            next_id += 1
+                            pending[target_value].append(target)
+                            stored += 1
+                            result.peak_states = max(result.peak_states, stored + len(persistent))
+                            if metrics is not None:
+                                metrics.on_state(target_id, target)
+                    result.num_edges += 1
+                    if metrics is not None:
+                        metrics.on_edge(source_id, target_id, t)
+            # couche terminée : plus aucun marquage de cette progression ne peut être atteint
+            stored -= len(layer)
+            del layers[value], pending[value]
+
+    result.num_states = next_id
+    result.peak_states = max(result.peak_states, len(persistent))
+    if metrics is not None:
+        metrics.set_frontier(0)
+        metrics.on_finish()
+    return result
+
+
+## ---- Hachage par bits (supertrace) ---- ##
+# Recherche approchée à mémoire fixe : l'ensemble des marquages vus est un tableau de bits où
+# chaque marquage met à 1 `hashes` bits (double hachage, façon filtre de Bloom). Une collision
+# fait prendre un marquage nouveau pour déjà vu : une partie de l'espace peut être omise,
+# jamais l'inverse (tout blocage rapporté est réel).
+# Les marquages sont traités par paquets NumPy (successeurs, hachage et test des bits
+# vectorisés) ; les paquets sont pris dans une pile, la recherche reste donc en profondeur.
+BITSTATE_CHUNK = 4096 # marquages par paquet
+SPLITMIX = (np.uint64(0xBF58476D1CE4E5B9), np.uint64(0x94D049BB133111EB))
+
+
+class BitstateResult:
+    def __init__(self, memory, hashes):
+        self.memory = memory # octets du tableau de bits
+        self.hashes = hashes
+        self.num_states = 0
+        self.num_edges = 0
+        self.deadlocks = [] # Deadlock (trace None si elle n'a pas été retrouvée)
+        self.max_depth = 0
+        self.truncated = False # profondeur limitée par max_depth
+        self.complete = True # False si la recherche s'est arrêtée sur `limit` blocages
+        self.bits_set = 0
+        self.omission_sum = 0.0 # somme, sur les arcs parcourus, de la probabilité de collision
+
+    @property
+    def fill_ratio(self):
+        return self.bits_set / (self.memory * 8)
+
+    # Bits disponibles par état visité ; au-delà de 100 la couverture est en pratique complète
+    @property
+    def hash_factor(self):
+        return self.memory * 8 / max(1, self.num_states)
+
+    # Probabilité qu'un marquage nouveau soit pris pour déjà vu, en fin de recherche
+    @property
+    def omission_probability(self):
+        return self.fill_ratio ** self.hashes
+
+    # Part estimée des marquages accessibles réellement visités : chaque arc menant à un
+    # marquage nouveau le perd avec la probabilité de collision du moment, en moyenne sur les arcs
+    @property
+    def estimated_coverage(self):
+        if not self.num_edges:
+            return 1.0
+        return max(0.0, 1.0 - self.omission_sum / self.num_edges)
+
+    def __repr__(self):
+        return (f"BitstateResult(states={self.num_states}, deadlocks={len(self.deadlocks)}, "
+                f"coverage~{self.estimated_coverage:.4f}, fill={self.fill_ratio:.4f})")
+
+
+# Mélange final de splitmix64, appliqué à un vecteur uint64
+def mix64(h):
+    h = (h ^ (h >> np.uint64(30))) * SPLITMIX[0]
+    h = (h ^ (h >> np.uint64(27))) * SPLITMIX[1]
+    return h ^ (h >> np.uint64(31))
+
+
+# Recherche par hachage de bits avec un tableau de `memory` octets (arrondi à une puissance de 2)
+# limit : nombre de blocages après lequel s'arrêter (None : tous)
+# max_depth : profondeur maximale (en paquets de successeurs, c'est-à-dire en nombre de tirs)
+# traces : retrouve ensuite la trace de chaque blocage par find_marking (au plus trace_states états)
+def bitstate_search(cn: CompiledNet, memory=64 * 2**20, hashes=3, limit=None, max_depth=None,
+                    initial=None, traces=True, trace_states=100_000, metrics=None):
+    if memory < 1 or hashes < 1:
+        raise ValueError("memory and hashes must be positive")
+    num_bits = 1 << int(math.log2(memory * 8))
+    bit_mask = np.uint64(num_bits - 1)
+    bits = np.zeros(num_bits // 8, dtype=np.uint8)
+    result = BitstateResult(num_bits // 8, hashes)
+    num_places = cn.num_places
+    rng = np.random.default_rng(0x5EED)
+    coefs = rng.integers(1, 2**63, size=(num_places, 2), dtype=np.int64).astype(np.uint64) | np.uint64(1)
+    transitions = [(t, np.array([p for p, _ in cn.pre[t]], dtype=np.intp),
+                    np.array([w for _, w in cn.pre[t]], dtype=np.int64),
+                    np.array([p for p, _ in cn.delta[t]], dtype=np.intp),
+                    np.array([d for _, d in cn.delta[t]], dtype=np.int64))
+                   for t in range(cn.num_transitions)]
+    offsets = np.arange(hashes, dtype=np.uint64)
+    found = [] # marquages morts (tuples)
+    collision = 0.0
+
+    # positions des bits de chaque marquage : (lignes, hashes)
+    def positions(rows):
+        h = rows.astype(np.uint64) @ coefs if num_places else np.zeros((len(rows), 2), dtype=np.uint64)
+        h1, h2 = mix64(h[:, 0]), mix64(h[:, 1]) | np.uint64(1)
+        return (h1[:, None] + h2[:, None] * offsets[None, :]) & bit_mask
+
+    # insère les marquages dont un bit au moins était à 0 ; retourne leurs indices
+    def insert(rows):
+        nonlocal collision
+        pos = positions(rows)
+        byte, bit = (pos >> np.uint64(3)).astype(np.intp), (np.uint8(1) << (pos & np.uint64(7)).astype(np.uint8))
+        new = ((bits[byte] & bit) == 0).any(axis=1)
+        # doublons dans le paquet : mêmes positions, on ne garde que la première occurrence
+        _, first = np.unique(pos[:, 0] ^ (pos[:, -1] << np.uint64(1)), return_index=True)
+        keep = np.zeros(len(rows), dtype=bool)
+        keep[first] = True
+        new &= keep
+        flat = pos[new].ravel()
+        if len(flat):
+            flat = np.unique(flat)
+            fb, fbit = (flat >> np.uint64(3)).astype(np.intp), np.uint8(1) << (flat & np.uint64(7)).astype(np.uint8)
+            result.bits_set += int(((bits[fb] & fbit) == 0).sum())
+            np.bitwise_or.at(bits, fb, fbit)
+            collision = (result.bits_set / num_bits) ** hashes
+        return np.flatnonzero(new)
+
+    start = np.array([cn.initial if initial is None else initial], dtype=np.int64)
+    insert(start)
+    result.num_states = 1
+    if metrics is not None:
+        metrics.on_start("bitstate", cn)
+        metrics.on_state(0, tuple(start[0]))
+    stack = [(start, np.zeros(1, dtype=np.int64), 0)] # (paquet de marquages, numéros des états, profondeur)
+    stop = False
+
+    while stack and not stop:
+        chunk, ids, depth = stack.pop()
+        if metrics is not None:
+            metrics.set_frontier(sum(len(c) for c, _, _ in stack) + len(chunk))
+        successors = []
+        any_enabled = np.zeros(len(chunk), dtype=bool)
+        for t, pre_p, pre_w, delta_p, delta_d in transitions:
+            enabled = (chunk[:, pre_p] >= pre_w).all(axis=1) if len(pre_p) else np.ones(len(chunk), dtype=bool)
+            if not enabled.any():
+                continue
+            any_enabled |= enabled
+            rows = chunk[enabled]
+            rows[:, delta_p] += delta_d
+            successors.append(rows)
+
+        for row, state_id in zip(chunk[~any_enabled], ids[~any_enabled]):
+            found.append(tuple(int(v) for v in row))
+            if metrics is not None:
+                metrics.on_deadlock(int(state_id)) # numéro donné à l'état par on_state
+            if limit is not None and len(found) >= limit:
+                stop = True
+                break
+        if stop or not successors:
+            continue
+        if max_depth is not None and depth >= max_depth:
+            result.truncated = True
+            continue
+
+        targets = np.concatenate(successors)
+        result.num_edges += len(targets)
+        before = collision
+        new_rows = targets[insert(targets)]
+        result.omission_sum += (before + collision) / 2 * len(targets) # le paquet remplit le tableau
+        if not len(new_rows):
+            continue
+        new_ids = np.arange(result.num_states, result.num_states + len(new_rows), dtype=np.int64)
+        if metrics is not None:
+            for state_id, row in zip(new_ids, new_rows):
+                metrics.on_state(int(state_id), tuple(row))
+        result.num_states += len(new_rows)
+        result.max_depth = max(result.max_depth, depth + 1)
+        # le dernier paquet empilé est exploré en premier (profondeur d'abord)
+        for begin in reversed(range(0, len(new_rows), BITSTATE_CHUNK)):
+            stack.append((new_rows[begin:begin + BITSTATE_CHUNK], new_ids[begin:begin + BITSTATE_CHUNK], depth + 1))
+
+    result.complete = not stop
+    for m in found:
+        trace = None
+        if traces:
+            search = find_marking(cn, dict(enumerate(m)), initial=initial, max_states=trace_states)
+            trace = search.trace
+        result.deadlocks.append(Deadlock(cn.marking_dict(m), trace))
+    if metrics is not None:
+        metrics.set_frontier(0)
+        metrics.on_finish()
+    return result
+
+
+## ---- Recherche guidée d'un marquage cible ---- ##
+# Résultat : reachable vaut True, False, ou None si la limite d'exploration est atteinte
+class SearchResult:
+    def __init__(self, reachable, trace, states_explored, lp_solves, reason):
+        self.reachable = reachable
+        self.trace = trace # noms des transitions à tirer depuis le marquage initial
+        self.states_explored = states_explored
+        self.lp_solves = lp_solves
+        self.reason = reason
+
+    def __repr__(self):
+        return f"SearchResult(reachable={self.reachable}, trace={self.trace}, states={self.states_explored}, reason={self.reason!r})"
+
+
+# Équation d'état M' = M + C.x relâchée en continu : min somme(x), x >= 0
+# Les places absentes de la cible sont libres mais doivent rester positives (M + C.x >= 0)
+# Si le programme linéaire n'a pas de solution, la cible est inaccessible depuis M
+class StateEquation:
+    def __init__(self, cn: CompiledNet, target):
+        rows, cols, values = [], [], []
+        for t, changes in enumerate(cn.delta):
+            for p, d in changes:
+                rows.append(p)
+                cols.append(t)
+                values.append(d)
+        C = sp.csr_matrix((values, (rows, cols)), shape=(cn.num_places, cn.num_transitions))
+        self.fixed = np.array(sorted(target), dtype=np.int64)
+        self.free = np.array([p for p in range(cn.num_places) if p not in target], dtype=np.int64)
+        self.goal = np.array([target[p] for p in self.fixed], dtype=float)
+        self.A_eq = C[self.fixed] if len(self.fixed) else None
+        self.A_ub = -C[self.free] if len(self.free) else None
+        self.cost = np.ones(cn.num_transitions)
+        self.solves = 0
+
+    # Retourne (borne inférieure du nombre de tirs, vecteur de tirs x) ou None si infaisable
+    def solve(self, m):
+        self.solves += 1
+        m = np.asarray(m, dtype=float)
+        result = linprog(
+            self.cost,
+            A_ub=self.A_ub, b_ub=m[self.free] if self.A_ub is not None else None,
+            A_eq=self.A_eq, b_eq=self.goal - m[self.fixed] if self.A_eq is not None else None,
+            bounds=(0, None), method="highs",
+        )
+        if result.status != 0:
+            return None
+        return max(0, math.ceil(result.fun - 1e-9)), result.x
+
+
+# Recherche A* du marquage cible (dictionnaire indice de place -> jetons, partiel autorisé)
+# Heuristique : solution de l'équation d'état, admissible et cohérente, donc le chemin trouvé
+# est le plus court. Après le tir de t avec x[t] >= 1, x - e_t reste optimal pour le successeur :
+# le programme linéaire n'est résolu à nouveau que lorsque l'estimation héritée est utilisée.
+# weight > 1 donne un A* pondéré, plus rapide mais seulement quasi optimal (au plus weight fois)
+def find_marking(cn: CompiledNet, target, initial=None, max_states=None, weight=1.0):
+    equation = StateEquation(cn, target)
+    fixed = tuple(target.items())
+    start = tuple(cn.initial if initial is None else initial)
+
+    def matches(m):
+        return all(m[p] == v for p, v in fixed)
+
+    first = equation.solve(start)
+    if first is None:
+        return SearchResult(False, None, 0, equation.solves, "state equation has no non-negative solution")
+
+    heuristic = {start: (first[0], first[1], True)} # marquage -> (h, x, exact)
+    best = {start: 0}
+    parents = {start: None}
+    closed = set()
+    heap = [(weight * first[0], 0, 0, start)]
+    seq = 0
+
+    while heap:
+        f, neg_g, _, m = heapq.heappop(heap)
+        g = -neg_g
+        if m in closed or g > best[m]:
+            continue
+        if matches(m):
+            trace = []
+            while parents[m] is not None:
+                m, t = parents[m]
+                trace.append(cn.transition_names[t])
+            trace.reverse()
+            return SearchResult(True, trace, len(closed), equation.solves, "target reached")
+
+        h, x, exact = heuristic[m]
+        if not exact:
+            solution = equation.solve(m)
+            if solution is None: # aucune suite de tirs ne mène à la cible : on élague
+                closed.add(m)
+                continue
+            h, x = solution
+            heuristic[m] = (h, x, True)
+            if g + weight * h > f + 1e-9:
+                seq += 1
+                heapq.heappush(heap, (g + weight * h, neg_g, seq, m))
+                continue
+
+        if max_states is not None and len(closed) >= max_states:
+            return SearchResult(None, None, len(closed), equation.solves, f"limit of {max_states} states reached")
+        closed.add(m)
+        for t in cn.enabled(m):
+            target_m = cn.fire(m, t)
+            if target_m in closed or g + 1 >= best.get(target_m, math.inf):
+                continue
+            best[target_m] = g + 1
+            parents[target_m] = (m, t)
+            if x[t] >= 1 - 1e-9:
+                x_next = x.copy()
+                x_next[t] -= 1
+                heuristic[target_m] = (max(0, h - 1), x_next, True)
+            else:
+                heuristic[target_m] = (max(0, h - 1), None, False)
+            seq += 1
+            heapq.heappush(heap, (g + 1 + weight * heuristic[target_m][0], -(g + 1), seq, target_m))
+
+    return SearchResult(False, None, len(closed), equation.solves, "state space exhausted")
@@ -0,0 +1,220 @@
+# logic/reduction.py
+# Réduction d'un réseau avant exploration (règles classiques de Berthelot / Murata)
+# Règles appliquées jusqu'à point fixe :
+#   - fusion de transitions en série : p n'a qu'un producteur t1 et qu'un consommateur t2,
+#     t2 ne dépend que de p ; t2 est tiré aussitôt après t1 (t1 reçoit les sorties de t2) ;
+#   - fusion de places en série : t ne fait que déplacer un jeton de p vers q et est le seul
+#     consommateur de p ; les producteurs de p produisent directement dans q ;
+#   - places implicites : place sans consommateur, place en boucle (rendue à chaque tir et
+#     toujours suffisante) ou place doublon d'une autre (mêmes arcs, au moins autant de jetons) ;
+#   - transitions identiques : mêmes entrées et sorties, une seule est gardée.
+# Les places et transitions citées dans `keep` (propriétés à vérifier) ne sont jamais supprimées,
+# et leurs marquages ne sont pas modifiés : les marquages accessibles restreints à ces places,
+# les blocages et les transitions tirables sont conservés. Les opérateurs « état suivant »
+# (AX, EX, X) ne le sont pas, ni les bornes des places supprimées ni la sémantique temporisée.
+# Chaque transition du réseau réduit correspond à une séquence de transitions d'origine :
+# les traces trouvées sur le réseau réduit sont dépliées puis rejouées sur le réseau d'origine.
+
+from logic.petri_net import PetriNet
+from logic.compiled import CompiledNet
+from logic.reachability import Deadlock
+
+RULES = ("series_transitions", "series_places", "implicit_places", "identical_transitions")
+
+
+class Reduction:
+    def __init__(self, original, net, expansion, covers, prefix, rules):
+        self.original = original
+        self.net = net # réseau réduit
+        self.expansion = expansion # transition réduite -> séquence de transitions d'origine
+        self.covers = covers # transition réduite -> transitions d'origine qu'elle représente
+        self.prefix = prefix # tirs d'origine menant au marquage initial du réseau réduit
+        self.rules = rules # règle -> nombre d'applications
+
+    @property
+    def removed_places(self):
+        return [name for name in self.original.places if name not in self.net.places]
+
+    @property
+    def removed_transitions(self):
+        return [name for name in self.original.transitions if name not in self.net.transitions]
+
+    # Trace du réseau réduit -> trace du réseau d'origine
+    def expand_trace(self, trace):
+        expanded = list(self.prefix)
+        for name in trace:
+            expanded += self.expansion[name]
+        return expanded
+
+    # Marquage d'origine (nom -> jetons) atteint par une trace d'origine
+    def original_marking(self, original_trace):
+        cn = CompiledNet(self.original)
+        m = cn.initial
+        for name in original_trace:
+            t = cn.transition_index[name]
+            if not cn.is_enabled(m, t):
+                raise RuntimeError(f"Expanded trace is not firable at '{name}'")
+            m = cn.fire(m, t)
+        return cn.marking_dict(m)
+
+    # Blocage trouvé sur le réseau réduit -> blocage du réseau d'origine
+    def lift_deadlock(self, deadlock: Deadlock):
+        trace = self.expand_trace(deadlock.trace)
+        return Deadlock(self.original_marking(trace), trace)
+
+    # Transitions d'origine tirables, connaissant les transitions réduites tirées
+    def covered_transitions(self, fired):
+        covered = set(self.prefix)
+        for name in fired:
+            covered |= self.covers[name]
+        return covered
+
+    def summary(self):
+        done = ", ".join(f"{rule} : {n}" for rule, n in self.rules.items() if n)
+        return (f"{len(self.net.places)}/{len(self.original.places)} places, "
+                f"{len(self.net.transitions)}/{len(self.original.transitions)} transitions"
+                + (f" ({done})" if done else ""))
+
+
+# Réduit `net` sans le modifier ; keep : noms de places et transitions à conserver
+def reduce_net(net: PetriNet, keep=()):
+    keep = set(keep)
+    m0 = {name: p.initial_tokens for name, p in net.places.items()}
+    pre = {name: {} for name in net.transitions}
+    post = {name: {} for name in net.transitions}
+    for arc in net.arcs:
+        side = pre if arc.direction == "place_to_transition" else post
+        side[arc.transition.name][arc.place.name] = arc.weight
+    consumers = {name: set() for name in m0}
+    producers = {name: set() for name in m0}
+    for t in pre:
+        for p in pre[t]:
+            consumers[p].add(t)
+        for p in post[t]:
+            producers[p].add(t)
+    expansion = {t: [t] for t in pre}
+    covers = {t: {t} for t in pre}
+    prefix = []
+    rules = dict.fromkeys(RULES, 0)
+
+    def remove_place(p):
+        for t in consumers.pop(p):
+            del pre[t][p]
+        for t in producers.pop(p):
+            del post[t][p]
+        del m0[p]
+
+    def remove_transition(t):
+        for p in pre.pop(t):
+            consumers[p].discard(t)
+        for p in post.pop(t):
+            producers[p].discard(t)
+        del expansion[t], covers[t]
+
+    # p entre t1 et t2 : t2 est absorbée par t1
+    def series_transitions(p):
+        if p in keep or m0[p] or len(producers[p]) != 1 or len(consumers[p]) != 1:
+            return False
+        t1, t2 = next(iter(producers[p])), next(iter(consumers[p]))
+        if (t1 == t2 or t2 in keep or pre[t2] != {p: 1} or post[t1][p] != 1 or p in post[t2]
+                or keep.intersection(post[t2])):
+            return False
+        outputs = post[t2]
+        remove_place(p)
+        for q, w in outputs.items():
+            post[t1][q] = post[t1].get(q, 0) + w
+            producers[q].add(t1)
+        expansion[t1] += expansion[t2]
+        covers[t1] |= covers[t2]
+        remove_transition(t2)
+        return True
+
+    # t ne fait que déplacer un jeton de p vers q : p est fusionnée dans q
+    def series_places(t):
+        if t in keep or len(pre[t]) != 1 or len(post[t]) != 1:
+            return False
+        (p, w_in), (q, w_out) = next(iter(pre[t].items())), next(iter(post[t].items()))
+        if p == q or w_in != 1 or w_out != 1 or p in keep or q in keep or consumers[p] != {t}:
+            return False
+        moved = expansion[t]
+        for u in producers[p]:
+            w = post[u][p]
+            post[u][q] = post[u].get(q, 0) + w
+            producers[q].add(u)
+            expansion[u] += moved * w
+            covers[u] |= covers[t]
+        prefix.extend(moved * m0[p])
+        m0[q] += m0[p]
+        remove_transition(t)
+        remove_place(p)
+        return True
+
+    def column(p):
+        return (frozenset((t, pre[t][p]) for t in consumers[p]),
+                frozenset((t, post[t][p]) for t in producers[p]))
+
+    def implicit_places():
+        removed = 0
+        for p in [p for p in m0 if p not in keep]:
+            if not consumers[p] or (consumers[p] == producers[p]
+                                    and all(pre[t][p] == post[t][p] <= m0[p] for t in consumers[p])):
+                remove_place(p)
+                removed += 1
+        # doublons : on garde la place la plus contraignante (moins de jetons), conservée de préférence
+        groups = {}
+        for p in m0:
+            groups.setdefault(column(p), []).append(p)
+        for group in groups.values():
+            if len(group) < 2:
+                continue
+            group.sort(key=lambda p: (m0[p], p not in keep))
+            for p in group[1:]:
+                if p not in keep:
+                    remove_place(p)
+                    removed += 1
+        return removed
+
+    def identical_transitions():
+        removed = 0
+        groups = {}
+        for t in pre:
+            groups.setdefault((frozenset(pre[t].items()), frozenset(post[t].items())), []).append(t)
+        for group in groups.values():
+            if len(group) < 2:
+                continue
+            group.sort(key=lambda t: t not in keep)
+            representative = group[0]
+            for t in group[1:]:
+                if t not in keep:
+                    covers[representative] |= covers[t]
+                    remove_transition(t)
+                    removed += 1
+        return removed
+
+    changed = True
+    while changed:
+        changed = False
+        for p in list(m0):
+            if p in m0 and series_transitions(p):
+                rules["series_transitions"] += 1
+                changed = True
+        for t in list(pre):
+            if t in pre and series_places(t):
+                rules["series_places"] += 1
+                changed = True
+        count = implicit_places()
+        rules["implicit_places"] += count
+        count_t = identical_transitions()
+        rules["identical_transitions"] += count_t
+        changed = changed or bool(count or count_t)
+
+    reduced = PetriNet()
+    reduced.add_many(places=list(m0.items()), transitions=list(pre),
+                     arcs=[(p, t, "place_to_transition", w) for t in pre for p, w in pre[t].items()]
+                     + [(p, t, "transition_to_place", w) for t in post for p, w in post[t].items()])
+    for name, place in reduced.places.items():
+        place.color_set = net.places[name].color_set
+    for name, transition in reduced.transitions.items():
+        source = net.transitions[name]
+        transition.rate, transition.immediate, transition.delay = source.rate, source.immediate, source.delay
+    return Reduction(net, reduced, expansion, covers, prefix, rules)
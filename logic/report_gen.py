@@ -5,12 +5,18 @@ import os
 import matplotlib.pyplot as plt
 import networkx as nx
 from fpdf import FPDF
-from logic.analysis import StateSpaceVisualizer, build_state_space, checkVivacity, checkLoop
+from logic.analysis import StateSpaceVisualizer, build_state_space, fill_visualizer, checkVivacity, checkLoop
 
 # Génère un rapport PDF contenant l'analyse d'un réseau de Petri
-def generate_pdf_report(net, filename):
+# monte_carlo : résultat optionnel de logic.montecarlo.run_monte_carlo
+# performance : résultat optionnel de logic.stochastic.solve_gspn
+# graph : graphe d'accessibilité déjà calculé (logic.incremental), sinon il est construit ici
+def generate_pdf_report(net, filename, monte_carlo=None, performance=None, graph=None):
     viz = StateSpaceVisualizer()
-    build_state_space(net, viz)
+    if graph is not None:
+        fill_visualizer(net, graph, viz)
+    else:
+        build_state_space(net, viz)
     
     vivacity_lvl = checkVivacity(net)
     has_loop = checkLoop(net)
@@ -77,7 +83,77 @@ def generate_pdf_report(net, filename):
     pdf.cell(200, 10, txt=f" - Bornitude : Borné ({num_states} états distincts trouvés)", ln=True)
     pdf.cell(200, 10, txt=f" - Cycles structurels : {'Présents' if has_loop else 'Aucun cycle détecté'}", ln=True)
 
+    section = 3
+    if monte_carlo is not None:
+        add_monte_carlo_page(pdf, monte_carlo, section)
+        section += 1
+    if performance is not None:
+        add_performance_page(pdf, performance, section)
+
     # Sauvegarde et nettoyage
     pdf.output(filename)
     if os.path.exists(img_path):
-        os.remove(img_path)
\ No newline at end of file
+        os.remove(img_path)
+
+
+# PAGE 3 : statistiques issues des marches aléatoires
+def add_monte_carlo_page(pdf, stats, section):
+    summary = stats.summary()
+    pdf.add_page()
+    pdf.set_font("Arial", 'B', 16)
+    pdf.set_text_color(239, 71, 111)
+    pdf.cell(200, 10, txt=f"{section}. Analyse Monte-Carlo", ln=True)
+    pdf.ln(5)
+
+    pdf.set_font("Arial", '', 12)
+    pdf.set_text_color(0, 0, 0)
+    pdf.cell(200, 8, txt=f" - Marches : {summary['walks']} de {summary['max_steps']} tirs maximum", ln=True)
+    pdf.cell(200, 8, txt=f" - Probabilité de blocage : {summary['deadlock_probability']:.2%}", ln=True)
+    if summary["mean_time_to_deadlock"] is not None:
+        q = summary["time_to_deadlock_quantiles"]
+        pdf.cell(200, 8, txt=f" - Temps avant blocage : moyenne {summary['mean_time_to_deadlock']:.1f} tirs "
+                             f"(10% : {q[0.1]}, médiane : {q[0.5]}, 90% : {q[0.9]})", ln=True)
+    pdf.ln(5)
+
+    pdf.set_font("Arial", 'B', 12)
+    pdf.cell(200, 8, txt="Fréquences de tir", ln=True)
+    pdf.set_font("Arial", '', 10)
+    for name, freq in summary["firing_frequencies"].items():
+        pdf.cell(200, 6, txt=f"   {name} : {freq:.2%}", ln=True)
+    pdf.ln(5)
+
+    pdf.set_font("Arial", 'B', 12)
+    pdf.cell(200, 8, txt="Jetons par place (moyenne / maximum)", ln=True)
+    pdf.set_font("Arial", '', 10)
+    for name, mean in summary["mean_tokens"].items():
+        pdf.cell(200, 6, txt=f"   {name} : {mean:.2f} / {summary['max_tokens'][name]}", ln=True)
+
+
+# PAGE : régime stationnaire du réseau stochastique
+def add_performance_page(pdf, result, section):
+    pdf.add_page()
+    pdf.set_font("Arial", 'B', 16)
+    pdf.set_text_color(239, 71, 111)
+    pdf.cell(200, 10, txt=f"{section}. Performance (GSPN)", ln=True)
+    pdf.ln(5)
+
+    pdf.set_font("Arial", '', 12)
+    pdf.set_text_color(0, 0, 0)
+    pdf.cell(200, 8, txt=f" - États tangibles : {result.num_tangible} (évanescents éliminés : {result.num_vanishing})", ln=True)
+    pdf.cell(200, 8, txt=f" - Méthode : {result.method} (résidu {result.residual:.1e})", ln=True)
+    pdf.ln(5)
+
+    pdf.set_font("Arial", 'B', 12)
+    pdf.cell(200, 8, txt="Débit par transition (utilisation)", ln=True)
+    pdf.set_font("Arial", '', 10)
+    for name, value in result.throughput.items():
+        usage = result.enabled_probability.get(name)
+        extra = f" ({usage:.2%})" if usage is not None else " (immédiate)"
+        pdf.cell(200, 6, txt=f"   {name} : {value:.4f}{extra}", ln=True)
+    pdf.ln(5)
+
+    pdf.set_font("Arial", 'B', 12)
+    pdf.cell(200, 8, txt="Nombre moyen de jetons", ln=True)
+    pdf.set_font("Arial", '', 10)
+    for name, mean in result.mean_tokens.items():
+        pdf.cell(200, 6, txt=f"   {name} : {mean:.3f}", ln=True)
\ No newline at end of file
@@ -0,0 +1,119 @@
+# logic/simulation.py
+# Moteur de simulation (jeu de jetons) sur la structure compilée d'un réseau de Petri
+
+import random
+from logic.compiled import CompiledNet
+
+POLICIES = ("random", "priority", "round_robin")
+
+
+# Tire des transitions une à une selon une politique de choix
+# L'ensemble des transitions tirables est maintenu incrémentalement : après un tir,
+# seules les transitions dépendant des places modifiées sont réévaluées.
+class Simulator:
+    def __init__(self, net, policy="random", seed=None, priorities=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy '{policy}', expected one of {POLICIES}")
+        self.cn = net if isinstance(net, CompiledNet) else CompiledNet(net)
+        self.policy = policy
+        self.rng = random.Random(seed)
+        priorities = priorities or {}
+        self.priorities = [priorities.get(name, 0) for name in self.cn.transition_names]
+        self.reset()
+
+    # Revient au marquage initial (ou à un marquage donné)
+    def reset(self, marking=None):
+        self.marking = list(self.cn.initial if marking is None else marking)
+        self.steps = 0
+        self.fire_counts = [0] * self.cn.num_transitions
+        self.rr_next = 0
+        # liste des tirables + position de chaque transition dans la liste (-1 si non tirable)
+        self.enabled_list = []
+        self.enabled_pos = [-1] * self.cn.num_transitions
+        for t in range(self.cn.num_transitions):
+            if self.cn.is_enabled(self.marking, t):
+                self._add_enabled(t)
+
+    def _add_enabled(self, t):
+        self.enabled_pos[t] = len(self.enabled_list)
+        self.enabled_list.append(t)
+
+    def _remove_enabled(self, t):
+        i = self.enabled_pos[t]
+        last = self.enabled_list.pop()
+        if last != t:
+            self.enabled_list[i] = last
+            self.enabled_pos[last] = i
+        self.enabled_pos[t] = -1
+
+    @property
+    def deadlocked(self):
+        return not self.enabled_list
+
+    # Choisit la prochaine transition à tirer, None si aucune n'est tirable
+    def choose(self):
+        if not self.enabled_list:
+            return None
+        if self.policy == "random":
+            return self.rng.choice(self.enabled_list)
+        if self.policy == "priority":
+            best = max(self.priorities[t] for t in self.enabled_list)
+            candidates = [t for t in self.enabled_list if self.priorities[t] == best]
+            return candidates[0] if len(candidates) == 1 else self.rng.choice(candidates)
+        # round robin : première transition tirable après la dernière tirée
+        n = self.cn.num_transitions
+        for k in range(n):
+            t = (self.rr_next + k) % n
+            if self.enabled_pos[t] >= 0:
+                self.rr_next = t + 1
+                return t
+
+    # Tire la transition t et met à jour l'ensemble des tirables
+    def fire(self, t):
+        marking = self.marking
+        for p, d in self.cn.delta[t]:
+            marking[p] += d
+        pre = self.cn.pre
+        pos = self.enabled_pos
+        for u in self.cn.affected[t]:
+            ok = True
+            for p, w in pre[u]:
+                if marking[p] < w:
+                    ok = False
+                    break
+            if ok and pos[u] < 0:
+                self._add_enabled(u)
+            elif not ok and pos[u] >= 0:
+                self._remove_enabled(u)
+        self.fire_counts[t] += 1
+        self.steps += 1
+
+    # Un pas de simulation, retourne le nom de la transition tirée (None si blocage)
+    def step(self):
+        t = self.choose()
+        if t is None:
+            return None
+        self.fire(t)
+        return self.cn.transition_names[t]
+
+    # Enchaîne jusqu'à max_steps tirs, s'arrête au premier blocage
+    # Retourne le nombre de tirs effectués
+    def run(self, max_steps):
+        choose = self.choose
+        fire = self.fire
+        done = 0
+        while done < max_steps:
+            t = choose()
+            if t is None:
+                break
+            fire(t)
+            done += 1
+        return done
+
+    # Marquage courant sous forme nom de place -> jetons
+    def marking_dict(self):
+        return self.cn.marking_dict(self.marking)
+
+    # Nombre de tirs par transition
+    def fire_counts_dict(self):
+        return dict(zip(self.cn.transition_names, self.fire_counts))
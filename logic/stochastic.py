@@ -0,0 +1,263 @@
+# logic/stochastic.py
+# Réseaux de Petri stochastiques généralisés (GSPN) : génération de la CTMC et régime stationnaire
+# Les transitions temporisées ont un taux exponentiel (Transition.rate), les transitions
+# immédiates (Transition.immediate) sont prioritaires et choisies selon leur poids (rate).
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from scipy.sparse.csgraph import connected_components
+from logic.compiled import CompiledNet
+from logic.reachability import explore
+
+METHODS = ("gauss_seidel", "power", "gmres", "direct")
+# Préconditionneur de gmres : factorisation incomplète creuse (ILU) pour les petits systèmes ;
+# au-delà de ILU_MAX_STATES sa construction coûte plus que la résolution, on prend alors la
+# partie triangulaire inférieure D + L (un balayage de Gauss-Seidel), sans construction
+ILU_MAX_STATES = 10_000
+ILU_DROP_TOL = 1e-3
+ILU_FILL_FACTOR = 5
+GMRES_RESTART = 50
+GMRES_CYCLES = 20 # au plus GMRES_RESTART * GMRES_CYCLES itérations, puis Gauss-Seidel
+# tolérance relative minimale de gmres : plus bas, l'arithmétique flottante ne l'atteint plus sur
+# de grands systèmes (le résidu de pi Q = 0 est déjà bien sous tol)
+GMRES_MIN_RTOL = 1e-10
+ABSORB_CHUNK = 256 # colonnes résolues ensemble lors de l'élimination des évanescents
+
+
+# Résultats de l'analyse de performance
+class PerformanceResult:
+    def __init__(self):
+        self.num_tangible = 0
+        self.num_vanishing = 0
+        self.method = None
+        self.residual = None
+        self.throughput = {} # transition -> tirs par unité de temps
+        self.enabled_probability = {} # transition temporisée -> probabilité d'être tirable
+        self.mean_tokens = {} # place -> nombre moyen de jetons
+
+    def summary(self):
+        return {
+            "tangible_states": self.num_tangible,
+            "vanishing_states": self.num_vanishing,
+            "method": self.method,
+            "residual": self.residual,
+            "throughput": self.throughput,
+            "enabled_probability": self.enabled_probability,
+            "mean_tokens": self.mean_tokens,
+        }
+
+
+# Sémantique GSPN : si une immédiate est tirable, seules les immédiates le sont
+def gspn_enabled(cn: CompiledNet):
+    immediate = cn.immediate
+    def enabled(m):
+        ts = cn.enabled(m)
+        fast = [t for t in ts if immediate[t]]
+        return fast or ts
+    return enabled
+
+
+# Analyse complète : exploration, élimination des marquages évanescents, régime stationnaire
+def solve_gspn(net, method="gauss_seidel", tol=1e-12, max_iter=100_000, max_states=None):
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}', expected one of {METHODS}")
+    cn = net if isinstance(net, CompiledNet) else CompiledNet(net)
+    graph = explore(cn, enabled=gspn_enabled(cn), max_states=max_states)
+    if not graph.complete:
+        raise ValueError(f"State space exceeds {max_states} states")
+
+    n = graph.num_states
+    src = np.array(graph.src, dtype=np.int64)
+    dst = np.array(graph.dst, dtype=np.int64)
+    trans = np.array(graph.trans, dtype=np.int64)
+    rates = np.asarray(cn.rates, dtype=float)
+    is_immediate = np.asarray(cn.immediate, dtype=bool)
+
+    # un marquage est évanescent si ses arcs sortants sont des transitions immédiates
+    vanishing = np.zeros(n, dtype=bool)
+    if len(trans):
+        vanishing[src[is_immediate[trans]]] = True
+    tangible_ids = np.flatnonzero(~vanishing)
+    vanishing_ids = np.flatnonzero(vanishing)
+    local = np.empty(n, dtype=np.int64)
+    local[tangible_ids] = np.arange(len(tangible_ids))
+    local[vanishing_ids] = np.arange(len(vanishing_ids))
+    nt, nv = len(tangible_ids), len(vanishing_ids)
+
+    # taux depuis les tangibles, probabilités de branchement depuis les évanescents
+    from_t = ~vanishing[src]
+    weights = rates[trans]
+    out_weight = np.bincount(src[~from_t], weights=weights[~from_t], minlength=n)
+    probs = np.where(from_t, weights, weights / np.where(out_weight[src] > 0, out_weight[src], 1))
+
+    def block(rows_mask, to_vanishing, shape):
+        mask = rows_mask & (vanishing[dst] == to_vanishing)
+        return sp.csr_matrix((probs[mask], (local[src[mask]], local[dst[mask]])), shape=shape)
+
+    R_TT = block(from_t, False, (nt, nt))
+    R_TV = block(from_t, True, (nt, nv))
+    P_VT = block(~from_t, False, (nv, nt))
+    P_VV = block(~from_t, True, (nv, nv))
+
+    # élimination des évanescents : R = R_TT + R_TV (I - P_VV)^-1 P_VT
+    if nv:
+        A_V = (sp.identity(nv, format="csc") - P_VV).tocsc()
+        try:
+            lu = spla.splu(A_V)
+        except RuntimeError:
+            raise ValueError("Vanishing loop without exit (timeless trap)")
+        R = (R_TT + R_TV @ absorption(lu, P_VT)).tocsr() if nt else R_TT
+    else:
+        lu = None
+        R = R_TT
+
+    # générateur : on ignore les boucles, la diagonale compense les sorties
+    R = R - sp.diags(R.diagonal())
+    Q = (R - sp.diags(np.asarray(R.sum(axis=1)).ravel())).tocsr()
+
+    # distribution initiale sur les tangibles (un marquage initial évanescent est résolu)
+    pi0 = np.zeros(nt)
+    if vanishing[0]:
+        e0 = np.zeros(nv)
+        e0[local[0]] = 1.0
+        pi0 = P_VT.T @ lu.solve(e0, trans="T") if nt else pi0
+    else:
+        pi0[local[0]] = 1.0
+
+    result = PerformanceResult()
+    result.num_tangible, result.num_vanishing = nt, nv
+    if nt == 0:
+        return result
+    pi, result.method = steady_state(Q, pi0, method, tol, max_iter)
+    result.residual = float(np.abs(Q.T @ pi).max())
+
+    # débit des temporisées : pi(s) * taux pour chaque arc sortant d'un tangible
+    throughput = np.zeros(cn.num_transitions)
+    np.add.at(throughput, trans[from_t], pi[local[src[from_t]]] * weights[from_t])
+    enabled_prob = np.zeros(cn.num_transitions)
+    np.add.at(enabled_prob, trans[from_t], pi[local[src[from_t]]])
+
+    # débit des immédiates : visites des évanescents = flux entrant (I - P_VV)^-1
+    if nv:
+        entry = R_TV.T @ pi
+        visits = lu.solve(entry, trans="T")
+        from_v = ~from_t
+        np.add.at(throughput, trans[from_v], visits[local[src[from_v]]] * probs[from_v])
+
+    markings = np.asarray([graph.markings[s] for s in tangible_ids], dtype=float).reshape(nt, cn.num_places)
+    mean_tokens = pi @ markings
+
+    for t, name in enumerate(cn.transition_names):
+        result.throughput[name] = float(throughput[t])
+        if not cn.immediate[t]:
+            result.enabled_probability[name] = float(enabled_prob[t])
+    result.mean_tokens = dict(zip(cn.place_names, map(float, mean_tokens)))
+    return result
+
+
+# Résout pi Q = 0, somme(pi) = 1
+# S'il y a plusieurs classes récurrentes, la limite dépend de pi0 : on utilise la puissance
+def steady_state(Q, pi0, method, tol, max_iter):
+    n = Q.shape[0]
+    _, labels = connected_components(Q, directed=True, connection="strong")
+    # composantes terminales : aucune transition vers une autre composante
+    coo = Q.tocoo()
+    leaving = labels[coo.row] != labels[coo.col]
+    bottoms = sorted(set(labels) - set(labels[coo.row[leaving]]))
+    if method == "power" or len(bottoms) > 1:
+        return power_iteration(Q, pi0, tol, max_iter), "power"
+
+    # une seule classe récurrente réduite à un état absorbant (blocage)
+    bottom_states = np.flatnonzero(labels == bottoms[0])
+    k = int(bottom_states[0])
+    pi = np.zeros(n)
+    pi[k] = 1.0
+    if len(bottom_states) == 1:
+        return pi, method
+
+    if method == "gauss_seidel":
+        return gauss_seidel(Q, pi0, tol, max_iter), "gauss_seidel"
+
+    # on fixe pi[k] = 1 pour un état k de la classe récurrente et on retire son équation :
+    # le système reste creux (pas de ligne de normalisation dense)
+    keep = np.flatnonzero(np.arange(n) != k)
+    QT = Q.T.tocsc()
+    A = QT[keep][:, keep].tocsc()
+    b = -np.asarray(QT[keep][:, [k]].todense()).ravel()
+
+    if method == "gmres":
+        x, info = spla.gmres(A, b, M=preconditioner(A), rtol=max(tol, GMRES_MIN_RTOL),
+                             restart=GMRES_RESTART, maxiter=GMRES_CYCLES)
+        if info == 0:
+            pi[keep] = x
+            return normalize(pi), "gmres"
+        # non-convergence dans le budget : Gauss-Seidel, sans factorisation complète
+        return gauss_seidel(Q, pi0, tol, max_iter), "gauss_seidel"
+
+    pi[keep] = spla.spsolve(A, b)
+    return normalize(pi), "direct"
+
+
+# Préconditionneur de gmres (voir ILU_MAX_STATES)
+def preconditioner(A):
+    if A.shape[0] <= ILU_MAX_STATES:
+        try:
+            ilu = spla.spilu(A, drop_tol=ILU_DROP_TOL, fill_factor=ILU_FILL_FACTOR)
+            return spla.LinearOperator(A.shape, ilu.solve)
+        except RuntimeError:
+            pass # facteur singulier : préconditionneur triangulaire
+    # diagonale non nulle : chaque état de la classe récurrente a un taux de sortie
+    lower = sp.tril(A, 0, format="csr")
+    return spla.LinearOperator(A.shape, lambda v: spla.spsolve_triangular(lower, v, lower=True))
+
+
+# Probabilités d'absorption évanescent -> tangible : (I - P_VV)^-1 P_VT avec la factorisation lu
+# Seules les colonnes non nulles de P_VT sont résolues, par paquets, et le résultat reste creux
+def absorption(lu, P_VT):
+    P = P_VT.tocsc()
+    columns = np.flatnonzero(np.diff(P.indptr))
+    rows, cols, values = [], [], []
+    for start in range(0, len(columns), ABSORB_CHUNK):
+        part = columns[start:start + ABSORB_CHUNK]
+        block = sp.coo_matrix(lu.solve(P[:, part].toarray()))
+        rows.append(block.row)
+        cols.append(part[block.col])
+        values.append(block.data)
+    if not rows:
+        return sp.csr_matrix(P.shape)
+    return sp.csr_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))), shape=P.shape)
+
+
+# Gauss-Seidel sur Q^T pi = 0 : (D + L) pi_k+1 = -U pi_k, renormalisé à chaque itération
+# Les états transitoires de diagonale nulle n'existent pas ici (classe récurrente unique non triviale)
+def gauss_seidel(Q, pi0, tol, max_iter):
+    A = Q.T.tocsr()
+    lower = sp.tril(A, 0, format="csr")
+    upper = sp.triu(A, 1, format="csr")
+    scale = np.abs(A.diagonal()).max()
+    pi = np.full(Q.shape[0], 1.0 / Q.shape[0])
+    for _ in range(max_iter):
+        pi = normalize(spla.spsolve_triangular(lower, -(upper @ pi), lower=True))
+        if np.abs(A @ pi).max() < tol * scale:
+            break
+    return pi
+
+
+# Itération de puissance sur la chaîne uniformisée P = I + Q / q
+def power_iteration(Q, pi0, tol, max_iter):
+    q = max(1.0, np.abs(Q.diagonal()).max()) * 1.02
+    P = (sp.identity(Q.shape[0], format="csr") + Q / q).T.tocsr()
+    pi = pi0.copy()
+    for _ in range(max_iter):
+        nxt = P @ pi
+        if np.abs(nxt - pi).max() < tol:
+            return normalize(nxt)
+        pi = nxt
+    return normalize(pi)
+
+
+def normalize(pi):
+    pi = np.clip(np.real(pi), 0, None)
+    total = pi.sum()
+    return pi / total if total > 0 else pi
@@ -0,0 +1,164 @@
+# logic/timed.py
+# Réseaux de Petri temporisés : simulation à événements discrets
+# Chaque transition porte un délai (Transition.delay). Une transition qui devient tirable
+# est programmée à now + délai dans un calendrier (tas) ; si elle cesse d'être tirable
+# avant l'échéance, son événement est annulé. Après chaque tir, seules les transitions
+# dépendant des places modifiées sont réévaluées.
+
+import heapq
+import math
+import random
+from logic.compiled import CompiledNet
+
+DELAY_KINDS = ("deterministic", "exponential", "uniform", "normal")
+
+
+# Vérifie une spécification de délai (type, paramètres...) et la retourne sous forme de tuple
+def check_delay(delay):
+    kind, *params = delay
+    expected = {"deterministic": 1, "exponential": 1, "uniform": 2, "normal": 2}
+    if kind not in expected:
+        raise ValueError(f"Unknown delay kind '{kind}', expected one of {DELAY_KINDS}")
+    if len(params) != expected[kind]:
+        raise ValueError(f"Delay '{kind}' expects {expected[kind]} parameter(s)")
+    if any(p < 0 for p in params):
+        raise ValueError("Delay parameters must be non-negative")
+    return (kind, *params)
+
+
+# Construit une fonction sans argument qui tire un délai
+def make_sampler(delay, rng):
+    kind, *params = delay
+    if kind == "deterministic":
+        value = params[0]
+        return lambda: value
+    if kind == "exponential":
+        mean = params[0]
+        return (lambda: rng.expovariate(1.0 / mean)) if mean > 0 else (lambda: 0.0)
+    if kind == "uniform":
+        low, high = params
+        return lambda: rng.uniform(low, high)
+    mu, sigma = params # normale tronquée à 0
+    return lambda: max(0.0, rng.gauss(mu, sigma))
+
+
+class TimedSimulator:
+    def __init__(self, net, seed=None):
+        self.cn = CompiledNet(net)
+        self.rng = random.Random(seed)
+        self.samplers = [make_sampler(t.delay, self.rng) for t in net.transitions.values()]
+        self.reset()
+
+    def reset(self):
+        cn = self.cn
+        self.now = 0.0
+        self.marking = list(cn.initial)
+        self.calendar = [] # (échéance, numéro, transition, version)
+        self.seq = 0
+        self.version = [0] * cn.num_transitions
+        self.scheduled = [False] * cn.num_transitions
+        self.fire_counts = [0] * cn.num_transitions
+        self.events = 0
+        self.occupancy = [0.0] * cn.num_places # intégrale des jetons dans le temps
+        self.last_change = [0.0] * cn.num_places
+        for t in range(cn.num_transitions):
+            if cn.is_enabled(self.marking, t):
+                self.schedule(t)
+
+    def schedule(self, t):
+        self.scheduled[t] = True
+        self.seq += 1
+        heapq.heappush(self.calendar, (self.now + self.samplers[t](), self.seq, t, self.version[t]))
+
+    def cancel(self, t):
+        self.scheduled[t] = False
+        self.version[t] += 1 # l'événement en attente devient obsolète
+
+    @property
+    def deadlocked(self):
+        return not any(self.scheduled)
+
+    # Traite le prochain événement valide d'échéance <= until, retourne la transition tirée ou None
+    def next_event(self, until=math.inf):
+        calendar = self.calendar
+        while calendar:
+            when, _, t, version = calendar[0]
+            if when > until:
+                return None
+            heapq.heappop(calendar)
+            if version != self.version[t]:
+                continue
+            self.now = when
+            self.fire(t)
+            return t
+        return None
+
+    def fire(self, t):
+        cn = self.cn
+        marking = self.marking
+        now = self.now
+        for p, d in cn.delta[t]:
+            self.occupancy[p] += marking[p] * (now - self.last_change[p])
+            self.last_change[p] = now
+            marking[p] += d
+        self.fire_counts[t] += 1
+        self.events += 1
+        self.scheduled[t] = False
+        self.version[t] += 1
+
+        # réévaluation ciblée : t elle-même et les consommatrices des places modifiées
+        for u in (t,) + cn.affected[t]:
+            enabled = cn.is_enabled(marking, u)
+            if enabled and not self.scheduled[u]:
+                self.schedule(u)
+            elif not enabled and self.scheduled[u]:
+                self.cancel(u)
+
+    # Simule jusqu'à l'horizon `until` (ou max_events événements)
+    # on_sample(temps, simulateur) est appelé tous les sample_interval unités de temps
+    def run(self, until, max_events=None, sample_interval=None, on_sample=None):
+        next_sample = sample_interval if sample_interval else math.inf
+        limit = self.events + max_events if max_events is not None else math.inf
+        while self.events < limit:
+            horizon = min(until, next_sample)
+            if self.next_event(horizon) is not None:
+                continue
+            # plus d'événement avant l'horizon : échantillon ou fin
+            if not self.calendar and until == math.inf:
+                break # blocage sans horizon
+            if next_sample <= until:
+                self.advance(next_sample)
+                on_sample(next_sample, self)
+                next_sample += sample_interval
+                continue
+            self.advance(until)
+            break
+        return self
+
+    # Avance l'horloge sans événement (pour clore les intégrales)
+    def advance(self, when):
+        if when > self.now:
+            self.now = when
+
+    # Occupation moyenne pondérée par le temps, par place
+    def mean_occupancy(self):
+        now = self.now or 1.0
+        return {
+            name: (self.occupancy[p] + self.marking[p] * (self.now - self.last_change[p])) / now
+            for p, name in enumerate(self.cn.place_names)
+        }
+
+    # Débit (tirs par unité de temps), par transition
+    def throughput(self):
+        now = self.now or 1.0
+        return {name: count / now for name, count in zip(self.cn.transition_names, self.fire_counts)}
+
+
+# Écrit au fil de l'eau une ligne CSV par échantillon (temps, marquage, tirs cumulés)
+# La mémoire utilisée ne dépend pas de l'horizon
+def stream_csv(sim: TimedSimulator, file, until, sample_interval, max_events=None):
+    cn = sim.cn
+    file.write(",".join(["time"] + cn.place_names + [f"fired_{n}" for n in cn.transition_names]) + "\n")
+    def write_row(when, s):
+        file.write(",".join([f"{when:g}"] + [str(v) for v in s.marking] + [str(v) for v in s.fire_counts]) + "\n")
+    return sim.run(until, max_events=max_events, sample_interval=sample_interval, on_sample=write_row)
@@ -0,0 +1,337 @@
+# logic/unfolding.py
+# Dépliage d'un réseau sauf (1-borné) en préfixe fini complet (McMillan, ordre adéquat d'Esparza,
+# Römer et Vogler). Le dépliage est un réseau d'occurrences acyclique :
+#   - une condition est un jeton d'une place, produit par un événement (ou initial) ;
+#   - un événement est un tir d'une transition consommant un ensemble de conditions concurrentes.
+# Les tirs concurrents ne sont pas entrelacés : la taille du préfixe suit le nombre d'événements,
+# pas le nombre d'ordres de tir possibles.
+# Les extensions possibles sont ajoutées dans l'ordre total ERV de leur configuration locale
+# [e] (taille, vecteur de Parikh, forme normale de Foata). Un événement dont le marquage
+# Mark([e]) a déjà été atteint par une configuration plus petite est un cut-off : il est gardé
+# mais n'est pas prolongé.
+# Relations stockées en entiers Python utilisés comme ensembles de bits (co-relation par condition).
+#
+# Vérifications sur le préfixe : tout marquage accessible est le marquage d'une configuration
+# sans cut-off, et toute transition activée y correspond à un événement du préfixe.
+# find_deadlock et find_marking cherchent une telle configuration par retour arrière sur les
+# événements (dans l'ordre d'ajout, qui respecte la causalité), en élaguant dès qu'une contrainte
+# ne peut plus être satisfaite. La recherche peut être exponentielle dans le pire cas.
+
+import heapq
+from logic.compiled import CompiledNet
+from logic.reachability import Deadlock, SearchResult
+
+
+def bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+# Clé de Parikh : comparaison lexicographique des vecteurs (transition d'indice le plus petit d'abord)
+# (-t, n) : à la première transition où les vecteurs diffèrent, le plus grand nombre l'emporte
+def parikh_key(counts):
+    return tuple((-t, counts[t]) for t in sorted(counts))
+
+
+class Prefix:
+    def __init__(self, cn: CompiledNet):
+        self.cn = cn
+        # conditions
+        self.cond_place = []
+        self.cond_event = [] # événement producteur, -1 pour les conditions initiales
+        self.cond_consumers = []
+        # événements, numérotés dans l'ordre d'ajout (compatible avec la causalité)
+        self.event_transition = []
+        self.event_preset = []
+        self.event_postset = []
+        self.event_cutoff = []
+        self.event_companion = [] # pour un cut-off : événement de même marquage (-1 : marquage initial)
+        self.complete = True
+
+    @property
+    def num_conditions(self):
+        return len(self.cond_place)
+
+    @property
+    def num_events(self):
+        return len(self.event_transition)
+
+    @property
+    def num_cutoffs(self):
+        return sum(self.event_cutoff)
+
+    def summary(self):
+        status = "" if self.complete else " (incomplet : limite atteinte)"
+        return f"{self.num_events} événements dont {self.num_cutoffs} cut-offs, {self.num_conditions} conditions{status}"
+
+    # Trace (noms de transitions) et marquage d'une configuration donnée par ses événements
+    def run(self, events):
+        cn = self.cn
+        order = sorted(events)
+        m = list(cn.initial)
+        for e in order:
+            for p, d in cn.delta[self.event_transition[e]]:
+                m[p] += d
+        return [cn.transition_names[self.event_transition[e]] for e in order], tuple(m)
+
+    ## ---- Recherche d'une configuration sans cut-off ---- ##
+    # checks : liste de (échéance, test) ; le test est évalué dès que tous les événements jusqu'à
+    # l'échéance sont décidés. leaf(config) valide une configuration complète (ou None).
+    # Retourne (événements de la configuration ou None, noeuds de recherche)
+    def search(self, checks, leaf=None):
+        n = self.num_events
+        chosen = [False] * n
+        consumed = [False] * self.num_conditions
+        cond_event, preset, cutoff = self.cond_event, self.event_preset, self.event_cutoff
+
+        def produced(c):
+            e = cond_event[c]
+            return e < 0 or chosen[e]
+
+        def in_cut(c):
+            return produced(c) and not consumed[c]
+
+        def possible(e):
+            return not cutoff[e] and all(in_cut(c) for c in preset[e])
+
+        def select(e):
+            chosen[e] = True
+            for c in preset[e]:
+                consumed[c] = True
+
+        def undo(e):
+            if chosen[e]:
+                chosen[e] = False
+                for c in preset[e]:
+                    consumed[c] = False
+
+        by_deadline = [[] for _ in range(n)]
+        for deadline, test in checks:
+            if deadline < 0:
+                if not test(in_cut):
+                    return None, 0
+            else:
+                by_deadline[deadline].append(test)
+
+        options = [None] * n
+        nodes = 0
+        i = 0
+        while i >= 0:
+            if i == n:
+                config = [e for e in range(n) if chosen[e]]
+                if leaf is None or leaf(config):
+                    return config, nodes
+                i -= 1
+                if i >= 0:
+                    undo(i)
+                continue
+            if options[i] is None:
+                options[i] = [True, False] if possible(i) else [False] # on essaie d'abord de tirer
+            if not options[i]:
+                options[i] = None
+                i -= 1
+                if i >= 0:
+                    undo(i)
+                continue
+            nodes += 1
+            if options[i].pop(0):
+                select(i)
+            if all(test(in_cut) for test in by_deadline[i]):
+                i += 1
+            else:
+                undo(i)
+        return None, nodes
+
+    # échéance d'une condition : dernier événement qui la produit ou la consomme
+    def condition_deadline(self, c):
+        return max([self.cond_event[c]] + self.cond_consumers[c])
+
+    # Blocage : configuration sans cut-off dont la coupe n'active aucun événement du préfixe
+    # Retourne un Deadlock (marquage et trace sur le réseau d'origine) ou None
+    # Sur un préfixe incomplet, None ne prouve pas l'absence de blocage
+    def find_deadlock(self):
+        cn = self.cn
+        checks = []
+        for e in range(self.num_events):
+            preset = self.event_preset[e]
+            deadline = max(self.condition_deadline(c) for c in preset)
+            checks.append((deadline, lambda in_cut, preset=preset: not all(in_cut(c) for c in preset)))
+
+        def leaf(config):
+            _, m = self.run(config)
+            return not cn.enabled(m)
+
+        config, _ = self.search(checks, leaf)
+        if config is None:
+            return None
+        trace, m = self.run(config)
+        return Deadlock(cn.marking_dict(m), trace)
+
+    # Marquage cible (nom de place -> jetons, partiel autorisé) ; retourne un SearchResult
+    # reachable vaut None si le préfixe est incomplet et qu'aucune configuration ne convient
+    def find_marking(self, target):
+        cn = self.cn
+        for name in target:
+            if name not in cn.place_index:
+                raise ValueError(f"Unknown place '{name}'")
+        if any(v not in (0, 1) for v in target.values()):
+            return SearchResult(False, None, 0, 0, "safe net: a place holds at most one token")
+        by_place = [[] for _ in range(cn.num_places)]
+        for c, p in enumerate(self.cond_place):
+            by_place[p].append(c)
+        checks = []
+        for name, value in target.items():
+            conditions = by_place[cn.place_index[name]]
+            if value == 1:
+                if not conditions:
+                    return SearchResult(False, None, 0, 0, f"place '{name}' is never marked")
+                deadline = max(self.condition_deadline(c) for c in conditions)
+                checks.append((deadline, lambda in_cut, cs=conditions: any(in_cut(c) for c in cs)))
+            else:
+                for c in conditions:
+                    checks.append((self.condition_deadline(c), lambda in_cut, c=c: not in_cut(c)))
+
+        config, nodes = self.search(checks)
+        if config is not None:
+            trace, _ = self.run(config)
+            return SearchResult(True, trace, nodes, 0, "target reached")
+        if not self.complete:
+            return SearchResult(None, None, nodes, 0, "prefix is incomplete")
+        return SearchResult(False, None, nodes, 0, "no configuration of the complete prefix reaches the target")
+
+
+# Construit le préfixe fini complet du réseau sauf `net` (PetriNet ou CompiledNet)
+# max_events : arrêt après ce nombre d'événements (préfixe incomplet)
+# Lève ValueError si le réseau n'est pas sauf (poids, marquage initial ou marquage accessible > 1)
+def unfold(net, max_events=None):
+    cn = net if isinstance(net, CompiledNet) else CompiledNet(net)
+    if any(w != 1 for arcs in cn.pre + cn.post for _, w in arcs):
+        raise ValueError("Unfolding requires arc weights of 1 (safe net)")
+    if any(v > 1 for v in cn.initial):
+        raise ValueError("Unfolding requires at most one initial token per place (safe net)")
+    for t, arcs in enumerate(cn.pre):
+        if not arcs:
+            raise ValueError(f"Transition '{cn.transition_names[t]}' has no input place")
+    prefix = Prefix(cn)
+    pre_places = [tuple(p for p, _ in arcs) for arcs in cn.pre]
+    post_places = [tuple(p for p, _ in arcs) for arcs in cn.post]
+
+    place_mask = [0] * cn.num_places # conditions (non cut-off) de chaque place
+    co = [] # co[c] : conditions concurrentes de c
+    config = [] # configuration locale de chaque événement (ensemble de bits, e compris)
+    depth = [] # niveau de e dans la forme normale de Foata
+    seen = {cn.initial: -1} # marquage -> événement qui l'atteint en premier
+    queue = []
+    seq = 0
+
+    def add_condition(place, event):
+        c = len(prefix.cond_place)
+        prefix.cond_place.append(place)
+        prefix.cond_event.append(event)
+        prefix.cond_consumers.append([])
+        co.append(0)
+        return c
+
+    def push_extension(t, conditions):
+        nonlocal seq
+        causes = 0
+        level = 1
+        for c in conditions:
+            e = prefix.cond_event[c]
+            if e >= 0:
+                causes |= config[e]
+                level = max(level, depth[e] + 1)
+        counts = {t: 1}
+        levels = {level: {t: 1}}
+        for e in bits(causes):
+            u = prefix.event_transition[e]
+            counts[u] = counts.get(u, 0) + 1
+            at_level = levels.setdefault(depth[e], {})
+            at_level[u] = at_level.get(u, 0) + 1
+        foata = tuple(parikh_key(levels[d]) for d in sorted(levels))
+        seq += 1
+        heapq.heappush(queue, (bin(causes).count("1") + 1, parikh_key(counts), foata, seq,
+                               t, conditions, causes, counts, level))
+
+    # extensions possibles dont le préfixe contient une des nouvelles conditions
+    def extensions(new_conditions):
+        first_new = new_conditions[0]
+        for c in new_conditions:
+            place = prefix.cond_place[c]
+            for t in cn.consumers[place]:
+                others = [q for q in pre_places[t] if q != place]
+                # parmi les nouvelles conditions, seules celles après c : chaque extension est produite une fois
+                allowed = co[c] & ~(((1 << c) - 1) ^ ((1 << first_new) - 1))
+                stack = [(0, allowed, (c,))]
+                while stack:
+                    k, mask, chosen = stack.pop()
+                    if k == len(others):
+                        push_extension(t, tuple(sorted(chosen)))
+                        continue
+                    for d in bits(mask & place_mask[others[k]]):
+                        stack.append((k + 1, mask & co[d], chosen + (d,)))
+
+    initial_conditions = []
+    for p, v in enumerate(cn.initial):
+        if v:
+            initial_conditions.append(add_condition(p, -1))
+    all_initial = 0
+    for c in initial_conditions:
+        all_initial |= 1 << c
+    for c in initial_conditions:
+        co[c] = all_initial & ~(1 << c)
+        place_mask[prefix.cond_place[c]] |= 1 << c
+    if initial_conditions:
+        extensions(initial_conditions)
+
+    while queue:
+        if max_events is not None and prefix.num_events >= max_events:
+            prefix.complete = False
+            break
+        size, _, _, _, t, conditions, causes, counts, level = heapq.heappop(queue)
+        e = prefix.num_events
+        m = list(cn.initial)
+        for u, n in counts.items():
+            for p, d in cn.delta[u]:
+                m[p] += d * n
+        m = tuple(m)
+        if any(v > 1 for v in m):
+            raise ValueError(f"Net is not safe: firing '{cn.transition_names[t]}' puts two tokens in a place")
+        companion = seen.get(m)
+        cutoff = companion is not None
+        if not cutoff:
+            seen[m] = e
+
+        prefix.event_transition.append(t)
+        prefix.event_preset.append(conditions)
+        prefix.event_cutoff.append(cutoff)
+        prefix.event_companion.append(companion if cutoff else None)
+        config.append(causes | (1 << e))
+        depth.append(level)
+        for c in conditions:
+            prefix.cond_consumers[c].append(e)
+        post = tuple(add_condition(p, e) for p in post_places[t])
+        prefix.event_postset.append(post)
+        if cutoff or not post:
+            continue
+
+        # co-relation des nouvelles conditions : concurrentes de tout le préfixe de e, et entre elles
+        common = -1
+        for c in conditions:
+            common &= co[c]
+        post_mask = 0
+        for c in post:
+            post_mask |= 1 << c
+        for c in post:
+            co[c] = common | (post_mask & ~(1 << c))
+            place = prefix.cond_place[c]
+            if co[c] & place_mask[place]:
+                raise ValueError(f"Net is not safe: place '{cn.place_names[place]}' can hold two tokens")
+        for d in bits(common):
+            co[d] |= post_mask
+        for c in post:
+            place_mask[prefix.cond_place[c]] |= 1 << c
+        extensions(post)
+    return prefix
@@ -1,122 +1,516 @@
 # logic/updownload.py
 # Module pour l'importation et l'exportation des réseaux de Petri
+# Deux formats :
+#   - JSON historique (.json) : un objet {"places", "transitions", "arcs"}, toujours lu et écrit ;
+#   - format compact versionné (.petri, .petri.gz, .petri.zst) : une ligne JSON par
+#     enregistrement, écrite et relue au fil de l'eau, éventuellement compressée.
+#       {"format": "petri-editor", "version": 1}
+#       ["P", nom, jetons, color_set, x, y]
+#       ["T", nom, taux, immédiate, [délai...], x, y]
+#       ["A", place, transition, "in" | "out", poids]      (in : place -> transition)
+#       ["E", nb places, nb transitions, nb arcs]            (fin, détecte les fichiers tronqués)
+# Le chargement est séparé en read_model (backend seul, en bloc via add_many) et
+# populate_scene (items graphiques), qui peut aussi créer la scène par paquets (populate_scene_chunks).
+# La sauvegarde passe par un instantané (snapshot_model) : les enregistrements du format compact,
+# copiés depuis le réseau et la scène. write_snapshot les sérialise sans toucher au réseau édité,
+# dans un fichier temporaire renommé ensuite (un fichier existant n'est jamais laissé à moitié écrit).
 
+import gzip
+import io
 import json
-from logic.petri_net import PetriNet
+import os
+import stat
+import tempfile
+from logic.petri_net import PetriNet, check_count
+from logic.timed import check_delay
+from logic.pnml import write_pnml
 from gui.items import PlaceItem, TransitionItem, ArcItem
 
-# transforme un réseau de Petri et une scène en json de sauvegarde
-def save_petri_net(filename, scene, net: PetriNet):
-    # Prépare les données à sauvegarder
+GRID_STEP = 120 # espacement des noeuds placés automatiquement (sans position dans le fichier)
+FORMAT_NAME = "petri-editor"
+FORMAT_VERSION = 1
+NATIVE_EXTENSIONS = (".petri", ".petri.gz", ".petri.zst")
+BATCH_SIZE = 5000 # enregistrements accumulés avant un appel à add_many
+SCENE_CHUNK = 2000 # items créés par paquet lors d'un remplissage progressif de la scène
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+def is_native(filename):
+    return filename.lower().endswith(NATIVE_EXTENSIONS)
+
+
+# zstd est facultatif : le module n'est demandé que pour les fichiers .zst
+def zstd_module():
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("Reading or writing .zst files requires the 'zstandard' package (pip install zstandard)")
+    return zstandard
+
+
+# Ouvre un fichier en écriture texte, compressé selon l'extension
+def open_for_writing(filename):
+    lower = filename.lower()
+    if lower.endswith(".gz"):
+        return gzip.open(filename, "wt", encoding="utf-8")
+    if lower.endswith(".zst"):
+        zstd = zstd_module()
+        writer = zstd.ZstdCompressor().stream_writer(open(filename, "wb"), closefd=True)
+        return io.TextIOWrapper(writer, encoding="utf-8")
+    return open(filename, "w", encoding="utf-8")
+
+
+# Ouvre un fichier en lecture texte ; la compression est reconnue à son en-tête, pas à l'extension
+def open_for_reading(filename):
+    with open(filename, "rb") as f:
+        magic = f.read(4)
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.open(filename, "rt", encoding="utf-8")
+    if magic == ZSTD_MAGIC:
+        zstd = zstd_module()
+        reader = zstd.ZstdDecompressor().stream_reader(open(filename, "rb"), closefd=True)
+        return io.TextIOWrapper(reader, encoding="utf-8")
+    return open(filename, encoding="utf-8")
+
+
+# positions actuelles des noeuds de la scène
+def scene_layout(place_items, transition_items):
+    layout = {}
+    for items in (place_items, transition_items):
+        for name, item in items.items():
+            pos = item.scenePos()
+            layout[name] = (pos.x(), pos.y())
+    return layout
+
+
+# sauvegarde le réseau avec les positions de la scène ; le format dépend de l'extension
+# place_items / transition_items : index nom -> item de la scène (construit depuis la scène si absent)
+def save_petri_net(filename, scene, net: PetriNet, place_items=None, transition_items=None):
+    if place_items is None or transition_items is None:
+        place_items, transition_items = index_scene_items(scene)
+    write_snapshot(filename, snapshot_model(net, scene_layout(place_items, transition_items)))
+
+
+# Instantané du modèle : liste des enregistrements du format compact (sans en-tête ni fin)
+# Seules des valeurs simples sont copiées : l'instantané peut être écrit depuis un autre thread
+# pendant que le réseau continue d'être modifié.
+def snapshot_model(net: PetriNet, layout):
+    records = []
+    for place in net.places.values():
+        x, y = layout.get(place.name, (0.0, 0.0))
+        records.append(["P", place.name, place.initial_tokens, place.color_set, x, y])
+    for t in net.transitions.values():
+        x, y = layout.get(t.name, (0.0, 0.0))
+        records.append(["T", t.name, t.rate, t.immediate, list(t.delay), x, y])
+    for arc in net.arcs:
+        direction = "in" if arc.direction == "place_to_transition" else "out"
+        records.append(["A", arc.place.name, arc.transition.name, direction, arc.weight])
+    return records
+
+
+# Reconstruit un réseau (et ses positions) depuis un instantané, pour les formats qui lisent le backend
+def snapshot_net(records):
+    net = PetriNet()
+    builder = ModelBuilder(net)
+    for record in records:
+        if record[0] == "P":
+            builder.add_place(*record[1:])
+        elif record[0] == "T":
+            builder.add_transition(*record[1:])
+        else:
+            _, place, transition, direction, weight = record
+            builder.add_arc(place, transition,
+                            "place_to_transition" if direction == "in" else "transition_to_place", weight)
+    return net, builder.finish()
+
+
+# Écrit un instantané dans le format donné par l'extension (compact, PNML ou JSON historique)
+# Le fichier est écrit à côté de la cible puis renommé : une sauvegarde interrompue laisse
+# l'ancien fichier intact.
+def write_snapshot(filename, records):
+    def write(path):
+        if is_native(filename):
+            write_records(path, records)
+        else:
+            net, layout = snapshot_net(records)
+            if filename.lower().endswith(".pnml"):
+                write_pnml(path, net, layout)
+            else:
+                write_legacy_json(path, net, layout)
+    atomic_write(filename, write)
+
+
+# Masque de création de fichiers du processus, lu une fois au chargement du module (os.umask ne se lit
+# qu'en le modifiant, ce qu'on évite pendant les écritures en arrière-plan)
+UMASK = os.umask(0o022)
+os.umask(UMASK)
+
+
+# write(chemin) écrit un fichier temporaire du même dossier (même extension), qui remplace ensuite la cible
+# Le fichier final garde les droits de la cible existante, sinon les droits par défaut (0666 moins l'umask) :
+# mkstemp crée le fichier temporaire en 0600
+def atomic_write(filename, write):
+    folder, base = os.path.split(os.path.abspath(filename))
+    mode = stat.S_IMODE(os.stat(filename).st_mode) if os.path.exists(filename) else 0o666 & ~UMASK
+    fd, temp = tempfile.mkstemp(prefix=".~", suffix="-" + base, dir=folder)
+    os.close(fd)
+    try:
+        write(temp)
+        os.chmod(temp, mode)
+        with open(temp, "rb+") as f:
+            os.fsync(f.fileno()) # le contenu est sur le disque avant le renommage
+        os.replace(temp, filename)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+    fsync_directory(folder)
+
+
+# le renommage n'est durable qu'une fois le dossier synchronisé (impossible sous Windows)
+def fsync_directory(folder):
+    try:
+        fd = os.open(folder, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# écrit le format compact, enregistrement par enregistrement
+def write_model(filename, net: PetriNet, layout):
+    write_records(filename, snapshot_model(net, layout))
+
+
+def write_records(filename, records):
+    dump = json.JSONEncoder(separators=(",", ":")).encode
+    counts = {"P": 0, "T": 0, "A": 0}
+    with open_for_writing(filename) as f:
+        f.write(dump({"format": FORMAT_NAME, "version": FORMAT_VERSION}) + "\n")
+        for record in records:
+            f.write(dump(record) + "\n")
+            counts[record[0]] += 1
+        f.write(dump(["E", counts["P"], counts["T"], counts["A"]]) + "\n")
+
+
+# transforme un réseau de Petri en json de sauvegarde (format historique)
+def write_legacy_json(filename, net: PetriNet, layout):
+    # Prépare les données à sauvegarder, dans l'ordre du backend
     data = {
         "places": [],
         "transitions": [],
         "arcs": []
     }
 
-    # On construit à partir des items de la scène et du backend
+    # --- Places --- #
+    for place in net.places.values():
+        x, y = layout[place.name]
+        data["places"].append({
+            "name": place.name,
+            "initial_tokens": place.initial_tokens,
+            "color_set": place.color_set,
+            "x": x,
+            "y": y
+        })
+    # --- Transitions --- #
+    for transition in net.transitions.values():
+        x, y = layout[transition.name]
+        data["transitions"].append({
+            "name": transition.name,
+            "rate": transition.rate,
+            "immediate": transition.immediate,
+            "delay": list(transition.delay),
+            "x": x,
+            "y": y
+        })
+    # --- Arcs --- #
+    for arc in net.arcs:
+        data["arcs"].append({
+            "place": arc.place.name,
+            "transition": arc.transition.name,
+            "direction": arc.direction,
+            "weight": arc.weight
+        })
+
+    with open(filename, "w") as f:
+        json.dump(data, f, indent=4)
+
+
+# construit en un seul parcours de la scène les index nom -> item
+def index_scene_items(scene):
+    place_items = {}
+    transition_items = {}
     for item in scene.items():
-        # --- Places --- #
         if isinstance(item, PlaceItem):
-            pos = item.scenePos()
-            data["places"].append({
-                "name": item.name,
-                "initial_tokens": net.places.get(item.name).initial_tokens,
-                "x": pos.x(),
-                "y": pos.y()
-            })
-        # --- Transitions --- #
+            place_items[item.name] = item
         elif isinstance(item, TransitionItem):
-            pos = item.scenePos()
-            data["transitions"].append({
-                "name": item.name,
-                "x": pos.x(),
-                "y": pos.y()
-            })
-        # --- Arcs --- #
-        elif isinstance(item, ArcItem):
-            data["arcs"].append({
-                "place": item.backend_arc.place.name,
-                "transition": item.backend_arc.transition.name,
-                "direction": item.backend_arc.direction,
-                "weight": item.backend_arc.weight
-            })
+            transition_items[item.name] = item
+    return place_items, transition_items
 
-    with open(filename, "w") as f:
-        json.dump(data, f, indent=4)
 
+## ---- Validation des enregistrements ---- ##
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
 
-# transforme un json de sauvegarde en réseau de Petri pour la scène et le backend
-def load_petri_net(filename, scene, petri_net):
-    try:
-        with open(filename) as f:
-            data = json.load(f) # on lit le fichier
-    except Exception as e: # safety
-        return False, f"Cannot read file:\n{e}"
 
-    # safety - vérifie que les clés principales existent
-    for key in ("places", "transitions", "arcs"):
-        if key not in data:
-            return False, f"Invalid file: missing '{key}'"
+def check_name(value, what):
+    if not isinstance(value, str) or not value:
+        raise ValueError(f"Invalid {what} name: {value!r}")
+    return value
 
-    place_items = {}
-    transition_items = {}
 
-    # --- Places --- #
-    for p in data["places"]:
-        try:
-            backend_place = petri_net.add_place(name=p["name"])
-            petri_net.place_counter += 1
-            backend_place.initial_tokens = p["initial_tokens"]
-            backend_place.tokens = p["initial_tokens"]
-            
-            item = PlaceItem(p["x"], p["y"], name=backend_place.name)
-            item.tokens = backend_place.initial_tokens
-            item.draw_tokens()
-            scene.addItem(item)
-            place_items[backend_place.name] = item
-        except KeyError: # safety
-            return False, "Invalid place entry in file"
+def check_position(x, y):
+    if not is_number(x) or not is_number(y):
+        raise ValueError(f"Invalid position: {x!r}, {y!r}")
+    return float(x), float(y)
 
-    # --- Transitions --- #
-    for t in data["transitions"]:
-        try:
-            backend_t = petri_net.add_transition(name=t["name"])
-            petri_net.transition_counter += 1
-            
-            item = TransitionItem(t["x"], t["y"], name=backend_t.name)
-            scene.addItem(item)
-            transition_items[backend_t.name] = item
-        except KeyError: # safety
-            return False, "Invalid transition entry in file"
 
-    # --- Arcs --- #
-    for a in data["arcs"]:
-        try:
-            p_name = a["place"]
-            t_name = a["transition"]
+def check_transition_fields(rate, immediate, delay):
+    if not is_number(rate) or rate < 0:
+        raise ValueError(f"Invalid rate: {rate!r}")
+    if not isinstance(immediate, bool):
+        raise ValueError(f"Invalid immediate flag: {immediate!r}")
+    if not isinstance(delay, (list, tuple)) or not delay or not all(is_number(v) for v in delay[1:]):
+        raise ValueError(f"Invalid delay: {delay!r}")
+    return float(rate), immediate, check_delay(tuple(delay))
 
-            if p_name not in place_items or t_name not in transition_items:
-                continue  # safety
 
-            if a["direction"] == "place_to_transition": # on determine les items gui à relier
-                start_item = place_items[p_name]
-                end_item = transition_items[t_name]
-            else:
-                start_item = transition_items[t_name]
-                end_item = place_items[p_name]
+# Construit le backend en bloc : les enregistrements sont accumulés puis insérés par add_many
+class ModelBuilder:
+    def __init__(self, net: PetriNet):
+        self.net = net
+        self.layout = {}
+        self.places = [] # (nom, jetons)
+        self.place_attributes = [] # color_set
+        self.transitions = []
+        self.transition_attributes = [] # (taux, immédiate, délai)
+        self.arcs = []
+        self.counts = [0, 0, 0]
+
+    def add_place(self, name, tokens, color_set, x, y):
+        self.places.append((name, tokens))
+        self.place_attributes.append(color_set)
+        self.layout[name] = (x, y)
+        self.counts[0] += 1
+        if len(self.places) >= BATCH_SIZE:
+            self.flush_nodes()
+
+    def add_transition(self, name, rate, immediate, delay, x, y):
+        self.transitions.append(name)
+        self.transition_attributes.append((rate, immediate, delay))
+        self.layout[name] = (x, y)
+        self.counts[1] += 1
+        if len(self.transitions) >= BATCH_SIZE:
+            self.flush_nodes()
+
+    def add_arc(self, place, transition, direction, weight):
+        if self.places or self.transitions:
+            self.flush_nodes()
+        self.arcs.append((place, transition, direction, weight))
+        self.counts[2] += 1
+        if len(self.arcs) >= BATCH_SIZE:
+            self.flush_arcs()
+
+    def flush_nodes(self):
+        net = self.net
+        for name, _ in self.places:
+            if name in net.places or name in net.transitions:
+                raise ValueError(f"Duplicate node name '{name}'")
+        for name in self.transitions:
+            if name in net.places or name in net.transitions:
+                raise ValueError(f"Duplicate node name '{name}'")
+        places, transitions, _ = net.add_many(places=self.places, transitions=self.transitions)
+        for place, color_set in zip(places, self.place_attributes):
+            place.color_set = color_set
+        for transition, (rate, immediate, delay) in zip(transitions, self.transition_attributes):
+            transition.rate, transition.immediate, transition.delay = rate, immediate, delay
+        # les compteurs de nommage automatique avancent comme à la création
+        net.place_counter += len(places)
+        net.transition_counter += len(transitions)
+        self.places, self.place_attributes = [], []
+        self.transitions, self.transition_attributes = [], []
+
+    def flush_arcs(self):
+        net = self.net
+        for place, transition, _, _ in self.arcs:
+            if place not in net.places or transition not in net.transitions:
+                raise ValueError(f"Arc references unknown node: {place} / {transition}")
+        net.add_many(arcs=self.arcs)
+        self.arcs = []
 
+    def finish(self):
+        self.flush_nodes()
+        self.flush_arcs()
+        return self.layout
+
+
+# Lit un fichier (format compact ou JSON historique) dans le backend seulement
+# Retourne les positions nom -> (x, y) ; lève ValueError si le fichier est invalide
+def read_model(filename, net: PetriNet):
+    try:
+        with open_for_reading(filename) as f:
+            first = f.readline()
             try:
-                arc_backend = petri_net.add_arc(start_item.name, end_item.name, weight=a["weight"]) # on crée l'arc dans le backend
-            except Exception as e: # safety
-                return False, "Arc creation failed on backend"
+                header = json.loads(first)
+            except json.JSONDecodeError:
+                header = None # JSON historique indenté : la première ligne seule n'est pas un document
+            if isinstance(header, dict) and header.get("format") == FORMAT_NAME:
+                return read_records(f, header, net)
+        # format historique : on relit le document entier (les flux compressés ne reviennent pas en arrière)
+        with open_for_reading(filename) as f:
+            data = json.load(f)
+    except OSError as e:
+        raise ValueError(f"Cannot read file:\n{e}")
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid file:\n{e}")
+    return read_legacy(data, net)
 
-            item = ArcItem(start_item, end_item, weight=a["weight"], arc=arc_backend) # on crée l'arc dans la scène
-            scene.addItem(item)
-            start_item.add_arc(item)
-            end_item.add_arc(item)
 
-        except KeyError: # safety
+def read_records(f, header, net):
+    version = header.get("version")
+    if not isinstance(version, int) or version > FORMAT_VERSION:
+        raise ValueError(f"Unsupported format version {version!r} (this editor reads up to {FORMAT_VERSION})")
+    builder = ModelBuilder(net)
+    end = None
+    for number, line in enumerate(f, start=2):
+        if not line.strip():
             continue
+        if end is not None:
+            raise ValueError(f"Line {number}: data after end record")
+        try:
+            record = json.loads(line)
+            kind = record[0]
+            if kind == "P" and len(record) == 6:
+                _, name, tokens, color_set, x, y = record
+                if not isinstance(color_set, str):
+                    raise ValueError(f"Invalid color set: {color_set!r}")
+                builder.add_place(check_name(name, "place"), check_count(tokens, "token count"),
+                                  color_set, *check_position(x, y))
+            elif kind == "T" and len(record) == 7:
+                _, name, rate, immediate, delay, x, y = record
+                builder.add_transition(check_name(name, "transition"),
+                                       *check_transition_fields(rate, immediate, delay), *check_position(x, y))
+            elif kind == "A" and len(record) == 5:
+                _, place, transition, direction, weight = record
+                if direction not in ("in", "out"):
+                    raise ValueError(f"Invalid arc direction: {direction!r}")
+                builder.add_arc(check_name(place, "place"), check_name(transition, "transition"),
+                                "place_to_transition" if direction == "in" else "transition_to_place",
+                                check_count(weight, "arc weight", minimum=1))
+            elif kind == "E" and len(record) == 4:
+                end = record[1:]
+            else:
+                raise ValueError(f"Unknown record {record[:1]!r} with {len(record)} fields")
+        except (ValueError, TypeError, IndexError, KeyError) as e:
+            raise ValueError(f"Line {number}: {e}")
+    if end is None:
+        raise ValueError("Truncated file: missing end record")
+    layout = builder.finish()
+    if list(end) != builder.counts:
+        raise ValueError(f"Record counts {builder.counts} do not match end record {list(end)}")
+    return layout
+
+
+# Ancien format JSON : même validation, insertion en bloc
+def read_legacy(data, net):
+    if not isinstance(data, dict):
+        raise ValueError("Invalid file: expected a JSON object")
+    # safety - vérifie que les clés principales existent
+    for key in ("places", "transitions", "arcs"):
+        if key not in data:
+            raise ValueError(f"Invalid file: missing '{key}'")
+    builder = ModelBuilder(net)
+    try:
+        for p in data["places"]:
+            builder.add_place(check_name(p["name"], "place"), check_count(p["initial_tokens"], "token count"),
+                              p.get("color_set", "Integer"), *check_position(p["x"], p["y"]))
+        for t in data["transitions"]:
+            # taux et délais absents des anciennes sauvegardes
+            fields = check_transition_fields(t.get("rate", 1.0), t.get("immediate", False),
+                                             t.get("delay", ["deterministic", 0.0]))
+            builder.add_transition(check_name(t["name"], "transition"), *fields, *check_position(t["x"], t["y"]))
+        builder.flush_nodes()
+        for a in data["arcs"]:
+            if a["place"] not in net.places or a["transition"] not in net.transitions:
+                continue # safety : arc orphelin ignoré, comme auparavant
+            if a.get("direction") not in ("place_to_transition", "transition_to_place"):
+                raise ValueError(f"Invalid arc direction: {a.get('direction')!r}")
+            builder.add_arc(a["place"], a["transition"], a["direction"],
+                            check_count(a.get("weight", 1), "arc weight", minimum=1))
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid entry in file: {e}")
+    return builder.finish()
+
+
+# charge un fichier dans le backend et la scène
+def load_petri_net(filename, scene, petri_net):
+    try:
+        layout = read_model(filename, petri_net)
+    except ValueError as e: # safety
+        petri_net.wipe()
+        return False, str(e)
+    place_items, transition_items, _ = populate_scene(scene, petri_net, layout)
+    return True, "OK", place_items, transition_items # on retourne les index des items créés
+
+
+# crée les items de la scène pour un réseau déjà construit dans le backend
+# layout : nom -> (x, y) ; les noeuds sans position sont rangés sur une grille sous le modèle
+def populate_scene(scene, net: PetriNet, layout):
+    steps = populate_scene_chunks(scene, net, layout, chunk=None)
+    while True:
+        try:
+            next(steps)
+        except StopIteration as done:
+            return done.value
+
+
+# même chose par paquets de `chunk` items : le générateur rend la main (nombre d'items créés)
+# après chaque paquet et retourne les index des items à la fin ; chunk=None crée tout d'un coup
+def populate_scene_chunks(scene, net: PetriNet, layout, chunk=SCENE_CHUNK):
+    place_items = {}
+    transition_items = {}
+    arc_items = {}
+    missing = [name for name in list(net.places) + list(net.transitions) if name not in layout]
+    if missing:
+        bottom = max((y for _, y in layout.values()), default=-GRID_STEP) + GRID_STEP
+        columns = max(1, int(len(missing) ** 0.5))
+        layout = dict(layout)
+        for i, name in enumerate(missing):
+            layout[name] = ((i % columns) * GRID_STEP, bottom + (i // columns) * GRID_STEP)
 
-    return True, "OK", place_items, transition_items # on retourne la liste des items créés et des indications de succès
\ No newline at end of file
+    created = 0
+    for place in net.places.values():
+        x, y = layout[place.name]
+        item = PlaceItem(x, y, name=place.name)
+        item.tokens = place.initial_tokens
+        item.color_set = place.color_set
+        item.draw_tokens()
+        scene.addItem(item)
+        place_items[place.name] = item
+        created += 1
+        if chunk and created % chunk == 0:
+            yield created
+    for transition in net.transitions.values():
+        x, y = layout[transition.name]
+        item = TransitionItem(x, y, name=transition.name)
+        scene.addItem(item)
+        transition_items[transition.name] = item
+        created += 1
+        if chunk and created % chunk == 0:
+            yield created
+    for arc in net.arcs:
+        p_item, t_item = place_items[arc.place.name], transition_items[arc.transition.name]
+        start_item, end_item = (p_item, t_item) if arc.direction == "place_to_transition" else (t_item, p_item)
+        item = ArcItem(start_item, end_item, weight=arc.weight, arc=arc)
+        scene.addItem(item)
+        start_item.add_arc(item)
+        end_item.add_arc(item)
+        arc_items[arc] = item
+        created += 1
+        if chunk and created % chunk == 0:
+            yield created
+    return place_items, transition_items, arc_items
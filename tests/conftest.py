@@ -0,0 +1,51 @@
+# tests/conftest.py
+# Réseaux partagés par les tests : modèles des benchmarks et réseaux aléatoires bornés
+
+import random
+from logic.petri_net import PetriNet
+from benchmarks.generators import philosophers, producer_consumer, token_ring, kanban, fms, job_shop
+
+# petites instances des générateurs (quelques centaines d'états au plus)
+MODELS = {
+    "philosophers": lambda: philosophers(3),
+    "producer_consumer": lambda: producer_consumer(2),
+    "token_ring": lambda: token_ring(3),
+    "kanban": lambda: kanban(1),
+    "fms": lambda: fms(1),
+    "job_shop": lambda: job_shop(2),
+}
+
+
+# Réseau aléatoire borné : chaque transition consomme au moins autant de jetons qu'elle en produit,
+# le nombre total de jetons ne peut donc pas augmenter.
+def random_net(seed, places=5, transitions=5):
+    rng = random.Random(seed)
+    net = PetriNet()
+    for p in range(places):
+        net.add_place()
+        net.set_tokens(f"P{p}", rng.randint(1, 3))
+    for t in range(transitions):
+        name = net.add_transition().name
+        inputs = rng.sample(range(places), rng.randint(1, 2))
+        weights = {p: 1 if rng.random() < 0.7 else 2 for p in inputs}
+        for p, w in weights.items():
+            net.add_arc(f"P{p}", name, w)
+        # la plupart des transitions conservent les jetons, les autres en détruisent
+        budget = sum(weights.values()) - (rng.random() < 0.3) * rng.randint(1, sum(weights.values()))
+        outputs = {}
+        for _ in range(budget):
+            p = rng.randrange(places)
+            outputs[p] = outputs.get(p, 0) + 1
+        for p, w in outputs.items():
+            net.add_arc(name, f"P{p}", w)
+    return net
+
+
+# Rejoue une trace (noms de transitions) depuis le marquage initial ; retourne le marquage atteint
+def replay(cn, trace):
+    m = tuple(cn.initial)
+    for name in trace:
+        t = cn.transition_index[name]
+        assert cn.is_enabled(m, t), f"{name} is not enabled"
+        m = cn.fire(m, t)
+    return m
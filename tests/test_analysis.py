@@ -0,0 +1,37 @@
+# tests/test_analysis.py
+# Génération de l'espace d'états pour le visualiseur
+
+from logic.petri_net import PetriNet
+from logic.analysis import StateSpaceVisualizer, build_state_space
+from logic.metrics import ExplorationMetrics
+from benchmarks.generators import philosophers
+
+
+def test_blocked_initial_marking_is_drawn_as_deadlock():
+    net = PetriNet()
+    net.add_place()
+    net.add_transition()
+    net.add_arc("P0", "T0")
+    viz = StateSpaceVisualizer()
+    build_state_space(net, viz)
+    assert viz.graph.nodes[0]["color"] == "#FF7F7F"
+
+
+def test_live_initial_marking_is_green():
+    net = PetriNet()
+    net.add_place()
+    net.add_transition()
+    net.set_tokens("P0", 1)
+    net.add_arc("P0", "T0")
+    net.add_arc("T0", "P0")
+    viz = StateSpaceVisualizer()
+    build_state_space(net, viz)
+    assert viz.graph.nodes[0]["color"] == "#90EE90"
+
+
+# Le temps passé à étiqueter les marquages est compté dans la phase "labeling"
+def test_labeling_phase_is_timed():
+    metrics = ExplorationMetrics()
+    graph = build_state_space(philosophers(3), StateSpaceVisualizer(), metrics=metrics)
+    assert metrics.times["labeling"] > 0
+    assert metrics.states == graph.num_states
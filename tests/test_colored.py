@@ -0,0 +1,44 @@
+# tests/test_colored.py
+# Réseaux colorés : expressions restreintes et dépliage
+
+import pytest
+from logic.colored import ColoredPetriNet, ColorSet, Expression, Multiset, int_range
+from logic.compiled import CompiledNet
+from logic.reachability import explore
+
+
+def ring(shift):
+    D = int_range("D", 0, 2)
+    net = ColoredPetriNet()
+    net.declare("x", D)
+    net.add_place("A", D, initial=Multiset({0: 1, 1: 1}))
+    net.add_transition("t", guard="x < 2 or x == 2")
+    net.add_arc("A", "t", "place_to_transition", f"x + {shift}" if shift else "x")
+    net.add_arc("A", "t", "transition_to_place", "(x + 1) % 3")
+    return net
+
+
+def test_unfolding_matches_colored_exploration():
+    net = ring(0)
+    assert explore(CompiledNet(net.unfold())).num_states == net.explore().num_states
+
+
+@pytest.mark.parametrize("text", ["x.__class__", "__import__('os')", "[y for y in range(3)]",
+                                  "open('f')", "lambda: 1", "min(x, key=abs)"])
+def test_expressions_reject_unsafe_syntax(text):
+    with pytest.raises(ValueError):
+        Expression(text)
+
+
+def test_input_color_outside_color_set():
+    with pytest.raises(ValueError, match="outside 'D'"):
+        ring(5).unfold()
+
+
+# Deux couleurs de même texte (1 et "1") restent deux places distinctes après dépliage
+def test_unfolded_names_distinguish_colors():
+    mixed = ColorSet("Mixed", values=[1, "1", (1, "1")])
+    net = ColoredPetriNet()
+    net.add_place("A", mixed, initial=Multiset({1: 1, "1": 2, (1, "1"): 3}))
+    flat = net.unfold()
+    assert sorted(p.initial_tokens for p in flat.places.values()) == [1, 2, 3]
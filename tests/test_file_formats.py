@@ -0,0 +1,111 @@
+# tests/test_file_formats.py
+# Sauvegarde puis relecture : format compact, JSON historique et PNML
+
+import io
+import pytest
+from logic.petri_net import PetriNet
+from logic.pnml import read_pnml, write_pnml
+from logic.updownload import write_model, read_model, write_snapshot, snapshot_model
+from conftest import MODELS, random_net
+
+
+# Réseau avec tous les attributs du modèle, et un nom à échapper en XML
+def attributed_net():
+    net = random_net(5)
+    net.add_many(places=[("a<b & \"c\"", 4, "String")],
+                 transitions=[("U", 2.5, True, ("uniform", 1.0, 2.0)), ("V", 0.25, False, ("normal", 3.0, 0.5))],
+                 arcs=[("a<b & \"c\"", "U", "place_to_transition", 3), ("a<b & \"c\"", "V", "transition_to_place", 2)])
+    return net
+
+
+def layout_of(net):
+    names = list(net.places) + list(net.transitions)
+    return {name: (10.0 * i, -2.5 * i) for i, name in enumerate(names)}
+
+
+def structure(net):
+    places = [(name, p.initial_tokens) for name, p in net.places.items()]
+    arcs = sorted((a.place.name, a.transition.name, a.direction, a.weight) for a in net.arcs)
+    return places, list(net.transitions), arcs
+
+
+def attributes(net):
+    return ([p.color_set for p in net.places.values()],
+            [(t.rate, t.immediate, tuple(t.delay)) for t in net.transitions.values()])
+
+
+@pytest.mark.parametrize("extension", [".petri", ".petri.gz", ".json"])
+def test_model_round_trip(tmp_path, extension):
+    net = attributed_net()
+    layout = layout_of(net)
+    filename = str(tmp_path / f"model{extension}")
+    if extension == ".json":
+        write_snapshot(filename, snapshot_model(net, layout))
+    else:
+        write_model(filename, net, layout)
+    loaded = PetriNet()
+    assert read_model(filename, loaded) == layout
+    assert structure(loaded) == structure(net)
+    assert attributes(loaded) == attributes(net)
+
+
+# Un fichier compact tronqué (sans enregistrement de fin) est refusé
+def test_truncated_model_is_rejected(tmp_path):
+    net = attributed_net()
+    filename = str(tmp_path / "model.petri")
+    write_model(filename, net, layout_of(net))
+    with open(filename) as f:
+        lines = f.readlines()
+    with open(filename, "w") as f:
+        f.writelines(lines[:-1])
+    with pytest.raises(ValueError, match="Truncated"):
+        read_model(filename, PetriNet())
+
+
+@pytest.mark.parametrize("name", list(MODELS))
+def test_pnml_round_trip(name):
+    net = MODELS[name]()
+    layout = layout_of(net)
+    buffer = io.StringIO()
+    write_pnml(buffer, net, layout)
+    loaded, loaded_layout = read_pnml(io.BytesIO(buffer.getvalue().encode("utf-8")))
+    assert structure(loaded) == structure(net)
+    assert loaded_layout == layout
+
+
+def test_pnml_file_round_trip(tmp_path):
+    net = attributed_net()
+    layout = layout_of(net)
+    filename = str(tmp_path / "model.pnml")
+    write_pnml(filename, net, layout)
+    loaded, loaded_layout = read_pnml(filename)
+    assert structure(loaded) == structure(net)
+    assert loaded_layout == layout
+
+
+# Un instantané enregistré sous une extension .pnml est écrit en PNML
+def test_snapshot_dispatches_to_pnml(tmp_path):
+    net = attributed_net()
+    layout = layout_of(net)
+    filename = str(tmp_path / "model.pnml")
+    write_snapshot(filename, snapshot_model(net, layout))
+    loaded, loaded_layout = read_pnml(filename)
+    assert structure(loaded) == structure(net)
+    assert loaded_layout == layout
+
+
+# Inscriptions et marquages invalides : refusés comme par le format compact, avec l'identifiant
+@pytest.mark.parametrize("inscription", ["-3", "0", "abc"])
+def test_pnml_rejects_invalid_arc_weight(inscription):
+    text = ('<pnml><net id="n"><page id="g"><place id="p"/><transition id="t"/>'
+            f'<arc id="a7" source="p" target="t"><inscription><text>{inscription}</text></inscription></arc>'
+            '</page></net></pnml>')
+    with pytest.raises(ValueError, match="arc 'a7'"):
+        read_pnml(io.BytesIO(text.encode("utf-8")))
+
+
+def test_pnml_rejects_negative_marking():
+    text = ('<pnml><net id="n"><page id="g"><place id="p"><initialMarking><text>-1</text></initialMarking>'
+            '</place></page></net></pnml>')
+    with pytest.raises(ValueError, match="place 'p'"):
+        read_pnml(io.BytesIO(text.encode("utf-8")))
@@ -0,0 +1,100 @@
+# tests/test_hierarchy.py
+# Analyse compositionnelle comparée à l'exploration du réseau à plat
+
+import random
+import pytest
+from logic.petri_net import PetriNet
+from logic.compiled import CompiledNet
+from logic.reachability import explore
+from logic.hierarchy import Module, HierarchicalNet, compose
+from benchmarks.generators import machine_cells
+
+
+# Module aléatoire : des jetons circulent entre places internes (borné même ports toujours
+# disponibles) ; certaines transitions déplacent aussi un jeton d'un port vers un autre
+def random_module(rng, name):
+    net = PetriNet()
+    for i in range(4):
+        net.add_place(f"I{i}")
+    net.set_tokens("I0", 1)
+    net.set_tokens(f"I{rng.randrange(4)}", 1)
+    for port in ("a", "b"):
+        net.add_place(port)
+    for t in range(rng.randint(3, 5)):
+        name_t = net.add_transition().name
+        src, dst = rng.sample(range(4), 2)
+        net.add_arc(f"I{src}", name_t)
+        net.add_arc(name_t, f"I{dst}")
+        if rng.random() < 0.5:
+            x, y = rng.choice("ab"), rng.choice("ab")
+            net.add_arc(x, name_t)
+            net.add_arc(name_t, y)
+    return Module(name, net, ["a", "b"])
+
+
+def random_hierarchy(seed):
+    rng = random.Random(seed)
+    hnet = HierarchicalNet()
+    for f in range(3):
+        hnet.add_fusion_place(f"F{f}", rng.randint(0, 2))
+    modules = [random_module(rng, f"M{m}") for m in range(2)]
+    bindings = []
+    for i in range(rng.randint(2, 3)):
+        if bindings and rng.random() < 0.3:
+            module, binding = bindings[-1] # instance interchangeable avec la précédente
+        else:
+            module, binding = rng.choice(modules), {"a": f"F{rng.randrange(3)}", "b": f"F{rng.randrange(3)}"}
+        bindings.append((module, binding))
+        hnet.add_instance(f"i{i}", module, binding)
+    return hnet
+
+
+# Marquages accessibles des places de fusion et présence de blocage, sur le réseau à plat
+def flat_reference(hnet):
+    cn = CompiledNet(hnet.flatten())
+    graph = explore(cn)
+    columns = [cn.place_index[name] for name in hnet.fusion]
+    return {tuple(m[p] for p in columns) for m in graph.markings}, bool(graph.deadlocks)
+
+
+# Chaîne de pas internes menant à un blocage : elle ne doit pas être prise pour une divergence
+def test_internal_chain_keeps_deadlock():
+    net = PetriNet()
+    net.add_many(places=[("I0", 1), ("I1", 0), ("I2", 1), ("port", 0)], transitions=["t0", "t1"],
+                 arcs=[("I2", "t0", "place_to_transition", 1), ("I1", "t0", "transition_to_place", 1),
+                       ("I1", "t1", "place_to_transition", 1), ("I0", "t1", "transition_to_place", 1)])
+    hnet = HierarchicalNet()
+    hnet.add_fusion_place("F")
+    hnet.add_instance("m", Module("chain", net, ["port"]), {"port": "F"})
+    assert compose(hnet).deadlocks > 0
+
+
+# Cycle interne (divergent) dont on peut sortir vers un blocage : le blocage reste compté
+def test_divergent_cycle_keeps_deadlock_exit():
+    net = PetriNet()
+    net.add_many(places=[("I0", 0), ("I1", 1), ("I2", 0), ("port", 0)], transitions=["t0", "t1", "t2"],
+                 arcs=[("I1", "t0", "place_to_transition", 1), ("I2", "t0", "transition_to_place", 1),
+                       ("I2", "t1", "place_to_transition", 1), ("I1", "t1", "transition_to_place", 1),
+                       ("I1", "t2", "place_to_transition", 1), ("I0", "t2", "transition_to_place", 1)])
+    hnet = HierarchicalNet()
+    hnet.add_fusion_place("F")
+    hnet.add_instance("m", Module("loop", net, ["port"]), {"port": "F"})
+    assert compose(hnet).deadlocks > 0
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_compose_matches_flat_net(seed):
+    hnet = random_hierarchy(seed)
+    markings, deadlock = flat_reference(hnet)
+    result = compose(hnet)
+    assert result.complete
+    assert result.fusion_markings == markings
+    assert (result.deadlocks > 0) == deadlock
+
+
+def test_compose_matches_flat_benchmark():
+    hnet = machine_cells(3)
+    markings, deadlock = flat_reference(hnet)
+    result = compose(hnet)
+    assert result.fusion_markings == markings
+    assert (result.deadlocks > 0) == deadlock
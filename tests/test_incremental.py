@@ -0,0 +1,57 @@
+# tests/test_incremental.py
+# Le graphe repris par l'analyse incrémentale doit être celui d'une exploration complète du réseau modifié
+
+import random
+import pytest
+from conftest import random_net
+from logic.compiled import CompiledNet
+from logic.incremental import IncrementalAnalyzer
+from logic.reachability import explore
+
+
+# Graphe comparable entre deux numérotations d'états : arcs (marquage, transition, marquage) et blocages
+def canonical(graph):
+    cn, markings = graph.cn, graph.markings
+    edges = {(markings[s], cn.transition_names[t], markings[d]) for s, d, t in graph.edges()}
+    return set(markings), edges, {markings[s] for s in graph.deadlocks}
+
+
+def check_against_explore(analyzer, net, edit):
+    result = analyzer.analyze(net)
+    assert result.edit == edit
+    fresh = explore(CompiledNet(net))
+    assert result.graph.complete and fresh.complete
+    assert canonical(result.graph) == canonical(fresh)
+    return result
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_edits_match_fresh_exploration(seed):
+    rng = random.Random(seed)
+    net = random_net(seed)
+    analyzer = IncrementalAnalyzer()
+    check_against_explore(analyzer, net, "initial")
+    check_against_explore(analyzer, net, "none")
+
+    net.set_tokens(f"P{rng.randrange(5)}", rng.randint(0, 3))
+    if analyzer.graph.cn.initial != CompiledNet(net).initial:
+        result = check_against_explore(analyzer, net, "marking")
+        assert result.computed_edges == 0 or result.reused_edges > 0
+
+    # un poids d'entrée plus fort garde le réseau borné
+    arc = rng.choice([a for a in net.arcs if a.direction == "place_to_transition"])
+    arc.weight += 1
+    result = check_against_explore(analyzer, net, "transitions")
+    assert result.changed_transitions == [arc.transition.name]
+
+    name = net.add_transition().name
+    net.add_arc(f"P{rng.randrange(5)}", name)
+    net.add_arc(name, f"P{rng.randrange(5)}")
+    result = check_against_explore(analyzer, net, "transitions")
+    assert result.changed_transitions == [name]
+
+    net.delete_transition("T0")
+    check_against_explore(analyzer, net, "transitions")
+
+    net.add_place()
+    check_against_explore(analyzer, net, "structure")
@@ -0,0 +1,142 @@
+# tests/test_model_checking.py
+# Vérification de formules : réseau réduit et réseau d'origine doivent donner le même verdict,
+# et le même que l'évaluation exhaustive des opérateurs CTL sur le graphe d'accessibilité
+
+from logic.petri_net import PetriNet
+from logic.compiled import CompiledNet
+from logic.reachability import explore
+from logic.model_checking import check_formula
+from conftest import random_net, replay
+
+
+# p -> t1 -> {s, k}, s -> t2 -> r, r -> X -> z
+def chain_net():
+    net = PetriNet()
+    for name in ("p", "s", "k", "r", "z"):
+        net.add_place(name)
+    for name in ("t1", "t2", "X"):
+        net.add_transition(name)
+    net.set_tokens("p", 1)
+    for a, b in [("p", "t1"), ("t1", "s"), ("t1", "k"), ("s", "t2"), ("t2", "r"), ("r", "X"), ("X", "z")]:
+        net.add_arc(a, b)
+    return net
+
+
+# les pré-places de X ne doivent pas être fusionnées : l'état où X n'est pas encore tirable existe
+def test_enabled_atom_keeps_pre_places():
+    net = chain_net()
+    formula = "EF (k==1 & z==0 & !enabled(X))"
+    assert check_formula(net, formula).holds
+    assert check_formula(net, formula, reduce=True).holds
+
+
+# les formules sur les chemins ne passent pas par la réduction
+def test_path_formulas_same_verdict_with_reduction():
+    net = chain_net()
+    for formula in ("EG (z==0)", "AF (z==1)", "E[p==1 U k==1]", "A[z==0 U r==1]", "F z==1", "p==1 U s==1"):
+        assert check_formula(net, formula).holds == check_formula(net, formula, reduce=True).holds, formula
+
+
+## ---- Comparaison avec une évaluation exhaustive sur le graphe d'accessibilité ---- ##
+# Atomes : texte de la formule et prédicat sur le marquage
+ATOMS = {
+    "P0 >= 1": lambda cn, m: m[0] >= 1,
+    "P1 + P2 <= 2": lambda cn, m: m[1] + m[2] <= 2,
+    "2*P3 > P4": lambda cn, m: 2 * m[3] > m[4],
+    "deadlock": lambda cn, m: not cn.enabled(m),
+    "enabled(T0)": lambda cn, m: cn.is_enabled(m, 0),
+    "!enabled(T1) | P0 == 0": lambda cn, m: not cn.is_enabled(m, 1) or m[0] == 0,
+}
+
+
+# Ensembles d'états (numéros) qui satisfont les opérateurs CTL, chemins maximaux (un blocage les termine)
+class BruteForce:
+    def __init__(self, graph):
+        self.graph = graph
+        self.states = set(range(graph.num_states))
+        self.successors = [set() for _ in self.states]
+        for s, d, _ in graph.edges():
+            self.successors[s].add(d)
+        self.dead = set(graph.deadlocks)
+
+    def atom(self, predicate):
+        cn = self.graph.cn
+        return {s for s in self.states if predicate(cn, self.graph.markings[s])}
+
+    def EU(self, f, g):
+        result = set(g)
+        changed = True
+        while changed:
+            added = {s for s in f - result if self.successors[s] & result}
+            result |= added
+            changed = bool(added)
+        return result
+
+    def AU(self, f, g):
+        result = set(g)
+        changed = True
+        while changed:
+            added = {s for s in f - result - self.dead if self.successors[s] <= result}
+            result |= added
+            changed = bool(added)
+        return result
+
+    def EG(self, f):
+        result = set(f)
+        changed = True
+        while changed:
+            removed = {s for s in result if s not in self.dead and not self.successors[s] & result}
+            result -= removed
+            changed = bool(removed)
+        return result
+
+    def check(self, op, f, g=None):
+        everything = self.states
+        if op == "EF":
+            return self.EU(everything, f)
+        if op == "AG":
+            return everything - self.EU(everything, everything - f)
+        if op == "EG":
+            return self.EG(f)
+        if op == "AF":
+            return everything - self.EG(everything - f)
+        if op == "EU":
+            return self.EU(f, g)
+        return self.AU(f, g)
+
+
+TEMPLATES = {
+    "EF": "EF ({0})", "AG": "AG ({0})", "EG": "EG ({0})", "AF": "AF ({0})",
+    "EU": "E[({0}) U ({1})]", "AU": "A[({0}) U ({1})]",
+}
+LTL = {"AG": "G ({0})", "AF": "F ({0})", "AU": "({0}) U ({1})"}
+
+
+def test_verdicts_match_brute_force():
+    atoms = list(ATOMS)
+    for seed in range(10):
+        net = random_net(seed)
+        cn = CompiledNet(net)
+        brute = BruteForce(explore(cn))
+        for i, a in enumerate(atoms):
+            b = atoms[(i + 1 + seed) % len(atoms)]
+            f, g = brute.atom(ATOMS[a]), brute.atom(ATOMS[b])
+            for op, template in TEMPLATES.items():
+                expected = 0 in brute.check(op, f, g)
+                text = template.format(a, b)
+                assert check_formula(net, text).holds == expected, (seed, text)
+                assert check_formula(net, text, reduce=True).holds == expected, (seed, text)
+                if op in LTL:
+                    assert check_formula(net, LTL[op].format(a, b)).holds == expected, (seed, LTL[op])
+
+
+# Le témoin de EF mène à un marquage qui satisfait la formule
+def test_reachability_witness_replays():
+    for seed in range(10):
+        net = random_net(seed)
+        cn = CompiledNet(net)
+        for reduce in (False, True):
+            verdict = check_formula(net, "EF (deadlock & P0 >= 1)", reduce=reduce)
+            if verdict.holds:
+                m = replay(cn, verdict.trace)
+                assert not cn.enabled(m) and m[0] >= 1
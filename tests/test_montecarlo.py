@@ -0,0 +1,43 @@
+# tests/test_montecarlo.py
+# Marches aléatoires : statistiques d'un réseau déterministe et reproductibilité
+
+from logic.petri_net import PetriNet
+from logic.montecarlo import run_monte_carlo
+from benchmarks.generators import philosophers
+
+
+# A -> t1 -> B -> t2 -> C : chaque marche se bloque après deux tirs
+def chain_net():
+    net = PetriNet()
+    net.add_many(places=[("A", 1), ("B", 0), ("C", 0)], transitions=["t1", "t2"],
+                 arcs=[("A", "t1", "place_to_transition", 1), ("B", "t1", "transition_to_place", 1),
+                       ("B", "t2", "place_to_transition", 1), ("C", "t2", "transition_to_place", 1)])
+    return net
+
+
+def test_deterministic_chain_statistics():
+    stats = run_monte_carlo(chain_net(), walks=10, max_steps=100, workers=1)
+    assert stats.deadlock_probability == 1.0
+    assert stats.mean_time_to_deadlock() == 2
+    assert stats.firing_frequencies() == {"t1": 0.5, "t2": 0.5}
+    # chaque place est occupée un pas sur les trois marquages de la marche
+    assert stats.mean_tokens() == {"A": 1 / 3, "B": 1 / 3, "C": 1 / 3}
+    assert stats.max_tokens_dict() == {"A": 1, "B": 1, "C": 1}
+
+
+# Sans blocage, chaque marche s'arrête à max_steps
+def test_walks_stop_at_max_steps():
+    net = chain_net()
+    net.add_many(transitions=["t3"], arcs=[("C", "t3", "place_to_transition", 1), ("A", "t3", "transition_to_place", 1)])
+    stats = run_monte_carlo(net, walks=5, max_steps=7, workers=1)
+    assert (stats.walks, stats.total_steps, stats.deadlocks) == (5, 35, 0)
+    assert stats.mean_time_to_deadlock() is None
+
+
+# Même graine : même résultat, quel que soit le nombre de workers
+def test_result_depends_only_on_seed():
+    net = philosophers(4)
+    serial = run_monte_carlo(net, walks=200, max_steps=50, seed=3, workers=1).summary()
+    parallel = run_monte_carlo(net, walks=200, max_steps=50, seed=3, workers=2).summary()
+    assert serial == parallel
+    assert serial != run_monte_carlo(net, walks=200, max_steps=50, seed=4, workers=1).summary()
@@ -0,0 +1,14 @@
+# tests/test_parameter_sweep.py
+# Balayage de paramètres comparé à une exploration directe de chaque point
+
+from logic.compiled import CompiledNet
+from logic.reachability import explore, explore_batched
+from logic.parameter_sweep import graph_properties
+from conftest import MODELS
+
+
+# Les deux représentations des arcs (array('l') et tableaux int64) donnent les mêmes propriétés
+def test_graph_properties_same_for_both_graph_types():
+    for build in MODELS.values():
+        cn = CompiledNet(build())
+        assert graph_properties(explore(cn)) == graph_properties(explore_batched(cn))
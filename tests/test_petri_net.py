@@ -0,0 +1,23 @@
+# tests/test_petri_net.py
+# Opérations groupées du réseau
+
+from logic.petri_net import PetriNet
+
+
+def test_add_many_accepts_generators():
+    net = PetriNet()
+    net.add_many(places=((f"Q{i}", i) for i in range(3)))
+    assert [p.initial_tokens for p in net.places.values()] == [0, 1, 2]
+
+
+def test_add_many_keeps_model_attributes():
+    net = PetriNet()
+    places, transitions, arcs = net.add_many(
+        places=[("P", 2, "String")],
+        transitions=["T", ("U", 2.5, True, ("uniform", 1.0, 2.0))],
+        arcs=[("P", "U", "place_to_transition", 3)])
+    assert places[0].color_set == "String" and places[0].tokens == 2
+    assert transitions[0].rate == 1.0 and not transitions[0].immediate
+    u = net.transitions["U"]
+    assert (u.rate, u.immediate, u.delay) == (2.5, True, ("uniform", 1.0, 2.0))
+    assert arcs[0].weight == 3
@@ -0,0 +1,130 @@
+# tests/test_reachability.py
+# Explorateurs de logic/reachability.py comparés à l'exploration exacte
+
+from collections import deque
+import pytest
+from logic.compiled import CompiledNet
+from logic.metrics import ExplorationHook, ExplorationMetrics
+from logic.reachability import explore, explore_batched, bitstate_search, find_deadlocks, find_marking, sweep_line
+from benchmarks.generators import philosophers, job_shop, job_shop_progress
+from conftest import MODELS, random_net, replay
+
+CASES = [(name, lambda build=build: CompiledNet(build())) for name, build in MODELS.items()]
+CASES += [(f"random{seed}", lambda seed=seed: CompiledNet(random_net(seed))) for seed in range(8)]
+
+
+# Garde les états et blocages annoncés par les hooks
+class Recorder(ExplorationHook):
+    def __init__(self):
+        self.states = {}
+        self.deadlocks = []
+
+    def on_state(self, state_id, marking):
+        self.states[state_id] = tuple(int(v) for v in marking)
+
+    def on_deadlock(self, state_id):
+        self.deadlocks.append(state_id)
+
+
+def test_bitstate_hooks_mark_dead_states():
+    cn = CompiledNet(philosophers(4))
+    recorder = Recorder()
+    result = bitstate_search(cn, traces=False, metrics=ExplorationMetrics(listeners=[recorder]))
+    graph = explore(cn)
+    assert result.num_states == graph.num_states
+    assert sorted(recorder.states[i] for i in recorder.deadlocks) == sorted(graph.markings[i] for i in graph.deadlocks)
+
+
+# Distances depuis le marquage initial dans le graphe d'accessibilité
+def distances(graph):
+    successors = [[] for _ in range(graph.num_states)]
+    for s, d, _ in graph.edges():
+        successors[s].append(d)
+    distance = {0: 0}
+    queue = deque([0])
+    while queue:
+        s = queue.popleft()
+        for d in successors[s]:
+            if d not in distance:
+                distance[d] = distance[s] + 1
+                queue.append(d)
+    return distance
+
+
+# A* avec l'équation d'état : traces exécutables et de longueur minimale
+@pytest.mark.parametrize("name, make", CASES)
+def test_find_marking_shortest_trace(name, make):
+    cn = make()
+    graph = explore(cn)
+    distance = distances(graph)
+    for state_id in range(0, graph.num_states, max(1, graph.num_states // 5)):
+        target = graph.markings[state_id]
+        result = find_marking(cn, dict(enumerate(target)))
+        assert result.reachable
+        assert replay(cn, result.trace) == target
+        assert len(result.trace) == distance[state_id]
+
+
+@pytest.mark.parametrize("name, make", CASES)
+def test_find_deadlocks_traces_replay(name, make):
+    cn = make()
+    graph = explore(cn)
+    found, explored, complete = find_deadlocks(cn, limit=None)
+    assert complete and explored == graph.num_states
+    assert sorted(tuple(d.marking[p] for p in cn.place_names) for d in found) == \
+        sorted(graph.markings[i] for i in graph.deadlocks)
+    for d in found:
+        m = replay(cn, d.trace)
+        assert cn.marking_dict(m) == d.marking and not cn.enabled(m)
+
+
+# Sans régression de la mesure, le balayage compte chaque état une seule fois
+def test_sweep_line_matches_explore():
+    net = job_shop(3)
+    cn = CompiledNet(net)
+    graph = explore(cn)
+    result = sweep_line(cn, job_shop_progress(3))
+    assert result.exact
+    assert result.num_states == graph.num_states
+    assert result.num_edges == graph.num_edges
+    assert len(result.deadlocks) == len(graph.deadlocks)
+
+
+@pytest.mark.parametrize("name, make", CASES)
+def test_bitstate_counts_every_state(name, make):
+    cn = make()
+    graph = explore(cn)
+    result = bitstate_search(cn)
+    assert result.num_states == graph.num_states
+    assert sorted(tuple(d.marking[p] for p in cn.place_names) for d in result.deadlocks) == \
+        sorted(graph.markings[i] for i in graph.deadlocks)
+    for d in result.deadlocks:
+        assert cn.marking_dict(replay(cn, d.trace)) == d.marking
+
+
+# Graphe comme ensemble d'arcs entre marquages (les numéros d'états dépendent de l'ordre de visite)
+def edge_set(graph):
+    markings = graph.markings
+    return {(markings[s], markings[d], t) for s, d, t in graph.edges()}
+
+
+@pytest.mark.parametrize("name, make", CASES)
+def test_batched_matches_explore(name, make):
+    cn = make()
+    graph = explore(cn)
+    batched = explore_batched(cn)
+    assert batched.complete and graph.complete
+    assert set(batched.markings) == set(graph.markings)
+    assert edge_set(batched) == edge_set(graph)
+    assert {batched.markings[i] for i in batched.deadlocks} == {graph.markings[i] for i in graph.deadlocks}
+
+
+@pytest.mark.parametrize("name, make", CASES)
+def test_batched_stops_at_max_states(name, make):
+    cn = make()
+    total = explore(cn).num_states
+    limit = max(1, total // 2)
+    batched = explore_batched(cn, max_states=limit)
+    assert batched.num_states <= limit
+    assert batched.complete == (limit >= total)
+    assert set(batched.markings) <= set(explore(cn).markings)
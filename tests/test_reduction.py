@@ -0,0 +1,51 @@
+# tests/test_reduction.py
+# Réduction structurelle : blocages du réseau réduit dépliés et rejoués sur le réseau d'origine
+
+import pytest
+from logic.compiled import CompiledNet
+from logic.reachability import explore, find_deadlocks
+from logic.reduction import reduce_net
+from conftest import MODELS, random_net, replay
+
+NETS = [(name, build) for name, build in MODELS.items()]
+NETS += [(f"random{seed}", lambda seed=seed: random_net(seed, places=8, transitions=6)) for seed in range(12)]
+
+
+@pytest.mark.parametrize("name, build", NETS)
+def test_reduced_deadlocks_lift_to_original(name, build):
+    net = build()
+    reduction = reduce_net(net)
+    cn = CompiledNet(net)
+    graph = explore(cn)
+    dead = {graph.markings[i] for i in graph.deadlocks}
+    found, _, complete = find_deadlocks(CompiledNet(reduction.net), limit=None)
+    assert complete
+    assert bool(found) == bool(dead)
+    for deadlock in found:
+        lifted = reduction.lift_deadlock(deadlock)
+        m = replay(cn, lifted.trace)
+        assert cn.marking_dict(m) == lifted.marking
+        assert m in dead
+
+
+# Les places gardées voient les mêmes marquages accessibles, et le réseau n'est pas modifié
+@pytest.mark.parametrize("name, build", NETS)
+def test_kept_places_keep_their_markings(name, build):
+    net = build()
+    kept = list(net.places)[:2]
+    before = (len(net.places), len(net.transitions), len(net.arcs))
+    reduction = reduce_net(net, keep=kept)
+    assert (len(net.places), len(net.transitions), len(net.arcs)) == before
+    assert all(p in reduction.net.places for p in kept)
+
+    def projection(n):
+        cn = CompiledNet(n)
+        columns = [cn.place_index[p] for p in kept]
+        return {tuple(m[p] for p in columns) for m in explore(cn).markings}
+
+    assert projection(reduction.net) == projection(net)
+
+
+def test_reduction_shrinks_benchmark_models():
+    reduction = reduce_net(MODELS["job_shop"]())
+    assert len(reduction.net.transitions) < len(reduction.original.transitions)
@@ -0,0 +1,53 @@
+# tests/test_simulation.py
+# Jeu de jetons : compteurs de tirs, politiques de choix et ensemble des tirables incrémental
+
+import pytest
+from logic.petri_net import PetriNet
+from logic.simulation import Simulator
+from conftest import random_net
+
+
+# A -> t1 -> B -> t2 -> A avec un jeton, et C -> t3 qui s'épuise
+def cycle_net():
+    net = PetriNet()
+    net.add_many(places=[("A", 1), ("B", 0), ("C", 2)], transitions=["t1", "t2", "t3"],
+                 arcs=[("A", "t1", "place_to_transition", 1), ("B", "t1", "transition_to_place", 1),
+                       ("B", "t2", "place_to_transition", 1), ("A", "t2", "transition_to_place", 1),
+                       ("C", "t3", "place_to_transition", 1)])
+    return net
+
+
+def test_priority_policy_counts():
+    sim = Simulator(cycle_net(), policy="priority", priorities={"t1": 1, "t2": 1})
+    assert sim.run(10) == 10
+    assert sim.fire_counts_dict() == {"t1": 5, "t2": 5, "t3": 0}
+    assert sim.marking_dict() == {"A": 1, "B": 0, "C": 2}
+
+
+def test_round_robin_stops_at_deadlock():
+    net = cycle_net()
+    net.add_many(places=[("D", 1)], arcs=[("D", "t1", "place_to_transition", 1)])
+    sim = Simulator(net, policy="round_robin")
+    assert sim.run(100) == 4 # t1, t2, t3, t3 puis plus rien
+    assert sim.deadlocked
+    assert sim.fire_counts_dict() == {"t1": 1, "t2": 1, "t3": 2}
+    assert sim.step() is None
+
+
+def test_same_seed_same_run():
+    runs = []
+    for _ in range(2):
+        sim = Simulator(random_net(5), seed=7)
+        sim.run(200)
+        runs.append((sim.fire_counts, sim.marking))
+    assert runs[0] == runs[1]
+
+
+# L'ensemble maintenu après chaque tir est celui recalculé depuis le marquage
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_enabled_set(seed):
+    sim = Simulator(random_net(seed), seed=seed)
+    for _ in range(200):
+        assert sorted(sim.enabled_list) == sim.cn.enabled(tuple(sim.marking))
+        if sim.step() is None:
+            break
@@ -0,0 +1,66 @@
+# tests/test_stochastic.py
+# Régime stationnaire des GSPN comparé aux valeurs calculées à la main
+
+import pytest
+from logic.petri_net import PetriNet
+from logic import stochastic
+from logic.stochastic import solve_gspn, METHODS
+from benchmarks.generators import kanban
+
+
+# A -(taux a)-> V, puis choix immédiat V -> B (poids 1) ou V -> C (poids 3), B et C reviennent en A
+def branching_net(a=2.0, b=1.0, c=4.0):
+    net = PetriNet()
+    net.add_many(
+        places=[("A", 1), ("V", 0), ("B", 0), ("C", 0)],
+        transitions=[("Go", a, False, ("deterministic", 0.0)), ("ToB", 1.0, True, ("deterministic", 0.0)),
+                     ("ToC", 3.0, True, ("deterministic", 0.0)), ("BackB", b, False, ("deterministic", 0.0)),
+                     ("BackC", c, False, ("deterministic", 0.0))],
+        arcs=[("A", "Go", "place_to_transition", 1), ("V", "Go", "transition_to_place", 1),
+              ("V", "ToB", "place_to_transition", 1), ("B", "ToB", "transition_to_place", 1),
+              ("V", "ToC", "place_to_transition", 1), ("C", "ToC", "transition_to_place", 1),
+              ("B", "BackB", "place_to_transition", 1), ("A", "BackB", "transition_to_place", 1),
+              ("C", "BackC", "place_to_transition", 1), ("A", "BackC", "transition_to_place", 1)])
+    return net
+
+
+def test_two_state_cycle():
+    net = PetriNet()
+    net.add_many(places=[("On", 1), ("Off", 0)],
+                 transitions=[("Stop", 3.0, False, ("deterministic", 0.0)), ("Start", 1.0, False, ("deterministic", 0.0))],
+                 arcs=[("On", "Stop", "place_to_transition", 1), ("Off", "Stop", "transition_to_place", 1),
+                       ("Off", "Start", "place_to_transition", 1), ("On", "Start", "transition_to_place", 1)])
+    result = solve_gspn(net)
+    assert result.num_tangible == 2
+    assert result.mean_tokens["On"] == pytest.approx(1.0 / 4.0)
+    assert result.throughput["Stop"] == pytest.approx(3.0 / 4.0)
+
+
+# Temps moyen d'un tour : 1/a + (1/4)/b + (3/4)/c ; chaque état tangible y pèse son temps de séjour
+@pytest.mark.parametrize("method", METHODS)
+def test_vanishing_states_are_eliminated(method):
+    a, b, c = 2.0, 1.0, 4.0
+    cycle = 1 / a + 0.25 / b + 0.75 / c
+    result = solve_gspn(branching_net(a, b, c), method=method)
+    assert (result.num_tangible, result.num_vanishing) == (3, 1)
+    assert result.mean_tokens["A"] == pytest.approx((1 / a) / cycle)
+    assert result.mean_tokens["B"] == pytest.approx((0.25 / b) / cycle)
+    assert result.mean_tokens["V"] == pytest.approx(0.0)
+    assert result.throughput["Go"] == pytest.approx(1 / cycle)
+    assert result.throughput["ToB"] == pytest.approx(0.25 / cycle)
+    assert result.throughput["ToC"] == pytest.approx(0.75 / cycle)
+
+
+# Préconditionneur triangulaire (grands systèmes) et repli sur Gauss-Seidel hors budget
+def test_gmres_preconditioners_and_fallback(monkeypatch):
+    net = kanban(1)
+    reference = solve_gspn(net, method="direct")
+    monkeypatch.setattr(stochastic, "ILU_MAX_STATES", 0)
+    result = solve_gspn(net, method="gmres")
+    assert result.method == "gmres"
+    assert result.mean_tokens == pytest.approx(reference.mean_tokens)
+    monkeypatch.setattr(stochastic, "GMRES_RESTART", 1)
+    monkeypatch.setattr(stochastic, "GMRES_CYCLES", 1)
+    result = solve_gspn(net, method="gmres")
+    assert result.method == "gauss_seidel"
+    assert result.mean_tokens == pytest.approx(reference.mean_tokens)
@@ -0,0 +1,52 @@
+# tests/test_timed.py
+# Simulation à événements discrets sur des délais déterministes (résultats calculables à la main)
+
+import io
+import pytest
+from logic.petri_net import PetriNet
+from logic.timed import TimedSimulator, stream_csv, check_delay
+
+
+# A -(t1, délai 1)-> B -(t2, délai 3)-> A : tirs à 1, 4, 5, 8...
+def cycle_net():
+    net = PetriNet()
+    net.add_many(places=[("A", 1), ("B", 0)],
+                 transitions=[("t1", 1.0, False, ("deterministic", 1.0)), ("t2", 1.0, False, ("deterministic", 3.0))],
+                 arcs=[("A", "t1", "place_to_transition", 1), ("B", "t1", "transition_to_place", 1),
+                       ("B", "t2", "place_to_transition", 1), ("A", "t2", "transition_to_place", 1)])
+    return net
+
+
+def test_firing_counts_and_occupancy():
+    sim = TimedSimulator(cycle_net()).run(until=8.0)
+    assert sim.fire_counts == [2, 2]
+    assert sim.now == 8.0
+    assert sim.mean_occupancy() == pytest.approx({"A": 0.25, "B": 0.75})
+    assert sim.throughput() == pytest.approx({"t1": 0.25, "t2": 0.25})
+
+
+# Deux transitions en conflit : la plus rapide tire, l'autre est annulée
+def test_conflict_cancels_slower_transition():
+    net = PetriNet()
+    net.add_many(places=[("A", 1), ("D", 0)],
+                 transitions=[("fast", 1.0, False, ("deterministic", 1.0)), ("slow", 1.0, False, ("deterministic", 2.0))],
+                 arcs=[("A", "fast", "place_to_transition", 1), ("D", "fast", "transition_to_place", 1),
+                       ("A", "slow", "place_to_transition", 1), ("D", "slow", "transition_to_place", 1)])
+    sim = TimedSimulator(net).run(until=10.0)
+    assert sim.fire_counts == [1, 0]
+    assert sim.deadlocked
+    assert sim.mean_occupancy() == pytest.approx({"A": 0.1, "D": 0.9})
+
+
+def test_stream_csv_samples():
+    out = io.StringIO()
+    stream_csv(TimedSimulator(cycle_net()), out, until=8.0, sample_interval=2.0)
+    lines = out.getvalue().splitlines()
+    assert lines[0] == "time,A,B,fired_t1,fired_t2"
+    assert lines[1:] == ["2,0,1,1,0", "4,1,0,1,1", "6,0,1,2,1", "8,1,0,2,2"]
+
+
+def test_check_delay_rejects_bad_specs():
+    for delay in (("gamma", 1.0), ("uniform", 1.0), ("exponential", -1.0)):
+        with pytest.raises(ValueError):
+            check_delay(delay)
@@ -0,0 +1,73 @@
+# tests/test_unfolding.py
+# Préfixe fini complet comparé à l'exploration exacte sur des réseaux saufs
+
+import random
+import pytest
+from logic.petri_net import PetriNet
+from logic.compiled import CompiledNet
+from logic.reachability import explore
+from logic.unfolding import unfold
+from benchmarks.generators import philosophers, token_ring
+from conftest import replay
+
+
+# Processus cycliques (un jeton chacun) qui prennent et rendent des ressources exclusives :
+# réseau sauf, avec des blocages quand deux processus prennent les ressources dans l'autre ordre
+def processes(seed, count=3, steps=4, resources=2):
+    rng = random.Random(seed)
+    places, transitions, arcs = [], [], []
+    places += [(f"R{r}", 1) for r in range(resources)]
+    for i in range(count):
+        places += [(f"S{i}_{k}", int(k == 0)) for k in range(steps)]
+        held = {}
+        for k in range(steps):
+            name = f"T{i}_{k}"
+            transitions.append(name)
+            arcs += [(f"S{i}_{k}", name, "place_to_transition", 1),
+                     (f"S{i}_{(k + 1) % steps}", name, "transition_to_place", 1)]
+            r = rng.randrange(resources + 1)
+            if r < resources and r not in held and k < steps - 1:
+                held[r] = k
+                arcs.append((f"R{r}", name, "place_to_transition", 1))
+        for r in held:
+            arcs.append((f"R{r}", f"T{i}_{steps - 1}", "transition_to_place", 1))
+    net = PetriNet()
+    net.add_many(places, transitions, arcs)
+    return net
+
+
+NETS = [("philosophers", lambda: philosophers(3)), ("token_ring", lambda: token_ring(3))]
+NETS += [(f"processes{seed}", lambda seed=seed: processes(seed)) for seed in range(10)]
+
+
+@pytest.mark.parametrize("name, build", NETS)
+def test_deadlock_matches_explore(name, build):
+    net = build()
+    cn = CompiledNet(net)
+    graph = explore(cn)
+    deadlock = unfold(net).find_deadlock()
+    assert (deadlock is not None) == bool(graph.deadlocks)
+    if deadlock is not None:
+        m = replay(cn, deadlock.trace)
+        assert cn.marking_dict(m) == deadlock.marking and not cn.enabled(m)
+
+
+@pytest.mark.parametrize("name, build", NETS)
+def test_find_marking_matches_explore(name, build):
+    net = build()
+    cn = CompiledNet(net)
+    prefix = unfold(net)
+    reachable = explore(cn).markings
+    for m in reachable[::max(1, len(reachable) // 5)]:
+        result = prefix.find_marking(cn.marking_dict(m))
+        assert result.reachable and replay(cn, result.trace) == m
+    # un seul jeton par processus : deux places d'un même cycle ne sont jamais marquées ensemble
+    if "S0_0" in cn.place_index:
+        assert prefix.find_marking({"S0_0": 1, "S0_1": 1}).reachable is False
+
+
+def test_unsafe_net_is_rejected():
+    net = PetriNet()
+    net.add_many([("P", 2)], ["T"], [("P", "T", "place_to_transition", 1)])
+    with pytest.raises(ValueError):
+        unfold(net)